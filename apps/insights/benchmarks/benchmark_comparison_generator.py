@@ -2,6 +2,10 @@
 import time
 import json
 import traceback
+from apps.insights.services.comparison_service import (
+    comparison_prompt_fields,
+    compute_metric_deltas,
+)
 from apps.insights.services.openai.comparison_generator import generate_comparison
 
 # Path to save the LLM output
@@ -11,6 +15,7 @@ OUTPUT_FILE = "apps/insights/benchmarks/generated_comparison_output.json"
 def benchmark_comparison_generator():
     """
     Benchmarks the `generate_comparison` function using hardcoded summaries.
+    The key metric changes are computed as `create_comparison` does.
     Measures and prints the execution time.
     Saves the LLM structured output to a file.
     """
@@ -21,19 +26,19 @@ def benchmark_comparison_generator():
     such as pages per session, average session duration, bounce rate, conversion rate, transactions, and revenue.
     Overall, the dataset provides an overview of user interaction, revealing patterns in website traffic and user activity
     over the specified time frame.
-
-    Key Metrics:
-    - Average Sessions: 1543.43
-    - Average Users: 1265.14
-    - Average New Users: 427.29
-    - Average Pageviews: 6225.86
-    - Pages per Session: 4.01
-    - Average Session Duration: 163.1
-    - Bounce Rate: 0.2
-    - Conversion Rate: 0.028
-    - Average Transactions: 34.14
-    - Average Revenue: 1622.53
     """
+    key_metrics1 = {
+        "Average Sessions": 1543.43,
+        "Average Users": 1265.14,
+        "Average New Users": 427.29,
+        "Average Pageviews": 6225.86,
+        "Pages per Session": 4.01,
+        "Average Session Duration": 163.1,
+        "Bounce Rate": 0.2,
+        "Conversion Rate": 0.028,
+        "Average Transactions": 34.14,
+        "Average Revenue": 1622.53,
+    }
 
     summary2 = """
     The dataset provides a statistical overview of a website's user interaction over a period of seven days in January 2024,
@@ -43,30 +48,46 @@ def benchmark_comparison_generator():
     of 6891.71 pageviews per day, with each session lasting around 154 seconds on average. The average bounce rate was about 
     16.06%, and the conversion rate stood at about 4.25%. The site recorded an average of 49 transactions per day, resulting
     in a daily revenue averaging $2087.17.
-
-    Key Metrics:
-    - Average Sessions: 1682.57
-    - Average Users: 1237.86
-    - Average New Users: 424.14
-    - Average Pageviews: 6891.71
-    - Pages per Session: 4.07
-    - Average Session Duration: 153.88
-    - Bounce Rate: 0.1606
-    - Conversion Rate: 0.0425
-    - Average Transactions: 49.43
-    - Average Revenue: 2087.17
     """
+    key_metrics2 = {
+        "Average Sessions": 1682.57,
+        "Average Users": 1237.86,
+        "Average New Users": 424.14,
+        "Average Pageviews": 6891.71,
+        "Pages per Session": 4.07,
+        "Average Session Duration": 153.88,
+        "Bounce Rate": 0.1606,
+        "Conversion Rate": 0.0425,
+        "Average Transactions": 49.43,
+        "Average Revenue": 2087.17,
+    }
+
+    # Build the summaries as `summary_data` returns them from the database
+    data_summary1, data_summary2 = (
+        {
+            "dataset_summary": summary,
+            "key_metrics": [
+                {"name": name, "value": value} for name, value in key_metrics.items()
+            ],
+        }
+        for summary, key_metrics in ((summary1, key_metrics1), (summary2, key_metrics2))
+    )
+    metric_deltas = compute_metric_deltas(data_summary1, data_summary2)
+    prompt_fields = comparison_prompt_fields(
+        data_summary1, data_summary2, metric_deltas
+    )
 
     print("\n=== Benchmarking `generate_comparison` ===")
     print("Input Summaries:")
     print(f"Summary 1:\n{summary1}")
     print(f"\nSummary 2:\n{summary2}")
+    print(f"\nKey Metric Changes:\n{prompt_fields['metric_deltas']}")
 
     # Measure the execution time of `generate_comparison`
     start_time = time.perf_counter()
     try:
         print("\nCalling `generate_comparison`...")
-        response = generate_comparison(summary1, summary2)
+        response = generate_comparison(**prompt_fields)
         end_time = time.perf_counter()
 
         # Print execution time
@@ -0,0 +1,130 @@
+# apps/insights/benchmarks/benchmark_llm_throughput.py
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from django.conf import settings
+from apps.insights.benchmarks.fake_openai_server import FakeOpenAIServer
+from apps.insights.services.openai import clients, rate_limit
+from apps.insights.services.openai.comparison_generator import generate_comparison
+from apps.insights.services.openai.summary_generator import (
+    OPENAI_MODEL,
+    generate_summary,
+)
+
+# Run:
+# docker-compose exec django sh
+# python manage.py shell
+# exec(open("apps/insights/benchmarks/benchmark_llm_throughput.py").read())
+
+# Requests per workload, concurrency level and cache state
+REQUESTS = 64
+CONCURRENCY_LEVELS = (1, 4, 16, 32)
+
+# Behaviour of the fake OpenAI server
+LATENCY = 0.5
+JITTER = 0.2
+ERROR_RATE = 0.02
+RATE_LIMIT_RATE = 0.02
+RETRY_AFTER = 1.0
+SEED = 42
+
+# Set to True to keep the configured RPM/TPM limits instead of lifting them
+RATE_LIMITED = False
+
+WORKLOADS = {
+    "summary": lambda prompt: generate_summary(prompt),
+    "comparison": lambda prompt: generate_comparison(prompt, prompt, prompt),
+}
+
+
+def use_fake_server(server: FakeOpenAIServer):
+    """
+    Points the OpenAI clients of this process at the fake server.
+    """
+    settings.OPENAI_BASE_URL = server.url
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "fake-key"
+    # Clients created before keep the previous base URL
+    clients.reset_clients()
+    if not RATE_LIMITED:
+        rate_limit._limiters[OPENAI_MODEL] = rate_limit.RateLimiter(
+            OPENAI_MODEL, requests_per_minute=10**6, tokens_per_minute=10**9
+        )
+
+
+def timed(call, prompt: str):
+    """
+    Runs one request, returning its latency in seconds and whether it failed.
+    """
+    start_time = time.perf_counter()
+    try:
+        call(prompt)
+        failed = False
+    except ValueError:
+        failed = True
+    return time.perf_counter() - start_time, failed
+
+
+def run_load(call, prompts: list[str], concurrency: int) -> dict:
+    """
+    Sends the prompts with `concurrency` requests in flight and returns the
+    throughput, latency percentiles and failures.
+    """
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda prompt: timed(call, prompt), prompts))
+    elapsed = time.perf_counter() - start_time
+
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    return {
+        "throughput": len(prompts) / elapsed,
+        "p50": np.percentile(latencies, 50),
+        "p99": np.percentile(latencies, 99),
+        "errors": sum(failed for _, failed in results),
+    }
+
+
+def benchmark_llm_throughput():
+    """
+    Measures the throughput and latency of the summary and comparison
+    generators against the fake OpenAI server at several concurrency levels.
+
+    Each run is sent twice with the same prompts: cold, where every request
+    reaches the server, and warm, where the LLM cache answers (if Redis is
+    reachable).
+    """
+    server = FakeOpenAIServer(
+        latency=LATENCY,
+        jitter=JITTER,
+        error_rate=ERROR_RATE,
+        rate_limit_rate=RATE_LIMIT_RATE,
+        retry_after=RETRY_AFTER,
+        seed=SEED,
+    )
+    with server:
+        use_fake_server(server)
+        print(
+            f"\nFake server: latency {LATENCY}s ±{JITTER}s, "
+            f"{ERROR_RATE:.0%} errors, {RATE_LIMIT_RATE:.0%} rate limited"
+        )
+        print(
+            f"\n{'Workload':<12}{'conc.':>6}{'cache':>7}{'req/s':>9}"
+            f"{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}"
+        )
+        for name, call in WORKLOADS.items():
+            for concurrency in CONCURRENCY_LEVELS:
+                run_id = uuid.uuid4().hex
+                prompts = [f"{name} {run_id} {i}" for i in range(REQUESTS)]
+                for cache in ("cold", "warm"):
+                    result = run_load(call, prompts, concurrency)
+                    print(
+                        f"{name:<12}{concurrency:>6}{cache:>7}"
+                        f"{result['throughput']:>9.1f}{result['p50']:>10.0f}"
+                        f"{result['p99']:>10.0f}{result['errors']:>8}"
+                    )
+        print(f"\nServer responses: {dict(server.stats)}")
+    print("Benchmark complete.")
+
+
+if __name__ == "__main__":
+    benchmark_llm_throughput()
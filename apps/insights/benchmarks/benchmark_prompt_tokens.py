@@ -0,0 +1,80 @@
+import time
+from apps.insights.services.csv.csv_processor import CSVProcessor
+from apps.insights.services.csv.data_overview import compact_overview
+from apps.insights.services.openai.clients import get_instructor_client
+from apps.insights.services.openai.prompts.summary import SUMMARY_PROMPT
+from apps.insights.services.openai.schemas import SummaryOutput
+from apps.insights.services.openai.summary_generator import OPENAI_MODEL
+from apps.insights.services.openai.tokens import count_tokens, tiktoken
+
+# Run:
+# docker-compose exec django sh
+# python manage.py shell
+# exec(open("apps/insights/benchmarks/benchmark_prompt_tokens.py").read())
+
+START_DATE = "2024-01-15"
+TRAFFIC_SOURCE = "organic"
+
+# Set to True to also time uncached OpenAI requests (requires OPENAI_API_KEY)
+MEASURE_LATENCY = False
+
+ENCODINGS = {
+    "to_string": lambda overview: overview.to_string(),
+    "compact": compact_overview,
+}
+
+
+def build_prompts(start_date: str, traffic_source: str) -> dict:
+    """
+    Builds the summary prompt of one week with each overview encoding.
+    """
+    processor = CSVProcessor()
+    processor.load()
+    processor.validate()
+    processor.clean()
+    processor.df = processor.filter(start_date, traffic_source)
+    overview = processor.describe_overview()
+    return {
+        name: SUMMARY_PROMPT.format(statistical_summary=encode(overview))
+        for name, encode in ENCODINGS.items()
+    }
+
+
+def request_latency(prompt: str) -> float:
+    """
+    Times one uncached structured-output request, in seconds.
+    """
+    start_time = time.perf_counter()
+    get_instructor_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[{"role": "user", "content": prompt}],
+        response_model=SummaryOutput,
+    )
+    return time.perf_counter() - start_time
+
+
+def benchmark_prompt_tokens(start_date: str, traffic_source: str):
+    """
+    Compares the size of the summary prompt with the padded `to_string`
+    overview and with the compact CSV overview, and optionally the end-to-end
+    latency of each.
+    """
+    prompts = build_prompts(start_date, traffic_source)
+    counter = "tiktoken" if tiktoken else "estimated"
+
+    print(f"\n{'Encoding':<12}{'chars':>10}{'tokens':>10}{'latency':>12}")
+    for name, prompt in prompts.items():
+        latency = (
+            f"{request_latency(prompt) * 1000:>9.0f} ms" if MEASURE_LATENCY else f"{'-':>12}"
+        )
+        print(
+            f"{name:<12}{len(prompt):>10}{count_tokens(prompt, OPENAI_MODEL):>10}{latency}"
+        )
+
+    before, after = (count_tokens(prompts[name], OPENAI_MODEL) for name in ENCODINGS)
+    print(f"\nPrompt tokens ({counter}) reduced by {(1 - after / before) * 100:.1f}%")
+    print("Benchmark complete.")
+
+
+if __name__ == "__main__":
+    benchmark_prompt_tokens(START_DATE, TRAFFIC_SOURCE)
@@ -0,0 +1,268 @@
+# apps/insights/benchmarks/fake_openai_server.py
+"""
+Fake OpenAI Chat Completions Server
+Serves canned structured outputs over the OpenAI chat completions API for offline benchmarks.
+
+The server answers `POST /v1/chat/completions` with a canned `SummaryOutput`, `ComparisonOutput` or `WeeklyReportOutput`, chosen by the name of the tool Instructor requests, or by the name of the JSON schema in `response_format`. Each request waits for a configurable latency with jitter, and fails at configurable rates with a 500 error or a 429 error carrying a `retry-after` header, so that the retry, rate limiting and caching paths can be measured repeatably and under concurrency without an API key. Point the application at it with the `OPENAI_BASE_URL` setting.
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+# Run:
+# python apps/insights/benchmarks/fake_openai_server.py --port 8001 --latency 0.8
+# then set OPENAI_BASE_URL=http://localhost:8001/v1 and any OPENAI_API_KEY
+
+KEY_METRIC_NAMES = [
+    "Average Sessions",
+    "Average Users",
+    "Average New Users",
+    "Average Pageviews",
+    "Pages per Session",
+    "Average Session Duration",
+    "Bounce Rate",
+    "Conversion Rate",
+    "Average Transactions",
+    "Average Revenue",
+]
+
+SUMMARY_OUTPUT = {
+    "dataset_summary": (
+        "Traffic was stable over the week, with sessions and users close to "
+        "their averages and a steady conversion rate."
+    ),
+    "chain_of_thought": "Compared the mean of each metric with its spread.",
+}
+
+COMPARISON_OUTPUT = {
+    "comparison_summary": (
+        "The current week saw slightly more sessions and revenue than the "
+        "previous week, while engagement was unchanged."
+    ),
+    "key_metrics_comparison": [
+        {"name": name, "description": f"{name} changed little week over week."}
+        for name in KEY_METRIC_NAMES
+    ],
+    "chain_of_thought": "Read the change of each metric from the table.",
+}
+
+# Canned outputs by the name of the requested response model
+CANNED_OUTPUTS = {
+    "SummaryOutput": SUMMARY_OUTPUT,
+    "ComparisonOutput": COMPARISON_OUTPUT,
+    "WeeklyReportOutput": {
+        "current_week_summary": SUMMARY_OUTPUT,
+        "previous_week_summary": SUMMARY_OUTPUT,
+        "comparison": COMPARISON_OUTPUT,
+    },
+}
+
+
+class FakeOpenAIServer:
+    """
+    Threaded fake of the OpenAI chat completions endpoint.
+
+    Args:
+        host (str): Interface to listen on.
+        port (int): Port to listen on; 0 picks a free port.
+        latency (float): Mean response time, in seconds.
+        jitter (float): Maximum deviation from the mean response time, in seconds.
+        error_rate (float): Share of requests answered with a 500 error.
+        rate_limit_rate (float): Share of requests answered with a 429 error.
+        retry_after (float): Retry-After of the 429 errors, in seconds.
+        seed (int): Seed of the random latencies and errors, for repeatable runs.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.5,
+        jitter: float = 0.1,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """
+        Base URL of the fake API, for the OpenAI client's `base_url`.
+        """
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        """
+        Serves requests from a background thread.
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops serving and closes the socket.
+        """
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _draw(self) -> tuple[float, str]:
+        """
+        Draws the latency and the outcome of a request.
+        """
+        with self._lock:
+            latency = max(0.0, self.latency + self._random.uniform(-1, 1) * self.jitter)
+            roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            return latency, "rate_limited"
+        if roll < self.rate_limit_rate + self.error_rate:
+            return latency, "error"
+        return latency, "ok"
+
+    def completion(self, body: dict) -> Optional[dict]:
+        """
+        Builds the chat completion answering a request, or None if the
+        requested response model has no canned output.
+        """
+        tools = body.get("tools") or []
+        if tools:
+            name = tools[0]["function"]["name"]
+        else:
+            name = body.get("response_format", {}).get("json_schema", {}).get("name")
+        if name not in CANNED_OUTPUTS:
+            return None
+
+        arguments = json.dumps(CANNED_OUTPUTS[name])
+        completion_id = next(self._ids)
+        if tools:
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [
+                    {
+                        "id": f"call_fake_{completion_id}",
+                        "type": "function",
+                        "function": {"name": name, "arguments": arguments},
+                    }
+                ],
+            }
+            finish_reason = "tool_calls"
+        else:
+            message = {"role": "assistant", "content": arguments}
+            finish_reason = "stop"
+
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body["messages"]) // 4
+        completion_tokens = len(arguments) // 4
+        return {
+            "id": f"chatcmpl-fake-{completion_id}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "fake"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    return self._send(404, _error("Unknown endpoint.", "not_found"))
+
+                latency, outcome = server._draw()
+                time.sleep(latency)
+                with server._lock:
+                    server.stats[outcome] += 1
+
+                if outcome == "rate_limited":
+                    return self._send(
+                        429,
+                        _error("Rate limit reached.", "rate_limit_exceeded"),
+                        {"retry-after": f"{server.retry_after:g}"},
+                    )
+                if outcome == "error":
+                    return self._send(500, _error("The server had an error.", "server_error"))
+
+                completion = server.completion(body)
+                if completion is None:
+                    return self._send(400, _error("No canned output.", "invalid_request"))
+                return self._send(200, completion)
+
+            def _send(self, status: int, payload: dict, headers: Optional[dict] = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _error(message: str, code: str) -> dict:
+    return {"error": {"message": message, "type": code, "param": None, "code": code}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(**vars(args))
+    print(f"Serving fake OpenAI API at {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import time
+from apps.insights.services.csv.csv_processor import CSVProcessor
+
+# Run:
+# docker-compose exec django sh
+# python manage.py shell
+# exec(open("apps/insights/benchmarks/polars/benchmark_csv_processor.py").read())
+
+START_DATE = "2024-01-15"
+ENGINES = ["pandas", "polars"]
+STAGES = ["load", "validate", "clean", "filter", "overview"]
+
+
+def benchmark_engine(engine: str, start_date: str) -> tuple[dict, str]:
+    """
+    Runs the CSVProcessor pipeline with the given engine and times each stage.
+    Caches are disabled so both engines parse the CSV file.
+    """
+    processor = CSVProcessor(use_cache=False, engine=engine)
+    timings = {}
+
+    start_time = time.perf_counter()
+    processor.load()
+    timings["load"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    processor.validate()
+    timings["validate"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    processor.clean()
+    timings["clean"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    filtered_df = processor.filter(start_date)
+    timings["filter"] = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    processor.df = filtered_df  # Update processor's df with filtered data
+    overview = processor.generate_overview()
+    timings["overview"] = time.perf_counter() - start_time
+
+    timings["total"] = sum(timings.values())
+    return timings, overview
+
+
+def benchmark_polars_csv_processor(start_date: str):
+    """
+    Compares the Pandas and Polars CSVProcessor engines stage by stage
+    and checks that both produce the same statistical overview.
+    """
+    results = {}
+    overviews = {}
+    for engine in ENGINES:
+        results[engine], overviews[engine] = benchmark_engine(engine, start_date)
+
+    print(f"\n{'Stage':<12}" + "".join(f"{engine:>14}" for engine in ENGINES))
+    for stage in STAGES + ["total"]:
+        row = "".join(f"{results[engine][stage] * 1000:>11.3f} ms" for engine in ENGINES)
+        print(f"{stage:<12}{row}")
+
+    identical = overviews["pandas"] == overviews["polars"]
+    print(f"\nOverviews identical across engines: {identical}")
+    print("Benchmark complete.")
+
+
+if __name__ == "__main__":
+    benchmark_polars_csv_processor(START_DATE)
@@ -0,0 +1,41 @@
+# apps/insights/management/commands/regenerate_weeks_batch.py
+from django.core.management.base import BaseCommand, CommandError
+from apps.insights.services.batch_service import regenerate_weeks_batch
+from apps.insights.services.summary_service import TRAFFIC_SOURCE
+
+
+class Command(BaseCommand):
+    """
+    Regenerates the summaries and comparisons of many weeks through the OpenAI
+    Batch API.
+
+    A batch can take up to OPENAI_BATCH_TIMEOUT to finish, far longer than a
+    Django Q task may run, so batch mode is run as a command rather than a task.
+    """
+
+    help = "Regenerates summaries and comparisons of many weeks with the OpenAI Batch API."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "start_date", help="Start date of the most recent week (YYYY-MM-DD)."
+        )
+        parser.add_argument(
+            "--weeks", type=int, default=4, help="Number of weeks to compare."
+        )
+        parser.add_argument(
+            "--source", default=TRAFFIC_SOURCE, help="Traffic source to process."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            saved = regenerate_weeks_batch(
+                options["start_date"], options["weeks"], options["source"]
+            )
+        except RuntimeError as e:
+            raise CommandError(str(e)) from e
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved {len(saved['summaries'])} summaries and "
+                f"{len(saved['comparisons'])} comparisons."
+            )
+        )
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:00
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insights', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatisticalOverview',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('modified_at', models.DateTimeField(auto_now=True)),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('start_date', models.DateField(db_index=True, help_text='The starting date of the week the statistics were computed for.')),
+                ('source', models.CharField(help_text='The traffic source the statistics were computed for (e.g., organic).', max_length=100)),
+                ('column_name', models.CharField(help_text='Name of the dataset column.', max_length=255)),
+                ('count', models.IntegerField(help_text='Number of non-null values.')),
+                ('mean', models.FloatField(blank=True, null=True)),
+                ('std', models.FloatField(blank=True, null=True)),
+                ('min', models.FloatField(blank=True, null=True)),
+                ('percentile_25', models.FloatField(blank=True, null=True)),
+                ('median', models.FloatField(blank=True, null=True)),
+                ('percentile_75', models.FloatField(blank=True, null=True)),
+                ('max', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['start_date', 'source', 'id'],
+                'constraints': [models.UniqueConstraint(fields=('start_date', 'source', 'column_name'), name='unique_overview_column')],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+def set_organic_data_source(apps, schema_editor):
+    """
+    Summaries created before per-source summaries were all for organic traffic.
+    """
+    Summary = apps.get_model("insights", "Summary")
+    Summary.objects.filter(data_source__isnull=True).update(data_source="organic")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insights', '0002_statisticaloverview'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='summary',
+            name='unique_start_date',
+        ),
+        migrations.AlterField(
+            model_name='summary',
+            name='data_source',
+            field=models.CharField(blank=True, help_text='Optional. A file path, URL, or identifier for the source of the dataset. Useful for traceability or referencing the original data. Weekly summaries store their traffic source (e.g., organic) here.', max_length=255, null=True),
+        ),
+        migrations.RunPython(set_organic_data_source, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='summary',
+            constraint=models.UniqueConstraint(fields=('start_date', 'data_source'), name='unique_start_date_source'),
+        ),
+    ]
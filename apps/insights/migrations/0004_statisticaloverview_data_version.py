@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insights', '0003_summary_data_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='statisticaloverview',
+            name='data_version',
+            field=models.CharField(blank=True, default='', help_text='Digest of the data the statistics were computed from; they are recomputed when the data changes.', max_length=64),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:23
+
+from django.db import migrations, models
+
+
+def is_traffic_source(value):
+    """
+    Traffic sources are bare identifiers, unlike file paths and URLs.
+    """
+    return not any(char in value for char in "/\\.:")
+
+
+def move_traffic_source(apps, schema_editor):
+    """
+    Moves the traffic sources stored in data_source since 0003 to
+    traffic_source, restoring data_source to its original meaning.
+    """
+    Summary = apps.get_model("insights", "Summary")
+    for summary in Summary.objects.filter(data_source__isnull=False):
+        if is_traffic_source(summary.data_source):
+            summary.traffic_source = summary.data_source
+            summary.data_source = None
+            summary.save(update_fields=["traffic_source", "data_source"])
+
+
+def restore_traffic_source(apps, schema_editor):
+    """
+    Stores the traffic source in data_source again, as 0003 expects.
+    """
+    Summary = apps.get_model("insights", "Summary")
+    for summary in Summary.objects.filter(data_source__isnull=True):
+        summary.data_source = summary.traffic_source
+        summary.save(update_fields=["data_source"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('insights', '0004_statisticaloverview_data_version'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='summary',
+            name='unique_start_date_source',
+        ),
+        migrations.AddField(
+            model_name='summary',
+            name='traffic_source',
+            field=models.CharField(default='organic', help_text='The traffic source (e.g., organic) the summary was generated for.', max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='summary',
+            name='data_source',
+            field=models.CharField(blank=True, help_text='Optional. A file path, URL, or identifier for the source of the dataset. Useful for traceability or referencing the original data.', max_length=255, null=True),
+        ),
+        migrations.RunPython(move_traffic_source, restore_traffic_source),
+        migrations.AddConstraint(
+            model_name='summary',
+            constraint=models.UniqueConstraint(fields=('start_date', 'traffic_source'), name='unique_start_date_traffic_source'),
+        ),
+    ]
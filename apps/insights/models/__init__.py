@@ -1,4 +1,11 @@
 from .summary import Summary, KeyMetric
 from .comparison import Comparison, KeyMetricComparison
+from .statistical_overview import StatisticalOverview
 
-__all__ = ["Summary", "KeyMetric", "Comparison", "KeyMetricComparison"]
+__all__ = [
+    "Summary",
+    "KeyMetric",
+    "Comparison",
+    "KeyMetricComparison",
+    "StatisticalOverview",
+]
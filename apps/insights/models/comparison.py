@@ -102,16 +102,24 @@ class KeyMetricComparison(Timestampable, UUIDable):
         help_text="Percentage difference between the two values.", null=True, blank=True
     )
 
+    @staticmethod
+    def compute_percentage_difference(value1: float, value2: float):
+        """
+        Returns the change from value2 to value1 in percent, or None if the
+        past value is zero (or either value is missing), as the change is then
+        undefined. A drop to zero is a -100% change.
+        """
+        if value1 is None or not value2:
+            return None
+        return ((value1 - value2) / value2) * 100
+
     def save(self, *args, **kwargs):
         """
         Automatically calculates percentage_difference before saving.
         """
-        if self.value1 and self.value2:
-            self.percentage_difference = (
-                ((self.value1 - self.value2) / self.value2) * 100
-                if self.value2 != 0
-                else None
-            )
+        self.percentage_difference = self.compute_percentage_difference(
+            self.value1, self.value2
+        )
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -120,7 +128,7 @@ class KeyMetricComparison(Timestampable, UUIDable):
         """
         percentage_diff = (
             f", Difference: {self.percentage_difference:.2f}%"
-            if self.percentage_difference
+            if self.percentage_difference is not None
             else ""
         )
         return f"{self.name}: {self.value1} vs {self.value2}{percentage_diff} (Comparison ID: {self.comparison.id})"
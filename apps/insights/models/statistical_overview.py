@@ -1,43 +1,60 @@
+# apps/insights/models/statistical_overview.py
+from typing import Type
 from django.db import models
+from apps.common.behaviors.timestampable import Timestampable
+from apps.common.behaviors.uuidable import UUIDable
 
 
-class StatisticalOverview(models.Model):
-    dataset_name = models.CharField(max_length=255)
-    column_name = models.CharField(max_length=255)
-    count = models.IntegerField()
-    mean = models.FloatField(null=True, blank=True)
-    std = models.FloatField(null=True, blank=True)
-    min = models.FloatField(null=True, blank=True)
-    percentile_25 = models.FloatField(null=True, blank=True)
-    median = models.FloatField(null=True, blank=True)
-    percentile_75 = models.FloatField(null=True, blank=True)
-    max = models.FloatField(null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+class StatisticalOverview(Timestampable, UUIDable):
+    """
+    Model to store the descriptive statistics of one column for a specific week
+    and traffic source, as computed by the CSVProcessor overview.
+    """
 
-    def __str__(self):
-        return f"{self.dataset_name} - {self.column_name} Stats"
-
-
-# KeyMetric New Field Example
-class KeyMetric(models.Model):
-    statistical_overview = models.OneToOneField(
-        StatisticalOverview, on_delete=models.CASCADE, related_name="key_metric"
-    )
+    objects: Type[models.Manager] = (
+        models.Manager()
+    )  # Explicitly add the objects manager for MyPy
 
-    summary = models.ForeignKey(
-        Summary,
-        related_name="key_metrics",
-        on_delete=models.CASCADE,
-        help_text="The summary this key metric belongs to.",
+    start_date: models.DateField = models.DateField(
+        help_text="The starting date of the week the statistics were computed for.",
+        db_index=True,  # Index for looking up the overview of a week
     )
-    name = models.CharField(
+    source: models.CharField = models.CharField(
         max_length=100,
-        help_text="Name of the metric.",
-        db_index=True,  # Index for filtering by name
+        help_text="The traffic source the statistics were computed for (e.g., organic).",
     )
-    value = models.FloatField(help_text="Numeric value of the metric.")
-
-    created_at = models.DateTimeField(auto_now_add=True)
+    column_name: models.CharField = models.CharField(
+        max_length=255, help_text="Name of the dataset column."
+    )
+    data_version: models.CharField = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Digest of the data the statistics were computed from; "
+        "they are recomputed when the data changes.",
+    )
+    count: models.IntegerField = models.IntegerField(
+        help_text="Number of non-null values."
+    )
+    mean: models.FloatField = models.FloatField(null=True, blank=True)
+    std: models.FloatField = models.FloatField(null=True, blank=True)
+    min: models.FloatField = models.FloatField(null=True, blank=True)
+    percentile_25: models.FloatField = models.FloatField(null=True, blank=True)
+    median: models.FloatField = models.FloatField(null=True, blank=True)
+    percentile_75: models.FloatField = models.FloatField(null=True, blank=True)
+    max: models.FloatField = models.FloatField(null=True, blank=True)
 
     def __str__(self):
-        return f"Key Metric for {self.statistical_overview.column_name}"
+        """
+        Returns a string representation including the week, source and column.
+        """
+        return f"{self.column_name} Stats from {self.start_date} ({self.source})"
+
+    class Meta:
+        ordering = ["start_date", "source", "id"]  # Keeps the column order of the overview
+        constraints = [
+            models.UniqueConstraint(
+                fields=["start_date", "source", "column_name"],
+                name="unique_overview_column",
+            ),
+        ]
@@ -37,6 +37,11 @@ class Summary(Timestampable, UUIDable):
             "Useful for traceability or referencing the original data."
         ),
     )
+    traffic_source: models.CharField = models.CharField(
+        max_length=100,
+        default="organic",
+        help_text="The traffic source (e.g., organic) the summary was generated for.",
+    )
 
     def clean(self):
         """
@@ -49,11 +54,15 @@ class Summary(Timestampable, UUIDable):
 
     def __str__(self):
         """
-        Returns a string representation of the Summary, including the start date and data source if available.
+        Returns a string representation of the Summary, including the start date,
+        traffic source and data source if available.
         """
         if self.data_source:
-            return f"Summary from {self.start_date} (Source: {self.data_source})"
-        return f"Summary from {self.start_date}"
+            return (
+                f"Summary from {self.start_date} for {self.traffic_source} "
+                f"(Source: {self.data_source})"
+            )
+        return f"Summary from {self.start_date} for {self.traffic_source}"
 
     class Meta:
         ordering = [
@@ -61,7 +70,10 @@ class Summary(Timestampable, UUIDable):
             "-created_at",
         ]  # Added secondary ordering for predictability
         constraints = [
-            models.UniqueConstraint(fields=["start_date"], name="unique_start_date"),
+            models.UniqueConstraint(
+                fields=["start_date", "traffic_source"],
+                name="unique_start_date_traffic_source",
+            ),
         ]
         verbose_name_plural = "Summaries"
 
@@ -0,0 +1,226 @@
+# apps/insights/services/batch_service.py
+"""
+Batch Service for Bulk Summary and Comparison Generation
+Regenerates summaries and comparisons for many weeks through the OpenAI Batch API.
+
+Instead of one synchronous LLM request per week, the prompts of all weeks are written to a single JSONL file and submitted as one batch, which is not subject to the per-minute rate limits of synchronous requests. The service polls until the batch has finished, then saves each result with `save_summary_to_database` or `save_comparison_to_database`. Summaries are submitted first, as the comparisons are built from them. Results that failed are logged and reported, while successful results are saved, so a rerun only submits the missing weeks. The batch transport is pluggable, so the service can run against a local fake batch endpoint. Run it with `python manage.py regenerate_weeks_batch <start_date> --weeks <weeks>`, as a batch outlasts the Django Q task timeout.
+"""
+import logging
+from typing import Iterable, Optional
+import pandas as pd
+from apps.insights.models.comparison import Comparison
+from apps.insights.models.summary import Summary
+from apps.insights.services.comparison_service import (
+    comparison_prompt_fields,
+    compute_metric_deltas,
+    summary_data,
+)
+from apps.insights.services.csv.data_overview import compact_overview
+from apps.insights.services.openai.batch import BatchRequest, BatchTransport, run_batch
+from apps.insights.services.openai.comparison_generator import (
+    OPENAI_MODEL as COMPARISON_MODEL,
+)
+from apps.insights.services.openai.prompts.comparison import COMPARISON_PROMPT
+from apps.insights.services.openai.prompts.summary import SUMMARY_PROMPT
+from apps.insights.services.openai.schemas import ComparisonOutput, SummaryOutput
+from apps.insights.services.openai.summary_generator import (
+    OPENAI_MODEL as SUMMARY_MODEL,
+)
+from apps.insights.services.summary_service import (
+    TRAFFIC_SOURCE,
+    compute_key_metrics,
+    get_statistical_overview,
+)
+from apps.insights.services.utils.db_operations import (
+    save_comparison_to_database,
+    save_summary_to_database,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def week_start_dates(start_date: str, weeks: int) -> list[str]:
+    """
+    Returns the start dates of `weeks` consecutive weeks ending with `start_date`.
+
+    Args:
+        start_date (str): Start date of the most recent week (YYYY-MM-DD).
+        weeks (int): Number of weeks.
+
+    Returns:
+        list[str]: Start dates (YYYY-MM-DD), most recent first.
+    """
+    start = pd.to_datetime(start_date)
+    return [
+        (start - pd.Timedelta(weeks=week)).strftime("%Y-%m-%d")
+        for week in range(weeks)
+    ]
+
+
+def create_summaries_batch(
+    start_dates: Iterable[str],
+    traffic_source: str = TRAFFIC_SOURCE,
+    transport: Optional[BatchTransport] = None,
+) -> list[str]:
+    """
+    Generates the summaries of several weeks with a single batch.
+
+    Weeks that already have a summary are skipped.
+
+    Args:
+        start_dates (Iterable[str]): Start dates of the weeks (YYYY-MM-DD).
+        traffic_source (str): Traffic source to summarize.
+        transport (BatchTransport): Batch endpoint. Defaults to the OpenAI API.
+
+    Returns:
+        list[str]: Start dates of the summaries that were saved.
+    """
+    start_dates = list(start_dates)
+    existing = set(
+        Summary.objects.filter(
+            start_date__in=start_dates, traffic_source=traffic_source
+        ).values_list("start_date", flat=True)
+    )
+    overviews = {
+        start_date: get_statistical_overview(start_date, traffic_source)
+        for start_date in start_dates
+        if pd.to_datetime(start_date).date() not in existing
+    }
+    requests = [
+        BatchRequest(
+            custom_id=start_date,
+            prompt=SUMMARY_PROMPT.format(
+                statistical_summary=compact_overview(overview)
+            ),
+            response_model=SummaryOutput,
+        )
+        for start_date, overview in overviews.items()
+    ]
+    logger.info("Submitting %d summaries as a batch.", len(requests))
+
+    results = run_batch(requests, SUMMARY_MODEL, transport=transport)
+    return _save_results(
+        results,
+        lambda start_date, llm_summary: save_summary_to_database(
+            start_date,
+            llm_summary,
+            compute_key_metrics(overviews[start_date]),
+            traffic_source=traffic_source,
+        ),
+    )
+
+
+def create_comparisons_batch(
+    start_dates: Iterable[str],
+    traffic_source: str = TRAFFIC_SOURCE,
+    transport: Optional[BatchTransport] = None,
+) -> list[str]:
+    """
+    Generates the week-over-week comparisons of several weeks with a single batch.
+
+    Weeks without summaries for both weeks, or with a comparison already, are
+    skipped.
+
+    Args:
+        start_dates (Iterable[str]): Start dates of the current weeks (YYYY-MM-DD).
+        traffic_source (str): Traffic source of the summaries to compare.
+        transport (BatchTransport): Batch endpoint. Defaults to the OpenAI API.
+
+    Returns:
+        list[str]: Start dates of the comparisons that were saved.
+    """
+    summaries = {}
+    metric_deltas = {}
+    requests = []
+    for start_date in start_dates:
+        past_start_date = week_start_dates(start_date, 2)[1]
+        pair = {
+            summary.start_date.strftime("%Y-%m-%d"): summary
+            for summary in Summary.objects.filter(
+                start_date__in=[start_date, past_start_date],
+                traffic_source=traffic_source,
+            ).prefetch_related("key_metrics")
+        }
+        if len(pair) != 2:
+            logger.warning("Skipping comparison for %s: missing summaries.", start_date)
+            continue
+        summary1, summary2 = pair[start_date], pair[past_start_date]
+        if Comparison.objects.filter(summary1=summary1, summary2=summary2).exists():
+            continue
+
+        data_summary1, data_summary2 = summary_data(summary1), summary_data(summary2)
+        summaries[start_date] = (summary1.id, summary2.id)
+        metric_deltas[start_date] = compute_metric_deltas(data_summary1, data_summary2)
+        requests.append(
+            BatchRequest(
+                custom_id=start_date,
+                prompt=COMPARISON_PROMPT.format(
+                    **comparison_prompt_fields(
+                        data_summary1, data_summary2, metric_deltas[start_date]
+                    )
+                ),
+                response_model=ComparisonOutput,
+            )
+        )
+    logger.info("Submitting %d comparisons as a batch.", len(requests))
+
+    results = run_batch(requests, COMPARISON_MODEL, transport=transport)
+    return _save_results(
+        results,
+        lambda start_date, comparison: save_comparison_to_database(
+            *summaries[start_date], comparison, metric_deltas[start_date]
+        ),
+    )
+
+
+def regenerate_weeks_batch(
+    start_date: str,
+    weeks: int,
+    traffic_source: str = TRAFFIC_SOURCE,
+    transport: Optional[BatchTransport] = None,
+) -> dict:
+    """
+    Generates the summaries and comparisons of many weeks with two batches.
+
+    Args:
+        start_date (str): Start date of the most recent week (YYYY-MM-DD).
+        weeks (int): Number of weeks to compare; one more week is summarized,
+            as the oldest week is compared with the week before it.
+        traffic_source (str): Traffic source to process.
+        transport (BatchTransport): Batch endpoint. Defaults to the OpenAI API.
+
+    Returns:
+        dict: Start dates of the saved 'summaries' and 'comparisons'.
+    """
+    start_dates = week_start_dates(start_date, weeks + 1)
+    return {
+        "summaries": create_summaries_batch(start_dates, traffic_source, transport),
+        "comparisons": create_comparisons_batch(
+            start_dates[:weeks], traffic_source, transport
+        ),
+    }
+
+
+def _save_results(results: dict, save) -> list[str]:
+    """
+    Saves each successful batch result, logging the failed ones.
+
+    Raises:
+        RuntimeError: If any result failed, after the others were saved.
+    """
+    saved = []
+    failed = []
+    for start_date, result in results.items():
+        try:
+            if isinstance(result, Exception):
+                raise result
+            save(start_date, result)
+        except Exception as e:
+            logger.error("Failed to process batch result for %s: %s", start_date, e)
+            failed.append(start_date)
+            continue
+        saved.append(start_date)
+
+    if failed:
+        raise RuntimeError(f"Batch results failed for weeks starting: {', '.join(failed)}.")
+    return saved
@@ -3,28 +3,35 @@
 Comparison Service for Dataset Summaries
 Handles LLM comparison generation for two dataset summaries stored in the database.
 
-This service compares dataset summaries and key metrics for the current and previous weeks using OpenAI's LLM. It begins by validating the absence of duplicate comparisons, then fetches the relevant summaries from the database. The summaries are formatted and processed to generate a natural language comparison summary and key metrics comparison. Results are stored in the Comparison and KeyMetricComparison models, ensuring persistence and availability for further analysis. Errors are logged at each step to facilitate debugging and maintain reliability.
+This service compares dataset summaries and key metrics for the current and previous weeks using OpenAI's LLM. It begins by validating the absence of duplicate comparisons, then fetches the relevant summaries from the database. The key metric changes are computed from the stored values and sent with the summaries as a compact table, and the LLM only writes the comparison summary and a description of each change. Results are stored in the Comparison and KeyMetricComparison models, ensuring persistence and availability for further analysis. Errors are logged at each step to facilitate debugging and maintain reliability.
 """
 
 import logging
 from datetime import datetime, timedelta
+from typing import Optional
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from apps.insights.models.comparison import Comparison, KeyMetricComparison
 from apps.insights.models.summary import Summary
+from apps.insights.services.csv.data_overview import format_significant
 from apps.insights.services.openai.comparison_generator import generate_comparison
-from apps.insights.services.openai.schemas import ComparisonOutput
+from apps.insights.services.openai.schemas import (
+    ComparisonOutput,
+    KeyMetric,
+    KeyMetricDelta,
+)
 from apps.insights.services.utils.db_operations import save_comparison_to_database
 
 logger = logging.getLogger(__name__)
 
 
-def create_comparison(start_date: str):
+def create_comparison(start_date: str, traffic_source: str = "organic"):
     """
     Fetches summaries for current week and past week from the database,
     passes them to the processing service, then saves the comparison to the database.
 
     Args:
         start_date (str): The start date for the current week's summary (YYYY-MM-DD).
+        traffic_source (str): Traffic source of the summaries to compare.
 
     Raises:
         ValidationError: Raised if one or both summaries are missing, or if a comparison already exists.
@@ -46,6 +53,7 @@ def create_comparison(start_date: str):
         if Comparison.objects.filter(
             summary1__start_date=start_date_week1.strftime("%Y-%m-%d"),
             summary2__start_date=start_date_week2.strftime("%Y-%m-%d"),
+            summary1__traffic_source=traffic_source,
         ).exists():
             logger.error(
                 "A comparison already exists for summaries with start dates %s and %s.",
@@ -59,7 +67,8 @@ def create_comparison(start_date: str):
         # Fetch summaries for both weeks
         try:
             summary1 = Summary.objects.get(
-                start_date=start_date_week1.strftime("%Y-%m-%d")
+                start_date=start_date_week1.strftime("%Y-%m-%d"),
+                traffic_source=traffic_source,
             )
             logger.info("Found Current Week Summary ID: %s", summary1.id)
         except Summary.DoesNotExist as exc:
@@ -71,7 +80,8 @@ def create_comparison(start_date: str):
 
         try:
             summary2 = Summary.objects.get(
-                start_date=start_date_week2.strftime("%Y-%m-%d")
+                start_date=start_date_week2.strftime("%Y-%m-%d"),
+                traffic_source=traffic_source,
             )
             logger.info("Found Past Week Summary ID: %s", summary2.id)
         except Summary.DoesNotExist as exc:
@@ -83,38 +93,30 @@ def create_comparison(start_date: str):
 
         # Run the comparison service
         logger.info("Running comparison service...")
-        data_summary1 = {
-            "dataset_summary": summary1.dataset_summary,
-            "key_metrics": [
-                {"name": metric.name, "value": metric.value}
-                for metric in summary1.key_metrics.all()
-            ],
-        }
-        data_summary2 = {
-            "dataset_summary": summary2.dataset_summary,
-            "key_metrics": [
-                {"name": metric.name, "value": metric.value}
-                for metric in summary2.key_metrics.all()
-            ],
-        }
+        data_summary1 = summary_data(summary1)
+        data_summary2 = summary_data(summary2)
 
-        comparison_result = process_summaries(data_summary1, data_summary2)
+        metric_deltas = compute_metric_deltas(data_summary1, data_summary2)
+        comparison_result = process_summaries(
+            data_summary1, data_summary2, metric_deltas
+        )
 
         # Log the comparison result
         logger.info("Comparison Service Output:")
         logger.info("Comparison Summary: %s", comparison_result.comparison_summary)
-        for metric in comparison_result.key_metrics_comparison:
+        for metric in metric_deltas:
             logger.info(
-                "%s: Current Week = %s, Past Week = %s (%s)",
+                "%s: Current Week = %s, Past Week = %s",
                 metric.name,
                 metric.value1,
                 metric.value2,
-                metric.description,
             )
 
         # Save the comparison result to the database
         logger.info("Saving comparison result to the database...")
-        save_comparison_to_database(summary1.id, summary2.id, comparison_result)
+        save_comparison_to_database(
+            summary1.id, summary2.id, comparison_result, metric_deltas
+        )
         logger.info("Comparison result has been saved successfully!")
 
     except ValidationError as ve:
@@ -127,13 +129,58 @@ def create_comparison(start_date: str):
     logger.info("Comparison generation completed.")
 
 
-def process_summaries(data_summary1: dict, data_summary2: dict) -> ComparisonOutput:
+def create_source_comparisons(start_date: str) -> list[str]:
+    """
+    Creates a week-over-week comparison for every traffic source that has
+    summaries for both weeks and no comparison yet.
+
+    Args:
+        start_date (str): The start date for the current week's summaries (YYYY-MM-DD).
+
+    Returns:
+        list[str]: The traffic sources that were compared.
+    """
+    start_date_week1 = datetime.strptime(start_date, "%Y-%m-%d")
+    start_date_week2 = start_date_week1 - timedelta(days=7)
+
+    def summarized_sources(week_start: datetime) -> set:
+        return set(
+            Summary.objects.filter(
+                start_date=week_start.strftime("%Y-%m-%d")
+            ).values_list("traffic_source", flat=True)
+        )
+
+    compared_sources = set(
+        Comparison.objects.filter(
+            summary1__start_date=start_date_week1.strftime("%Y-%m-%d"),
+            summary2__start_date=start_date_week2.strftime("%Y-%m-%d"),
+        ).values_list("summary1__traffic_source", flat=True)
+    )
+    sources = sorted(
+        (summarized_sources(start_date_week1) & summarized_sources(start_date_week2))
+        - compared_sources
+    )
+    logger.info("Comparing traffic sources: %s", ", ".join(sources) or "none")
+
+    for source in sources:
+        create_comparison(start_date, source)
+    return sources
+
+
+def process_summaries(
+    data_summary1: dict,
+    data_summary2: dict,
+    metric_deltas: Optional[list[KeyMetricDelta]] = None,
+) -> ComparisonOutput:
     """
-    Merges two dataset summaries into strings and generates a structured comparison.
+    Prepares two dataset summaries and their key metric changes for the LLM and
+    generates a structured comparison.
 
     Args:
         data_summary1 (dict): The first dataset summary with 'key_metrics'.
         data_summary2 (dict): The second dataset summary with 'key_metrics'.
+        metric_deltas (list[KeyMetricDelta]): Key metric changes already
+            computed from both summaries. Computed if not given.
 
     Returns:
         ComparisonOutput: A structured comparison containing a summary and key metrics comparison.
@@ -142,15 +189,15 @@ def process_summaries(data_summary1: dict, data_summary2: dict) -> ComparisonOut
         logging.info("Starting comparison of dataset summaries...")
 
         # Step 1: Validate and prepare text strings for the LLM
-        summary1 = format_summary(data_summary1)
-        summary2 = format_summary(data_summary2)
+        prompt_fields = comparison_prompt_fields(
+            data_summary1, data_summary2, metric_deltas
+        )
 
         logging.info("Generated summaries for comparison.")
-        logging.debug("Prepared Summary of Current Week:\n%s", summary1)
-        logging.debug("Prepared Summary of Previous Week:\n%s", summary2)
+        logging.debug("Prepared Key Metrics:\n%s", prompt_fields["metric_deltas"])
 
         # Step 2:Generate comparison using LLM
-        comparison_result = generate_comparison(summary1, summary2)
+        comparison_result = generate_comparison(**prompt_fields)
 
         # Log detailed results
         logging.info("Comparison completed successfully.")
@@ -160,13 +207,7 @@ def process_summaries(data_summary1: dict, data_summary2: dict) -> ComparisonOut
         logging.info("%s", comparison_result.comparison_summary)
         logging.info("Key Metrics Comparison:")
         for metric in comparison_result.key_metrics_comparison:
-            logging.info(
-                "%s: Current Week = %s, Past Week = %s (%s)",
-                metric.name,
-                metric.value1,
-                metric.value2,
-                metric.description,
-            )
+            logging.info("%s: %s", metric.name, metric.description)
 
         return comparison_result
 
@@ -179,40 +220,121 @@ def process_summaries(data_summary1: dict, data_summary2: dict) -> ComparisonOut
         raise
 
 
-def format_summary(data_summary: dict) -> str:
+def summary_data(summary: Summary) -> dict:
     """
-    Combines dataset_summary and key_metrics from a structured dataset summary into a single string for LLM input.
+    Returns a stored summary as the dictionary `process_summaries` expects.
 
     Args:
-        data_summary (dict): A dictionary containing 'dataset_summary' (str) and 'key_metrics' (list of dicts).
+        summary (Summary): The stored summary.
 
     Returns:
-        str: A combined string representation of the dataset summary and its key metrics.
+        dict: 'dataset_summary' (str) and 'key_metrics' (list of dicts).
     """
-    try:
-        if not isinstance(data_summary, dict):
-            raise ValueError("data_summary must be a dictionary.")
+    return {
+        "dataset_summary": summary.dataset_summary,
+        "key_metrics": [
+            {"name": metric.name, "value": metric.value}
+            for metric in summary.key_metrics.all()
+        ],
+    }
+
+
+def compute_metric_deltas(
+    data_summary1: dict, data_summary2: dict
+) -> list[KeyMetricDelta]:
+    """
+    Pairs the key metrics of two dataset summaries and computes their changes.
 
-        if not data_summary.get("dataset_summary"):
-            raise ValueError("Missing 'dataset_summary' in data_summary.")
+    Args:
+        data_summary1 (dict): The current week's summary with 'key_metrics'.
+        data_summary2 (dict): The past week's summary with 'key_metrics'.
 
+    Returns:
+        list[KeyMetricDelta]: The metrics present in both summaries, in
+        `KeyMetric.ordered_metrics` order.
+    """
+    for data_summary in (data_summary1, data_summary2):
+        if not isinstance(data_summary, dict):
+            raise ValueError("data_summary must be a dictionary.")
         if not data_summary.get("key_metrics"):
             raise ValueError("Missing 'key_metrics' in data_summary.")
 
-        key_metrics_str = "\n".join(
-            "- %s: %s" % (metric["name"], metric["value"])
-            for metric in data_summary["key_metrics"]
-            if "name" in metric and "value" in metric
+    values1, values2 = (
+        {metric["name"]: metric["value"] for metric in data_summary["key_metrics"]}
+        for data_summary in (data_summary1, data_summary2)
+    )
+    ordered_names = [metric.name for metric in KeyMetric.ordered_metrics()]
+    names = [name for name in ordered_names if name in values1 and name in values2]
+    if not names:
+        raise ValueError("The summaries have no key metrics in common.")
+
+    return [
+        KeyMetricDelta(
+            name=name,
+            value1=values1[name],
+            value2=values2[name],
+            percentage_difference=KeyMetricComparison.compute_percentage_difference(
+                values1[name], values2[name]
+            ),
         )
+        for name in names
+    ]
+
 
-        if not key_metrics_str:
-            logging.warning("Key metrics are empty or malformed.")
-            key_metrics_str = "No key metrics available."
+def format_metric_deltas(metric_deltas: list[KeyMetricDelta]) -> str:
+    """
+    Encodes key metric changes as a compact CSV table for LLM input.
 
-        return "%s\n\nKey Metrics:\n%s" % (
-            data_summary["dataset_summary"],
-            key_metrics_str,
+    Values are rounded like the compact overviews to keep the prompt short.
+    """
+    rows = ["metric,this_week,previous_week,change_pct"] + [
+        ",".join(
+            [
+                metric.name,
+                format_significant(metric.value1),
+                format_significant(metric.value2),
+                (
+                    f"{metric.percentage_difference:+.1f}"
+                    if metric.percentage_difference is not None
+                    else ""
+                ),
+            ]
         )
+        for metric in metric_deltas
+    ]
+    return "\n".join(rows)
+
+
+def comparison_prompt_fields(
+    data_summary1: dict,
+    data_summary2: dict,
+    metric_deltas: Optional[list[KeyMetricDelta]] = None,
+) -> dict:
+    """
+    Builds the fields of `COMPARISON_PROMPT` from two dataset summaries.
+
+    Args:
+        data_summary1 (dict): The current week's summary, with 'dataset_summary'
+            (str) and 'key_metrics' (list of dicts).
+        data_summary2 (dict): The past week's summary, in the same format.
+        metric_deltas (list[KeyMetricDelta]): Key metric changes already
+            computed from both summaries. Computed if not given.
+
+    Returns:
+        dict: 'summary1', 'summary2' and 'metric_deltas' strings.
+    """
+    try:
+        if metric_deltas is None:
+            metric_deltas = compute_metric_deltas(data_summary1, data_summary2)
+        for data_summary in (data_summary1, data_summary2):
+            if not data_summary.get("dataset_summary"):
+                raise ValueError("Missing 'dataset_summary' in data_summary.")
+
+        return {
+            "summary1": data_summary1["dataset_summary"],
+            "summary2": data_summary2["dataset_summary"],
+            "metric_deltas": format_metric_deltas(metric_deltas),
+        }
     except Exception as e:
         logging.error("Failed to prepare summary: %s", e)
         raise
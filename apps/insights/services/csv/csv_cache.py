@@ -0,0 +1,354 @@
+# apps/insights/services/csv/csv_cache.py
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    feather = None
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Sidecar cache files are written next to the source CSV in this directory
+CACHE_DIR_NAME = ".cache"
+
+# Block size used when hashing the CSV contents
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Number of bytes before a checkpoint offset that must be unchanged for appends
+TAIL_WINDOW_SIZE = 64 * 1024
+
+# Number of hex digits of the options digest used in sidecar file names
+OPTIONS_DIGEST_LENGTH = 16
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """
+    The byte offset up to which a CSV file has been parsed, with checksums of
+    its header line and of the bytes just before the offset.
+
+    If both checksums still match, the file is assumed to only have gained rows
+    after `offset`, which can then be parsed on their own.
+    """
+
+    offset: int
+    header_sha256: str
+    tail_sha256: str
+
+
+def cache_available() -> bool:
+    """
+    Returns True if the columnar sidecar cache can be used (pyarrow is installed).
+    """
+    return feather is not None
+
+
+def cache_paths(file_path: Path, read_csv_kwargs: dict) -> tuple[Path, Path]:
+    """
+    Returns the paths of the Feather sidecar and its metadata file for a CSV file
+    parsed with the given options. Each set of options has its own sidecar, so
+    differently parsed reads of the same file do not evict each other.
+
+    Args:
+        file_path (Path): Path to the source CSV file.
+        read_csv_kwargs (dict): Options the CSV is parsed with.
+
+    Returns:
+        tuple[Path, Path]: Paths to the `.feather` data file and the `.json` metadata file.
+    """
+    cache_dir = file_path.parent / CACHE_DIR_NAME
+    stem = f"{file_path.name}.{options_digest(read_csv_kwargs)[:OPTIONS_DIGEST_LENGTH]}"
+    return (
+        cache_dir / f"{stem}.feather",
+        cache_dir / f"{stem}.json",
+    )
+
+
+def content_hash(file_path: Path) -> str:
+    """
+    Computes the SHA-256 hash of a file's contents without loading it into memory.
+
+    Args:
+        file_path (Path): Path to the file to hash.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def take_checkpoint(file_path: Path, offset: int) -> Optional[Checkpoint]:
+    """
+    Builds the checkpoint of a CSV file at a byte offset.
+
+    Args:
+        file_path (Path): Path to the CSV file.
+        offset (int): Number of bytes that have been parsed.
+
+    Returns:
+        Optional[Checkpoint]: The checkpoint, or None if `offset` is not at the
+        end of a complete line, in which case rows cannot be appended safely.
+    """
+    with open(file_path, "rb") as f:
+        header = f.readline()
+        if offset < len(header) or not header.endswith(b"\n"):
+            return None
+        tail_start = max(len(header), offset - TAIL_WINDOW_SIZE)
+        f.seek(tail_start)
+        tail = f.read(offset - tail_start)
+    if len(tail) != offset - tail_start or (tail and not tail.endswith(b"\n")):
+        return None
+    return Checkpoint(
+        offset=offset,
+        header_sha256=hashlib.sha256(header).hexdigest(),
+        tail_sha256=hashlib.sha256(tail).hexdigest(),
+    )
+
+
+def appended_bytes(file_path: Path, checkpoint: Checkpoint) -> Optional[int]:
+    """
+    Returns how many bytes were appended to a CSV file since a checkpoint.
+
+    Only the header line and the bytes just before the checkpoint are read, so
+    the check costs the same regardless of the file's size.
+
+    Args:
+        file_path (Path): Path to the CSV file.
+        checkpoint (Checkpoint): Checkpoint taken when the file was last parsed.
+
+    Returns:
+        Optional[int]: The number of appended bytes, or None if the file no
+        longer starts with the checkpointed contents and must be reloaded in full.
+    """
+    try:
+        size = file_path.stat().st_size
+    except FileNotFoundError:
+        return None
+    if size < checkpoint.offset or take_checkpoint(file_path, checkpoint.offset) != checkpoint:
+        return None
+    return size - checkpoint.offset
+
+
+def options_digest(read_csv_kwargs: dict) -> str:
+    """
+    Builds a stable digest of the `pd.read_csv` options so that differently parsed
+    frames of the same file never share a cache entry.
+    """
+    return hashlib.sha256(
+        repr(sorted(read_csv_kwargs.items())).encode("utf-8")
+    ).hexdigest()
+
+
+def data_fingerprint(file_path: Path, read_csv_kwargs: dict) -> Optional[tuple]:
+    """
+    Builds a cheap fingerprint of a CSV file from its resolved path, size,
+    modification time and parse options, without reading its contents.
+
+    Args:
+        file_path (Path): Path to the CSV file.
+        read_csv_kwargs (dict): Options the CSV is parsed with.
+
+    Returns:
+        Optional[tuple]: The fingerprint, or None if the file does not exist.
+    """
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return (
+        str(file_path.resolve()),
+        stat.st_size,
+        stat.st_mtime_ns,
+        options_digest(read_csv_kwargs),
+    )
+
+
+def load_cached_frame(file_path: Path, read_csv_kwargs: dict) -> Optional[pd.DataFrame]:
+    """
+    Loads the memory-mapped Feather copy of a CSV file if it is still fresh.
+
+    The cache is keyed by the file's resolved path, size, modification time and
+    content hash. The content hash is only recomputed when the modification time
+    differs, so a touched but unchanged file keeps its cache.
+
+    Args:
+        file_path (Path): Path to the source CSV file.
+        read_csv_kwargs (dict): Options the CSV would be parsed with.
+
+    Returns:
+        Optional[pd.DataFrame]: The cached DataFrame, or None if there is no fresh cache.
+    """
+    if not cache_available():
+        return None
+
+    data_path, meta_path = cache_paths(file_path, read_csv_kwargs)
+    if not data_path.exists() or not meta_path.exists():
+        return None
+
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        logging.warning("Unreadable CSV cache metadata at %s: %s", meta_path, e)
+        return None
+
+    stat = file_path.stat()
+    if (
+        meta.get("path") != str(file_path.resolve())
+        or meta.get("options") != options_digest(read_csv_kwargs)
+        or meta.get("size") != stat.st_size
+    ):
+        logging.info("Stale CSV cache for %s, rebuilding.", file_path)
+        return None
+
+    if meta.get("mtime_ns") != stat.st_mtime_ns:
+        if not _contents_unchanged(file_path, meta):
+            logging.info("CSV contents changed for %s, rebuilding cache.", file_path)
+            return None
+        # Contents are unchanged, so only the recorded modification time is refreshed
+        meta["mtime_ns"] = stat.st_mtime_ns
+        _write_meta(meta_path, meta)
+
+    df = _read_cached_data(data_path)
+    if df is not None:
+        logging.info("Loaded %s from columnar cache: %d rows", file_path, len(df))
+    return df
+
+
+def load_cached_prefix(
+    file_path: Path, read_csv_kwargs: dict
+) -> Optional[tuple[pd.DataFrame, Checkpoint]]:
+    """
+    Loads the Feather copy of a CSV file that has only gained rows since it was
+    cached, together with the checkpoint the new rows start at.
+
+    Args:
+        file_path (Path): Path to the source CSV file.
+        read_csv_kwargs (dict): Options the CSV would be parsed with.
+
+    Returns:
+        Optional[tuple[pd.DataFrame, Checkpoint]]: The cached rows and their
+        checkpoint, or None if the cached prefix can not be reused.
+    """
+    if not cache_available():
+        return None
+
+    data_path, meta_path = cache_paths(file_path, read_csv_kwargs)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if (
+        not data_path.exists()
+        or not meta.get("checkpoint")
+        or meta.get("path") != str(file_path.resolve())
+        or meta.get("options") != options_digest(read_csv_kwargs)
+    ):
+        return None
+
+    checkpoint = Checkpoint(**meta["checkpoint"])
+    appended = appended_bytes(file_path, checkpoint)
+    if appended is None:
+        logging.info("CSV prefix changed for %s, reloading in full.", file_path)
+        return None
+    if appended == 0:
+        return None
+
+    df = _read_cached_data(data_path)
+    return None if df is None else (df, checkpoint)
+
+
+def write_cached_frame(
+    file_path: Path,
+    df: pd.DataFrame,
+    read_csv_kwargs: dict,
+    checkpoint: Optional[Checkpoint] = None,
+) -> None:
+    """
+    Writes a parsed CSV file to its Feather sidecar cache.
+
+    Failures are logged and ignored, as the cache is only an optimisation.
+
+    Args:
+        file_path (Path): Path to the source CSV file.
+        df (pd.DataFrame): The DataFrame parsed from the CSV file.
+        read_csv_kwargs (dict): Options the CSV was parsed with.
+        checkpoint (Checkpoint): Set when `df` was extended with appended rows
+            up to the checkpoint's offset. The full content hash is then not
+            recomputed, so the write costs the same however long the file is.
+    """
+    if not cache_available():
+        return
+
+    data_path, meta_path = cache_paths(file_path, read_csv_kwargs)
+    try:
+        stat = file_path.stat()
+        if checkpoint is None:
+            sha256 = content_hash(file_path)
+            checkpoint = take_checkpoint(file_path, stat.st_size)
+        else:
+            sha256 = None
+        meta = {
+            "path": str(file_path.resolve()),
+            "size": checkpoint.offset if sha256 is None else stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+            "options": options_digest(read_csv_kwargs),
+            "checkpoint": asdict(checkpoint) if checkpoint else None,
+        }
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        # Invalidate the old entry before the data file is replaced
+        meta_path.unlink(missing_ok=True)
+
+        # Write uncompressed so that later reads can be memory-mapped
+        tmp_path = data_path.with_suffix(".feather.tmp")
+        df.reset_index(drop=True).to_feather(tmp_path, compression="uncompressed")
+        os.replace(tmp_path, data_path)
+        _write_meta(meta_path, meta)
+        logging.info("Wrote columnar cache for %s to %s", file_path, data_path)
+    except Exception as e:
+        logging.warning("Failed to write CSV cache for %s: %s", file_path, e)
+
+
+def _contents_unchanged(file_path: Path, meta: dict) -> bool:
+    """
+    Returns True if a file of the recorded size still has the cached contents,
+    using the full content hash or, after incremental writes, the checkpoint.
+    """
+    if meta.get("sha256"):
+        return meta["sha256"] == content_hash(file_path)
+    checkpoint = meta.get("checkpoint")
+    return bool(checkpoint) and appended_bytes(file_path, Checkpoint(**checkpoint)) == 0
+
+
+def _read_cached_data(data_path: Path) -> Optional[pd.DataFrame]:
+    """
+    Memory-maps the Feather data file, returning None if it can not be read.
+    """
+    try:
+        return feather.read_table(data_path, memory_map=True).to_pandas()
+    except Exception as e:
+        logging.warning("Failed to read CSV cache at %s: %s", data_path, e)
+        return None
+
+
+def _write_meta(meta_path: Path, meta: dict) -> None:
+    """
+    Atomically writes the cache metadata file.
+    """
+    tmp_path = meta_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp_path, meta_path)
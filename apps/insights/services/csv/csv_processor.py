@@ -1,58 +1,452 @@
 # apps/insights/services/csv_processor.py
+import hashlib
 import logging
+import os
+import threading
+import weakref
+from pathlib import Path
+from typing import Optional
 import pandas as pd  # Import pandas for date processing
-from .csv_reader import read_csv
-from .data_validator import validate_columns
-from .data_cleaner import clean_data
-from .data_filter import filter_data
-from .data_overview import generate_overview
+from .csv_cache import Checkpoint, appended_bytes, data_fingerprint, take_checkpoint
+from .csv_reader import CHUNK_SIZE, CSV_FILE_PATH, iter_csv_chunks, read_csv_since
+from .data_validator import schema_read_options, validate_columns
+from .data_cleaner import (
+    CleaningReport,
+    DataCleaningError,
+    clean_data,
+    detect_date_column,
+)
+from .data_filter import filter_chunks
+from .dataset_store import (
+    DATASET_PATH,
+    dataset_partitions,
+    ingest_dataset,
+    partition_paths,
+    week_partitions,
+)
+from .frame_cache import frame_cache
+from .pandas import PandasEngine
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+# Engine used when CSVProcessor is created without one ("pandas" or "polars")
+DEFAULT_ENGINE = os.environ.get("INSIGHTS_CSV_ENGINE", "pandas")
+
+# Fingerprint and checkpoint of the latest cleaned frame cached for each file
+_frame_checkpoints: dict[str, tuple[tuple, Checkpoint]] = {}
+_frame_checkpoints_lock = threading.Lock()
+
+# Cleaned frames verified to be sorted for binary-search lookups, by the
+# fingerprint they are cached under; frames are held weakly and compared by
+# identity, so a frame replaced or re-sorted since is filtered with masks
+_lookup_orders: dict[tuple, weakref.ref] = {}
+_lookup_orders_lock = threading.Lock()
+
+
+def get_engine(name: str):
+    """
+    Returns an instance of the named CSVProcessor engine.
+
+    Args:
+        name (str): The engine name, "pandas" or "polars".
+
+    Raises:
+        ValueError: If the engine is unknown or its dependency is not installed.
+    """
+    if name == "pandas":
+        return PandasEngine()
+    if name == "polars":
+        try:
+            from .polars import PolarsEngine
+        except ImportError as e:
+            raise ValueError("The polars engine requires the polars package.") from e
+        return PolarsEngine()
+    raise ValueError(f"Unknown CSVProcessor engine: {name}")
+
 
 class CSVProcessor:
     """
     A utility class for processing CSV files with various data manipulation operations.
 
     This class provides a streamlined workflow for loading, validating, cleaning,
-    filtering, and generating overviews of CSV data using Pandas.
+    filtering, and generating overviews of CSV data using a selectable engine:
+    eager Pandas DataFrames (the default) or Polars lazy frames.
+
+    Validated and cleaned Pandas DataFrames are kept in a process-wide LRU cache
+    keyed by the file's fingerprint, so later instances in the same worker skip
+    loading, validation and cleaning entirely.
+
+    When the CSV file has only gained rows since its cleaned DataFrame was
+    cached, only the appended rows are parsed, cleaned and merged into it.
+
+    When a partitioned dataset path is configured, `filter` reads only the
+    year/week/source partitions it needs instead of the whole CSV file.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        file_path: Optional[str] = None,
+        use_cache: bool = True,
+        engine: Optional[str] = None,
+        dataset_path: Optional[str] = DATASET_PATH,
+        incremental: bool = True,
+    ) -> None:
         """
         Initialize the CSVProcessor.
+
+        Args:
+            file_path (str): Path to the CSV file. Defaults to `CSV_FILE_PATH`.
+            use_cache (bool): Whether to use the cleaned-DataFrame and columnar caches.
+            engine (str): "pandas" or "polars". Defaults to `DEFAULT_ENGINE`.
+            dataset_path (str): Root of a partitioned dataset written by `ingest`.
+                Defaults to `DATASET_PATH`; None reads the CSV file. The dataset
+                is only as fresh as the last `ingest`, which the weekly summary
+                chain runs before reading it.
+            incremental (bool): Whether to parse only rows appended since the
+                file was last loaded, falling back to a full load if its
+                earlier contents changed.
         """
-        self.df: pd.DataFrame | None = None  # Placeholder for the DataFrame
+        self.file_path = file_path or CSV_FILE_PATH
+        self.use_cache = use_cache
+        self.engine = get_engine(engine or DEFAULT_ENGINE)
+        self.dataset_path = dataset_path
+        self.incremental = incremental
+        self.df = None  # Placeholder for the engine's frame
+        self.fingerprint: tuple | None = None
+        self.frame_key: tuple | None = None  # Key `df` is cached under
+        self.is_clean = False
+        self.cleaning_report: CleaningReport | None = None
 
     def load(self) -> None:
         """
-        Loads the data from the CSV file into a Pandas DataFrame.
+        Loads the data from the CSV file into the engine's frame.
+
+        If a cleaned DataFrame for the same file is cached, it is used instead
+        and the subsequent `validate` and `clean` calls become no-ops. With a
+        partitioned dataset there is nothing to load, as `filter` reads the
+        already cleaned partitions directly.
+        """
+        if self.dataset_path:
+            self.is_clean = True
+            return
+
+        self.fingerprint = data_fingerprint(Path(self.file_path), {})
+        self.frame_key = None
+        if self.use_cache and self.engine.cacheable and self.fingerprint is not None:
+            cached_df = frame_cache.get(self.fingerprint)
+            if cached_df is not None:
+                logging.info("Using cached cleaned data: %s", frame_cache.stats())
+                self.df = cached_df
+                self.frame_key = self.fingerprint
+                self.is_clean = True
+                # Only frames without invalid rows are cached
+                self.cleaning_report = CleaningReport(
+                    date_column=detect_date_column(cached_df), total_rows=len(cached_df)
+                )
+                return
+            if self.incremental and self._append_to_cached_frame():
+                return
+
+        self.df = self.engine.load(
+            self.file_path, use_cache=self.use_cache, incremental=self.incremental
+        )
+        self.is_clean = False
+
+    def _append_to_cached_frame(self) -> bool:
+        """
+        Merges the rows appended to the CSV file into the cleaned DataFrame
+        cached for its previous version.
+
+        Returns:
+            bool: True if `df` now holds the cleaned data, False if the file must
+            be loaded in full.
+        """
+        with _frame_checkpoints_lock:
+            previous = _frame_checkpoints.get(self.fingerprint[0])
+        if previous is None:
+            return False
+        previous_fingerprint, checkpoint = previous
+        cached_df = frame_cache.get(previous_fingerprint)
+        if cached_df is None:
+            return False
+
+        file_path = Path(self.file_path)
+        if appended_bytes(file_path, checkpoint) is None:
+            logging.info("CSV prefix changed for %s, reloading in full.", file_path)
+            with _frame_checkpoints_lock:
+                if _frame_checkpoints.get(self.fingerprint[0]) == previous:
+                    del _frame_checkpoints[self.fingerprint[0]]
+            return False
+
+        appended_df, end_offset = read_csv_since(
+            file_path, checkpoint.offset, **schema_read_options()
+        )
+        if len(appended_df) == 0:
+            # Only the modification time changed, or the new line is incomplete
+            self.df = cached_df
+            self.frame_key = previous_fingerprint
+            self.is_clean = True
+            if end_offset != self.fingerprint[1]:
+                return True
+        else:
+            self.engine.validate(appended_df)
+            try:
+                self.df, self.cleaning_report = self.engine.append(
+                    cached_df, appended_df
+                )
+            except DataCleaningError as e:
+                self.cleaning_report = e.report
+                raise
+            self.is_clean = True
+        logging.info(
+            "Merged %d appended rows into cached cleaned data.", len(appended_df)
+        )
+
+        key = self.fingerprint
+        if end_offset != self.fingerprint[1]:
+            # A trailing incomplete line is not part of the frame, so the frame
+            # is cached under its own key and the line merged once complete
+            key = (self.fingerprint[0], end_offset, None, self.fingerprint[3])
+        self._record_lookup_order(key)
+        # The previous entry is only dropped once the new frame is cached
+        self._cache_frame(take_checkpoint(file_path, end_offset), key)
+        if key != previous_fingerprint:
+            frame_cache.discard(previous_fingerprint)
+        return True
+
+    def _cache_frame(
+        self, checkpoint: Optional[Checkpoint], key: Optional[tuple] = None
+    ) -> None:
+        """
+        Stores the cleaned DataFrame in the frame cache, under the file's
+        fingerprint unless another `key` is given, remembering the checkpoint
+        later loads can append rows from.
+        """
+        key = key or self.fingerprint
+        frame_cache.put(key, self.df)
+        if checkpoint is not None:
+            with _frame_checkpoints_lock:
+                _frame_checkpoints[self.fingerprint[0]] = (key, checkpoint)
+
+    def _record_lookup_order(self, key: tuple) -> None:
+        """
+        Records the cleaned DataFrame under `key` if it is sorted for
+        binary-search lookups. The order is checked once per frame, and not
+        again for a frame already recorded under its previous key.
+        """
+        self.frame_key = key
+        with _lookup_orders_lock:
+            recorded = any(ref() is self.df for ref in _lookup_orders.values())
+        if not recorded and not self.engine.is_sorted_for_lookup(self.df):
+            return
+        with _lookup_orders_lock:
+            for stale in [k for k, ref in _lookup_orders.items() if ref() is None]:
+                del _lookup_orders[stale]
+            _lookup_orders[key] = weakref.ref(self.df)
+
+    def _sorted_for_lookup(self) -> bool:
+        """
+        Returns whether `df` is the frame recorded as sorted under its key.
         """
-        self.df = read_csv()
+        with _lookup_orders_lock:
+            ref = _lookup_orders.get(self.frame_key)
+        return ref is not None and ref() is self.df
 
     def validate(self) -> None:
         """
         Validates that the DataFrame contains all required columns.
         """
-        validate_columns(self.df)
+        if self.is_clean:
+            return
+        self.engine.validate(self.df)
 
     def clean(self) -> None:
         """
-        Cleans the DataFrame by standardizing and formatting columns.
+        Cleans the DataFrame by standardizing and formatting columns, keeping
+        the engine's cleaning report in `cleaning_report`, also when cleaning
+        fails on invalid rows.
         """
-        self.df = clean_data(self.df)
+        if self.is_clean:
+            return
+        try:
+            self.df, self.cleaning_report = self.engine.clean(self.df)
+        except DataCleaningError as e:
+            self.cleaning_report = e.report
+            raise
+        self.is_clean = True
+        if self.fingerprint is None:
+            return
 
-    def filter(self, start_date: str, traffic_source: str = "organic") -> pd.DataFrame:
+        self._record_lookup_order(self.fingerprint)
+        if self.use_cache and self.engine.cacheable:
+            # The fingerprint was taken before loading, so it bounds what was read
+            self._cache_frame(take_checkpoint(Path(self.file_path), self.fingerprint[1]))
+
+    def filter(self, start_date: str, traffic_source: str = "organic"):
         """
         Filters the DataFrame for the specified traffic source and week.
         """
-        return filter_data(self.df, pd.to_datetime(start_date), traffic_source)
+        start_date_ts = pd.to_datetime(start_date)
+        if not self.dataset_path:
+            return self.engine.filter(
+                self.df, start_date_ts, traffic_source, self._sorted_for_lookup()
+            )
+
+        paths = partition_paths(self.dataset_path, start_date_ts, traffic_source)
+        if not paths:
+            if week_partitions(self.dataset_path, start_date_ts):
+                raise ValueError(
+                    f"No data found for traffic source '{traffic_source}'."
+                )
+            raise ValueError(
+                f"No data found in the 7-day period starting from {start_date_ts}."
+            )
+        logging.info("Reading %d dataset partitions: %s", len(paths), paths)
+        return self.engine.filter(
+            self.engine.load_partitions(paths), start_date_ts, traffic_source
+        )
+
+    def split_sources(self, start_date: str) -> dict:
+        """
+        Filters the data for the week and splits it by traffic source in one
+        pass, so every source's overview can be produced from a single load.
+
+        Returns:
+            dict: The engine's filtered frame of each traffic source, by source.
+        """
+        start_date_ts = pd.to_datetime(start_date)
+        if not self.dataset_path:
+            return self.engine.split_sources(self.df, start_date_ts)
+
+        paths = week_partitions(self.dataset_path, start_date_ts)
+        if not paths:
+            raise ValueError(
+                f"No data found in the 7-day period starting from {start_date_ts}."
+            )
+        return self.engine.split_sources(
+            self.engine.load_partitions(paths), start_date_ts
+        )
+
+    def ingest(self, dataset_path: Optional[str] = None) -> int:
+        """
+        Loads, validates and cleans the CSV file and writes it into a
+        year/week/source partitioned dataset, refreshing the partitions of every
+        week in the file, so rows added to the CSV since the last ingest are read.
+
+        The cleaned DataFrame of a processor that already read the CSV file is
+        reused; otherwise the file is loaded with the Pandas engine, whatever
+        this processor's engine or dataset path.
+
+        Args:
+            dataset_path (str): Root of the dataset. Defaults to this processor's
+                dataset path, then to `DATASET_PATH`.
+
+        Returns:
+            int: Number of partitions written.
+        """
+        dataset_path = dataset_path or self.dataset_path or DATASET_PATH
+        if not dataset_path:
+            raise ValueError("A dataset path is required to ingest data.")
+
+        source = self
+        if self.dataset_path or not self.is_clean or not isinstance(self.df, pd.DataFrame):
+            source = CSVProcessor(
+                self.file_path,
+                use_cache=self.use_cache,
+                engine="pandas",
+                dataset_path=None,
+                incremental=self.incremental,
+            )
+            source.load()
+            source.validate()
+            source.clean()
+        return ingest_dataset(source.df, dataset_path)
+
+    def stream_filter(
+        self,
+        start_date: str,
+        traffic_source: str = "organic",
+        chunksize: int = CHUNK_SIZE,
+    ) -> pd.DataFrame:
+        """
+        Filters the CSV file for the specified traffic source and week while
+        reading it in chunks, without loading the full file into memory.
+
+        Always uses Pandas and returns the same DataFrame as `load`, `validate`,
+        `clean` and `filter` with the Pandas engine.
+        """
+
+        def validated_chunks():
+            for index, chunk in enumerate(
+                iter_csv_chunks(
+                    self.file_path, chunksize=chunksize, **schema_read_options()
+                )
+            ):
+                if index == 0:
+                    validate_columns(chunk)
+                yield chunk
+
+        return filter_chunks(
+            validated_chunks(), pd.to_datetime(start_date), traffic_source, clean_data
+        )
+
+    def data_version(self, start_date: str) -> str:
+        """
+        Returns a digest of the data a week's overview is computed from,
+        without reading it: the CSV file's size and modification time, or
+        those of the week's dataset partitions. Overviews stored with another
+        version are stale, e.g. after the CSV file was rewritten or gained rows.
+
+        Args:
+            start_date (str): Start date of the week (YYYY-MM-DD).
+
+        Returns:
+            str: Hex digest, empty if there is no data.
+        """
+        if self.dataset_path:
+            paths = week_partitions(self.dataset_path, pd.to_datetime(start_date))
+            parts = [
+                (str(path), path.stat().st_size, path.stat().st_mtime_ns)
+                for path in paths
+            ]
+        else:
+            fingerprint = data_fingerprint(Path(self.file_path), {})
+            parts = [fingerprint[:3]] if fingerprint else []
+        if not parts:
+            return ""
+        return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+    def describe_overview(self) -> pd.DataFrame:
+        """
+        Computes the structured statistical overview of the filtered DataFrame,
+        e.g. to store it with `save_overview_to_database`.
+        """
+        return self.engine.describe_overview(self.df)
 
     def generate_overview(self) -> str:
         """
         Generates a statistical overview of the filtered DataFrame.
         """
-        # FIXME: dict to store the overview in a model
-        return generate_overview(self.df)
+        return self.engine.generate_overview(self.df)
+
+    def generate_weekly_overviews(self) -> pd.DataFrame:
+        """
+        Generates the statistical overview of every (ISO week, source) pair in
+        the cleaned data, or in the whole partitioned dataset if one is configured.
+
+        Returns:
+            pd.DataFrame: One row per (iso_year, iso_week, source, metric).
+        """
+        if self.dataset_path:
+            paths = dataset_partitions(self.dataset_path)
+            if not paths:
+                raise ValueError(f"No dataset partitions found at {self.dataset_path}.")
+            return self.engine.generate_weekly_overviews(
+                self.engine.load_partitions(paths)
+            )
+
+        if self.df is None or not self.is_clean:
+            raise ValueError("Data must be loaded and cleaned before generating overviews.")
+        return self.engine.generate_weekly_overviews(self.df)
@@ -1,8 +1,15 @@
 # apps/insights/services/csv/csv_reader.py
-from typing import Optional
+from typing import Iterator, Optional
+import io
 import logging
 from pathlib import Path
 import pandas as pd
+from .csv_cache import (
+    load_cached_frame,
+    load_cached_prefix,
+    take_checkpoint,
+    write_cached_frame,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -12,13 +19,36 @@ logging.basicConfig(
 # Default CSV file path
 CSV_FILE_PATH = "./apps/insights/data/ga4_data.csv"
 
+# Default number of rows per chunk when streaming a CSV file
+CHUNK_SIZE = 100_000
+
+# `pd.read_csv` options that select rows by their position in the file, which
+# would be applied again to the appended rows as if they were a new file
+ROW_POSITION_OPTIONS = ("nrows", "skiprows", "skipfooter", "header")
 
-def read_csv(file_path: Optional[str] = None, **read_csv_kwargs: dict) -> pd.DataFrame:
+
+def read_csv(
+    file_path: Optional[str] = None,
+    use_cache: bool = True,
+    incremental: bool = True,
+    **read_csv_kwargs: dict,
+) -> pd.DataFrame:
     """
     Reads a CSV file into a Pandas DataFrame.
 
+    The first load writes a columnar (Feather) sidecar copy of the file; later loads
+    memory-map that copy instead of re-parsing the CSV text, as long as the file's
+    path, size, modification time and content hash still match.
+
+    If the file has only gained rows since it was cached, the cached rows are
+    reused and only the appended bytes are parsed. If its header or the bytes
+    before the cached offset changed, or rows are selected by position with
+    one of `ROW_POSITION_OPTIONS`, the whole file is parsed again.
+
     Args:
         file_path (str): Path to the CSV file. Defaults to `CSV_FILE_PATH`.
+        use_cache (bool): Whether to read from and write to the columnar sidecar cache.
+        incremental (bool): Whether to parse only rows appended since the cache was written.
         read_csv_kwargs (dict): Additional keyword arguments to pass to `pd.read_csv`.
 
     Returns:
@@ -38,6 +68,29 @@ def read_csv(file_path: Optional[str] = None, **read_csv_kwargs: dict) -> pd.Dat
         logging.error("CSV file not found at: %s", file_path_obj)
         raise FileNotFoundError(f"CSV file not found at: {file_path_obj}")
 
+    if use_cache:
+        cached_df = load_cached_frame(file_path_obj, read_csv_kwargs)
+        if cached_df is not None:
+            return cached_df
+
+        incremental = incremental and not row_position_options(read_csv_kwargs)
+        cached_prefix = (
+            load_cached_prefix(file_path_obj, read_csv_kwargs) if incremental else None
+        )
+        if cached_prefix is not None:
+            cached_df, checkpoint = cached_prefix
+            appended_df, end_offset = read_csv_since(
+                file_path_obj, checkpoint.offset, **read_csv_kwargs
+            )
+            df = append_rows(cached_df, appended_df)
+            write_cached_frame(
+                file_path_obj,
+                df,
+                read_csv_kwargs,
+                checkpoint=take_checkpoint(file_path_obj, end_offset),
+            )
+            return df
+
     try:
         logging.info("Loading CSV file from: %s", file_path_obj)
         df = pd.read_csv(file_path_obj, **read_csv_kwargs)
@@ -47,7 +100,125 @@ def read_csv(file_path: Optional[str] = None, **read_csv_kwargs: dict) -> pd.Dat
             len(df),
             len(df.columns),
         )
-        return df
+    except Exception as e:
+        logging.error("Error reading CSV file at %s: %s", file_path_obj, e)
+        raise ValueError(f"Error reading CSV file at {file_path_obj}: {e}") from e
+
+    if use_cache:
+        write_cached_frame(file_path_obj, df, read_csv_kwargs)
+    return df
+
+
+def row_position_options(read_csv_kwargs: dict) -> list[str]:
+    """
+    Returns the options of `read_csv_kwargs` that select rows by position.
+    """
+    return [option for option in ROW_POSITION_OPTIONS if option in read_csv_kwargs]
+
+
+def read_csv_since(
+    file_path: Path, offset: int, **read_csv_kwargs: dict
+) -> tuple[pd.DataFrame, int]:
+    """
+    Parses only the rows appended to a CSV file after a byte offset.
+
+    The header line is prepended to the appended bytes, so the rows are parsed
+    with the same columns and options as the rest of the file. A trailing
+    incomplete line, e.g. one still being written, is left for the next read.
+
+    Args:
+        file_path (Path): Path to the CSV file.
+        offset (int): Byte offset of the first appended row, at a line boundary.
+        read_csv_kwargs (dict): Additional keyword arguments to pass to `pd.read_csv`,
+            without any of `ROW_POSITION_OPTIONS`.
+
+    Returns:
+        tuple[pd.DataFrame, int]: The appended rows, and the byte offset they end at.
+
+    Raises:
+        ValueError: If there is an error reading the file or processing the
+        content, or if rows are selected by position.
+    """
+    options = row_position_options(read_csv_kwargs)
+    if options:
+        raise ValueError(f"Appended rows can not be read with {', '.join(options)}.")
+    try:
+        with open(file_path, "rb") as f:
+            header = f.readline()
+            f.seek(offset)
+            appended = f.read()
+        appended = appended[: appended.rfind(b"\n") + 1]
+
+        df = pd.read_csv(io.BytesIO(header + appended), **read_csv_kwargs)
+        logging.info(
+            "Loaded %d appended rows from %s after byte %d",
+            len(df),
+            file_path,
+            offset,
+        )
+    except Exception as e:
+        logging.error("Error reading CSV file at %s: %s", file_path, e)
+        raise ValueError(f"Error reading CSV file at {file_path}: {e}") from e
+
+    return df, offset + len(appended)
+
+
+def append_rows(df: pd.DataFrame, appended_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Appends newly parsed rows to previously parsed rows of the same file.
+
+    Categorical columns stay categorical with sorted categories, as a full
+    `pd.read_csv` of the file would produce, even when the appended rows
+    introduce or lack some categories.
+    """
+    merged = pd.concat([df, appended_df], ignore_index=True)
+    for column in df.columns:
+        if isinstance(df[column].dtype, pd.CategoricalDtype) and not isinstance(
+            merged[column].dtype, pd.CategoricalDtype
+        ):
+            merged[column] = merged[column].astype("category")
+    return merged
+
+
+def iter_csv_chunks(
+    file_path: Optional[str] = None,
+    chunksize: int = CHUNK_SIZE,
+    **read_csv_kwargs: dict,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams a CSV file as a sequence of DataFrame chunks.
+
+    Only one chunk is held in memory at a time, so peak memory is bounded by
+    `chunksize` rather than by the size of the file. Row labels continue across
+    chunks, matching the index a full `read_csv` would produce.
+
+    Args:
+        file_path (str): Path to the CSV file. Defaults to `CSV_FILE_PATH`.
+        chunksize (int): Number of rows per chunk.
+        read_csv_kwargs (dict): Additional keyword arguments to pass to `pd.read_csv`.
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+
+    Raises:
+        FileNotFoundError: If the file does not exist at the specified path.
+        ValueError: If there is an error reading the file or processing the content.
+    """
+    file_path = file_path or CSV_FILE_PATH
+    file_path_obj = Path(file_path)
+
+    if not file_path_obj.exists():
+        logging.error("CSV file not found at: %s", file_path_obj)
+        raise FileNotFoundError(f"CSV file not found at: {file_path_obj}")
+
+    logging.info(
+        "Streaming CSV file from: %s (chunksize=%d)", file_path_obj, chunksize
+    )
+    try:
+        with pd.read_csv(
+            file_path_obj, chunksize=chunksize, **read_csv_kwargs
+        ) as reader:
+            yield from reader
     except Exception as e:
         logging.error("Error reading CSV file at %s: %s", file_path_obj, e)
         raise ValueError(f"Error reading CSV file at {file_path_obj}: {e}") from e
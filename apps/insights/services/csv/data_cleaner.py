@@ -1,8 +1,12 @@
 # apps/insights/services/csv/data_cleaner.py
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Tuple
 import logging
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
 from apps.insights.services.utils.data_utils import validate_dataframe
+from .data_validator import DATE_FORMAT
 
 # Configure logging
 logging.basicConfig(
@@ -43,75 +47,112 @@ def detect_date_column(df: pd.DataFrame) -> str:
     return date_columns[0]
 
 
-def standardize_date_format(df: pd.DataFrame, date_column: str) -> pd.DataFrame:
+@dataclass
+class CleaningReport:
     """
-    Standardizes the date column to a consistent datetime format.
+    Structured result of a cleaning pass.
 
-    Args:
-        df (pd.DataFrame): The DataFrame containing the data.
-        date_column (str): The name of the column to standardize.
+    Attributes:
+        date_column (str): The detected date column.
+        total_rows (int): Number of rows inspected.
+        invalid_date_count (int): Number of rows with invalid or unparseable dates.
+        invalid_date_positions (List[int]): Positional indices of those rows.
+    """
 
-    Returns:
-        pd.DataFrame: The DataFrame with the standardized date column.
+    date_column: str
+    total_rows: int
+    invalid_date_count: int = 0
+    invalid_date_positions: List[int] = field(default_factory=list)
 
-    Raises:
-        ValueError: If invalid or unparseable dates are found.
+
+class DataCleaningError(ValueError):
     """
-    df[date_column] = pd.to_datetime(df[date_column], errors="coerce")
-    if df[date_column].isna().any():
-        raise ValueError(f"Invalid or unparseable dates in column '{date_column}'.")
-    logging.info("Dates standardized to datetime format in column '%s'", date_column)
-    return df
+    Raised when cleaning finds invalid rows; carries the cleaning report.
+    """
+
+    def __init__(self, message: str, report: CleaningReport) -> None:
+        super().__init__(message)
+        self.report = report
 
 
-def ensure_datetime_format(df: pd.DataFrame, date_column: str) -> pd.DataFrame:
+def parse_date_column(
+    df: pd.DataFrame, date_column: str, date_format: str = DATE_FORMAT
+) -> Tuple[pd.DataFrame, CleaningReport]:
     """
-    Ensures the specified column is in datetime format.
+    Parses and validates the date column in a single pass.
+
+    Columns that were already parsed at read time are only checked for missing
+    values; otherwise the column is parsed once with a fixed format.
 
     Args:
         df (pd.DataFrame): The DataFrame containing the data.
-        date_column (str): The name of the column to validate and ensure is in datetime format.
+        date_column (str): The name of the date column.
+        date_format (str): The expected date format.
 
     Returns:
-        pd.DataFrame: The DataFrame with the specified column converted to datetime format.
+        Tuple[pd.DataFrame, CleaningReport]: The DataFrame with a datetime date column,
+        and the cleaning report.
 
     Raises:
-        ValueError: If the column contains invalid or unparseable dates.
+        DataCleaningError: If the column contains invalid or unparseable dates.
     """
-    # Convert column to datetime with coercion for invalid entries
-    df[date_column] = pd.to_datetime(df[date_column], errors="coerce")
-
-    # Check for invalid or missing dates
-    if df[date_column].isna().any():
-        invalid_count = df[date_column].isna().sum()
+    dates = df[date_column]
+    if not is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format=date_format, errors="coerce")
+
+    invalid_positions = np.flatnonzero(dates.isna().to_numpy())
+    report = CleaningReport(
+        date_column=date_column,
+        total_rows=len(df),
+        invalid_date_count=len(invalid_positions),
+        invalid_date_positions=invalid_positions.tolist(),
+    )
+
+    if report.invalid_date_count:
         logging.error(
-            "Column '%s' contains %d invalid or unparseable date entries.",
+            "Column '%s' contains %d invalid or unparseable date entries at positions %s.",
             date_column,
-            invalid_count,
+            report.invalid_date_count,
+            report.invalid_date_positions[:10],
         )
-        raise ValueError(
-            f"Column '{date_column}' contains {invalid_count} invalid or unparseable dates."
+        raise DataCleaningError(
+            f"Column '{date_column}' contains {report.invalid_date_count} invalid or unparseable dates.",
+            report,
         )
 
+    if dates is not df[date_column]:
+        df[date_column] = dates
     logging.info("Date column '%s' confirmed as datetime format.", date_column)
-    return df
+    return df, report
 
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+def clean_data_with_report(df: pd.DataFrame) -> Tuple[pd.DataFrame, CleaningReport]:
     """
-    Performs the full data cleaning process on the input DataFrame.
+    Performs the full data cleaning process and returns a structured report.
 
     Args:
         df (pd.DataFrame): The DataFrame to clean.
 
     Returns:
-        pd.DataFrame: The cleaned DataFrame with a standardized date column.
+        Tuple[pd.DataFrame, CleaningReport]: The cleaned DataFrame and its cleaning report.
     """
     # Validate the DataFrame
     validate_dataframe(df)
 
-    # Perform data cleaning steps
+    # Detect, parse and validate the date column in one pass
     date_column = detect_date_column(df)
-    df = standardize_date_format(df, date_column)
-    df = ensure_datetime_format(df, date_column)
+    return parse_date_column(df, date_column)
+
+
+def clean_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Performs the full data cleaning process on the input DataFrame.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to clean.
+
+    Returns:
+        pd.DataFrame: The cleaned DataFrame with a standardized date column.
+    """
+    df, _ = clean_data_with_report(df)
     return df
@@ -1,16 +1,100 @@
 # apps/insights/services/csv/data_filter.py
 import logging
+from typing import Callable, Iterable, Optional
+import numpy as np
 import pandas as pd
 
 
-def filter_data(df, start_date: pd.Timestamp, traffic_source: str) -> pd.DataFrame:
+def sort_for_lookup(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stores `source` as a categorical and stably sorts the rows by (source, date),
+    so that `filter_data` can locate a week with binary search.
+
+    Row labels are kept, so filtered frames are unchanged apart from the
+    categorical `source` dtype.
+
+    Args:
+        df (pd.DataFrame): Cleaned DataFrame with a datetime `date` column.
+
+    Returns:
+        pd.DataFrame: The sorted DataFrame.
+    """
+    df = df.astype({"source": "category"})
+    df["source"] = df["source"].cat.as_ordered()
+    df = df.sort_values(["source", "date"], kind="stable")
+    logging.info("Sorted %d rows by source and date for lookups.", len(df))
+    return df
+
+
+def is_sorted_for_lookup(df: pd.DataFrame) -> bool:
+    """
+    Returns whether a frame is currently sorted by (source, date) with a
+    categorical `source`, as `sort_for_lookup` leaves it.
+
+    The check is a vectorized pass over the two key columns, so it is run
+    once when a frame is prepared and its result recorded by the caller,
+    rather than on every `filter_data` call.
+    """
+    if not isinstance(
+        df["source"].dtype, pd.CategoricalDtype
+    ) or not pd.api.types.is_datetime64_dtype(df["date"]):
+        return False
+    dates = df["date"].to_numpy()
+    if np.isnat(dates).any():
+        return False
+    code_steps = np.diff(df["source"].cat.codes.to_numpy())
+    date_steps = np.diff(dates.view("i8"))
+    return bool((code_steps >= 0).all() and ((code_steps > 0) | (date_steps >= 0)).all())
+
+
+def _slice_sorted(
+    df: pd.DataFrame,
+    start_date: pd.Timestamp,
+    end_date: pd.Timestamp,
+    traffic_source: str,
+) -> tuple[pd.DataFrame, bool]:
+    """
+    Locates the rows of one source within a date range in a frame prepared by
+    `sort_for_lookup`, using binary search instead of full-column masks.
+
+    Returns:
+        tuple[pd.DataFrame, bool]: The matching rows, and whether the source exists.
+    """
+    categories = df["source"].cat.categories
+    if traffic_source not in categories:
+        return df.iloc[0:0], False
+
+    codes = df["source"].cat.codes.to_numpy()
+    code = categories.get_loc(traffic_source)
+    lo = codes.searchsorted(code, side="left")
+    hi = codes.searchsorted(code, side="right")
+    if lo == hi:
+        return df.iloc[0:0], False
+
+    dates = df["date"].to_numpy()[lo:hi]
+    start = lo + dates.searchsorted(start_date.to_datetime64(), side="left")
+    end = lo + dates.searchsorted(end_date.to_datetime64(), side="right")
+    return df.iloc[start:end].copy(), True
+
+
+def filter_data(
+    df,
+    start_date: pd.Timestamp,
+    traffic_source: str,
+    sorted_for_lookup: bool = False,
+) -> pd.DataFrame:
     """
     Filters the data for a specified traffic source within a 7-day period.
 
+    Frames known to be sorted by `sort_for_lookup` are sliced with binary
+    search; other frames are filtered with boolean masks.
+
     Args:
         df (pd.DataFrame): DataFrame containing the data to filter.
         start_date (pd.Timestamp): Start date for the dataset (YYYY-MM-DD).
         traffic_source (str): Traffic source to filter (e.g., "organic").
+        sorted_for_lookup (bool): Whether `df` was verified with
+            `is_sorted_for_lookup` since it was last modified.
 
     Returns:
         pd.DataFrame: Filtered DataFrame for the specified traffic source in the 7-day period.
@@ -22,15 +106,23 @@ def filter_data(df, start_date: pd.Timestamp, traffic_source: str) -> pd.DataFra
     # Convert start_date to datetime
     end_date = start_date + pd.Timedelta(days=6)
 
-    # Filter for the specified traffic source
-    filtered_df = df[df["source"] == traffic_source]
-    if filtered_df.empty:
-        raise ValueError(f"No data found for traffic source '{traffic_source}'.")
+    if sorted_for_lookup:
+        filtered_df, source_found = _slice_sorted(
+            df, start_date, end_date, traffic_source
+        )
+        if not source_found:
+            raise ValueError(f"No data found for traffic source '{traffic_source}'.")
+    else:
+        # Filter for the specified traffic source
+        filtered_df = df[df["source"] == traffic_source]
+        if filtered_df.empty:
+            raise ValueError(f"No data found for traffic source '{traffic_source}'.")
+
+        # Apply date range filter
+        filtered_df = filtered_df[
+            (filtered_df["date"] >= start_date) & (filtered_df["date"] <= end_date)
+        ]
 
-    # Apply date range filter
-    filtered_df = filtered_df[
-        (filtered_df["date"] >= start_date) & (filtered_df["date"] <= end_date)
-    ]
     if filtered_df.empty:
         raise ValueError(
             f"No data found in the 7-day period starting from {start_date}."
@@ -39,3 +131,95 @@ def filter_data(df, start_date: pd.Timestamp, traffic_source: str) -> pd.DataFra
     # Log filtered data
     logging.info("Filtered Data (Rows: %s):\n%s", len(filtered_df), filtered_df)
     return filtered_df
+
+
+def split_week_by_source(df, start_date: pd.Timestamp) -> dict[str, pd.DataFrame]:
+    """
+    Filters the data for a 7-day period and splits it by traffic source with a
+    single groupby, instead of filtering the full data once per source.
+
+    Each source's rows are in the same order as `filter_data` returns them.
+
+    Args:
+        df (pd.DataFrame): DataFrame containing the data to filter.
+        start_date (pd.Timestamp): Start date for the dataset (YYYY-MM-DD).
+
+    Returns:
+        dict[str, pd.DataFrame]: Filtered DataFrame of each traffic source with
+        data in the period, in source order.
+    """
+    logging.info("Splitting all traffic sources starting from %s...", start_date)
+
+    end_date = start_date + pd.Timedelta(days=6)
+    week_df = df[(df["date"] >= start_date) & (df["date"] <= end_date)]
+    if week_df.empty:
+        raise ValueError(
+            f"No data found in the 7-day period starting from {start_date}."
+        )
+
+    sources = {
+        str(source): source_df
+        for source, source_df in week_df.groupby("source", observed=True, sort=True)
+    }
+    logging.info(
+        "Split %d rows into %d traffic sources: %s",
+        len(week_df),
+        len(sources),
+        ", ".join(sources),
+    )
+    return sources
+
+
+def filter_chunks(
+    chunks: Iterable[pd.DataFrame],
+    start_date: pd.Timestamp,
+    traffic_source: str,
+    clean: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    """
+    Filters a stream of raw chunks for a traffic source within a 7-day period,
+    keeping only the matching rows of each chunk.
+
+    The traffic source is matched first, so only those rows are passed to `clean`
+    (e.g. to parse dates) before the date range is applied.
+
+    Args:
+        chunks (Iterable[pd.DataFrame]): Raw chunks of the dataset.
+        start_date (pd.Timestamp): Start date for the dataset (YYYY-MM-DD).
+        traffic_source (str): Traffic source to filter (e.g., "organic").
+        clean (Callable): Optional cleaning step applied to each chunk's matching rows.
+
+    Returns:
+        pd.DataFrame: Filtered DataFrame, equal to what `filter_data` returns for the full data.
+    """
+    logging.info(
+        "Streaming '%s' traffic starting from %s...", traffic_source, start_date
+    )
+
+    end_date = start_date + pd.Timedelta(days=6)
+    source_found = False
+    matches = []
+
+    for chunk in chunks:
+        chunk = chunk[chunk["source"] == traffic_source]
+        if chunk.empty:
+            continue
+        source_found = True
+
+        if clean is not None:
+            chunk = clean(chunk.copy())
+
+        chunk = chunk[(chunk["date"] >= start_date) & (chunk["date"] <= end_date)]
+        if not chunk.empty:
+            matches.append(chunk)
+
+    if not source_found:
+        raise ValueError(f"No data found for traffic source '{traffic_source}'.")
+    if not matches:
+        raise ValueError(
+            f"No data found in the 7-day period starting from {start_date}."
+        )
+
+    filtered_df = pd.concat(matches)
+    logging.info("Filtered Data (Rows: %s):\n%s", len(filtered_df), filtered_df)
+    return filtered_df
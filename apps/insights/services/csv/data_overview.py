@@ -1,44 +1,268 @@
-import json
-import numpy as np
 import pandas as pd
 
-OUTPUT_FILE = "overview_2024-01-15.json"
+# Statistics of `pd.DataFrame.describe`, in output order
+OVERVIEW_STATISTICS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
 
+# Field names the statistics are stored under in the StatisticalOverview model
+OVERVIEW_FIELDS = {
+    "count": "count",
+    "mean": "mean",
+    "std": "std",
+    "min": "min",
+    "25%": "percentile_25",
+    "50%": "median",
+    "75%": "percentile_75",
+    "max": "max",
+}
 
-def generate_overview(df: pd.DataFrame) -> str:
+# Short aliases of the dataset columns and statistics in compact overviews
+COLUMN_ALIASES = {
+    "sessions": "ses",
+    "users": "usr",
+    "new_users": "new",
+    "pageviews": "pv",
+    "pages_per_session": "pps",
+    "avg_session_duration": "dur",
+    "bounce_rate": "bnc",
+    "conversion_rate": "cvr",
+    "transactions": "txn",
+    "revenue": "rev",
+}
+STATISTIC_ALIASES = {
+    "count": "n",
+    "mean": "mean",
+    "std": "sd",
+    "min": "min",
+    "25%": "p25",
+    "50%": "p50",
+    "75%": "p75",
+    "max": "max",
+}
+
+# Key metrics of a weekly summary, in display order, and the column each one
+# is the mean of
+KEY_METRIC_COLUMNS = {
+    "Average Sessions": "sessions",
+    "Average Users": "users",
+    "Average New Users": "new_users",
+    "Average Pageviews": "pageviews",
+    "Pages per Session": "pages_per_session",
+    "Average Session Duration": "avg_session_duration",
+    "Bounce Rate": "bounce_rate",
+    "Conversion Rate": "conversion_rate",
+    "Average Transactions": "transactions",
+    "Average Revenue": "revenue",
+}
+
+# Significant digits of float32, the storage type of the fractional columns;
+# key metrics are rounded to it to drop conversion noise such as 4.0899999
+KEY_METRIC_DIGITS = 7
+
+# Significant digits kept in compact overviews
+SIGNIFICANT_DIGITS = 4
+
+# Grouping keys of the weekly overview table
+WEEKLY_OVERVIEW_KEYS = ["iso_year", "iso_week", "source"]
+
+
+def describe_overview(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Generates a statistical overview for the given DataFrame and optionally saves it as a JSON file.
+    Computes the structured statistical overview of the numeric columns.
 
     Args:
         df (DataFrame): The DataFrame to generate an overview for.
 
     Returns:
-        str: Statistical overview as a string.
+        DataFrame: `describe` statistics as rows and dataset columns as columns.
     """
     # Drop date field before generating the statistical overview
     if "date" in df.columns:
         df = df.drop(columns=["date"])
 
-    # Generate the statistical overview as a string
-    statistical_overview = df.describe().to_string()
-    print(statistical_overview)
-
-    # TEMPORARY: Save structured overview to JSON
-    if OUTPUT_FILE:
-        # Convert to dictionary and handle NaN values
-        overview_dict = df.describe().to_dict()
-        for col, metrics in overview_dict.items():
-            for key, value in metrics.items():
-                if isinstance(value, (pd.Timestamp, np.datetime64)):
-                    overview_dict[col][
-                        key
-                    ] = value.isoformat()  # Convert Timestamps to ISO
-                elif pd.isna(value):  # Handle NaN
-                    overview_dict[col][key] = None
-
-        # Save as JSON
-        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-            json.dump(overview_dict, f, indent=4, ensure_ascii=False)
-        print(f"Overview saved to {OUTPUT_FILE}")
-
-    return statistical_overview
+    # Compute statistics in float64 regardless of the compact storage dtypes
+    return df.select_dtypes(include="number").astype("float64").describe()
+
+
+def generate_overview(df: pd.DataFrame) -> str:
+    """
+    Generates a statistical overview for the given DataFrame.
+
+    Args:
+        df (DataFrame): The DataFrame to generate an overview for.
+
+    Returns:
+        str: Statistical overview as a string.
+    """
+    return describe_overview(df).to_string()
+
+
+def key_metric_values(overview: pd.DataFrame) -> dict[str, float]:
+    """
+    Reads the key metrics of a summary from the mean row of an overview.
+
+    Args:
+        overview (DataFrame): Overview produced by `describe_overview`.
+
+    Returns:
+        dict[str, float]: Value of each key metric in `KEY_METRIC_COLUMNS`
+        order, skipping metrics whose column is missing.
+
+    Raises:
+        ValueError: If a key metric's mean is missing.
+    """
+    values = {}
+    for name, column in KEY_METRIC_COLUMNS.items():
+        if column not in overview.columns:
+            continue
+        value = overview.loc["mean", column]
+        if pd.isna(value):
+            raise ValueError(f"No mean available for key metric '{name}'.")
+        values[name] = float(f"{value:.{KEY_METRIC_DIGITS}g}")
+    return values
+
+
+def format_significant(value: float, digits: int = SIGNIFICANT_DIGITS) -> str:
+    """
+    Formats a number rounded to significant digits, without exponent or
+    trailing zeros for ordinary magnitudes. Missing values become "".
+    """
+    if pd.isna(value):
+        return ""
+    rounded = float(f"{value:.{digits}g}")
+    return f"{rounded:.0f}" if rounded.is_integer() else repr(rounded)
+
+
+def compact_overview(overview: pd.DataFrame, digits: int = SIGNIFICANT_DIGITS) -> str:
+    """
+    Encodes a structured overview as dense CSV for LLM prompts.
+
+    Each dataset column becomes one row under its alias from `COLUMN_ALIASES`,
+    with the statistics abbreviated as in `STATISTIC_ALIASES` and rounded to
+    `digits` significant digits. This takes far fewer tokens than the padded
+    `to_string` table while keeping the values an analyst would quote.
+
+    Args:
+        overview (DataFrame): Overview produced by `describe_overview`.
+        digits (int): Significant digits to keep.
+
+    Returns:
+        str: The overview as CSV with a header row.
+    """
+    header = ",".join(
+        ["col"] + [STATISTIC_ALIASES.get(label, label) for label in overview.index]
+    )
+    rows = [
+        ",".join(
+            [COLUMN_ALIASES.get(column, column)]
+            + [format_significant(value, digits) for value in stats]
+        )
+        for column, stats in overview.items()
+    ]
+    return "\n".join([header] + rows)
+
+
+def overview_legend() -> str:
+    """
+    Returns the legend of the aliases used by `compact_overview`.
+    """
+    aliases = {**COLUMN_ALIASES, **STATISTIC_ALIASES}
+    return ", ".join(
+        f"{alias}={name}" for name, alias in aliases.items() if alias != name
+    )
+
+
+def overview_to_records(overview: pd.DataFrame) -> list[dict]:
+    """
+    Converts a structured overview into one record per column, keyed by the
+    StatisticalOverview field names. Missing statistics become None.
+    """
+    records = []
+    for column_name, stats in overview.items():
+        record = {"column_name": column_name}
+        for label, field_name in OVERVIEW_FIELDS.items():
+            value = stats[label]
+            record[field_name] = None if pd.isna(value) else float(value)
+        record["count"] = int(record["count"] or 0)
+        records.append(record)
+    return records
+
+
+def overview_from_records(records: list[dict]) -> pd.DataFrame:
+    """
+    Rebuilds the structured overview from records produced by
+    `overview_to_records`, so that its string form matches `generate_overview`.
+    """
+    return pd.DataFrame(
+        {
+            record["column_name"]: [
+                record[field_name] for field_name in OVERVIEW_FIELDS.values()
+            ]
+            for record in records
+        },
+        index=OVERVIEW_STATISTICS,
+        dtype="float64",
+    )
+
+
+def iso_week_start(iso_year: pd.Series, iso_week: pd.Series) -> pd.Series:
+    """
+    Returns the Monday each (ISO year, ISO week) pair starts on.
+    """
+    return pd.to_datetime(
+        iso_year.astype(str) + "-" + iso_week.astype(str) + "-1", format="%G-%V-%u"
+    )
+
+
+def generate_weekly_overviews(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Generates the statistical overview of every (ISO week, source) pair in one
+    grouped pass over a cleaned DataFrame.
+
+    Each statistic is a single vectorized group-by aggregation, so a year of
+    weekly overviews costs about as much as one. For a week starting on a
+    Monday, the values equal `generate_overview` on that week and source.
+
+    Args:
+        df (DataFrame): Cleaned DataFrame with a datetime `date` and a `source` column.
+
+    Returns:
+        DataFrame: One row per (iso_year, iso_week, source, metric), with the
+        `week_start` date and the `describe` statistics as columns.
+    """
+    iso = df["date"].dt.isocalendar()
+    keys = [
+        iso["year"].astype("int64").rename("iso_year"),
+        iso["week"].astype("int64").rename("iso_week"),
+        df["source"].astype(str).rename("source"),
+    ]
+
+    # Compute statistics in float64, as `generate_overview` does
+    numeric = df.drop(columns=["date"]).select_dtypes(include="number")
+    grouped = numeric.astype("float64").groupby(keys, sort=True)
+
+    stats = pd.concat(
+        {
+            "count": grouped.count().astype("float64"),
+            "mean": grouped.mean(),
+            "std": grouped.std(),
+            "min": grouped.min(),
+            "25%": grouped.quantile(0.25),
+            "50%": grouped.quantile(0.5),
+            "75%": grouped.quantile(0.75),
+            "max": grouped.max(),
+        },
+        axis=1,
+    )
+
+    # Move the metric names from the columns into a row level
+    overviews = (
+        stats.stack(level=1, future_stack=True)
+        .rename_axis([*WEEKLY_OVERVIEW_KEYS, "metric"])
+        .reset_index()
+    )
+    overviews.insert(
+        2, "week_start", iso_week_start(overviews["iso_year"], overviews["iso_week"])
+    )
+    return overviews[
+        [*WEEKLY_OVERVIEW_KEYS[:2], "week_start", "source", "metric", *OVERVIEW_STATISTICS]
+    ]
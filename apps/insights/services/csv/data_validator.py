@@ -6,21 +6,44 @@ logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
-REQUIRED_COLUMNS = {
-    "date",
-    "source",
-    "sessions",
-    "users",
-    "new_users",
-    "pageviews",
-    "pages_per_session",
-    "avg_session_duration",
-    "bounce_rate",
-    "conversion_rate",
-    "transactions",
-    "revenue",
+# Declared dtype of every required column, applied when the CSV is parsed
+COLUMN_SCHEMA = {
+    "date": "datetime64[ns]",
+    "source": "category",
+    "sessions": "int32",
+    "users": "int32",
+    "new_users": "int32",
+    "pageviews": "int32",
+    "pages_per_session": "float32",
+    "avg_session_duration": "float32",
+    "bounce_rate": "float32",
+    "conversion_rate": "float32",
+    "transactions": "int32",
+    "revenue": "float64",  # Monetary totals keep full precision
 }
 
+REQUIRED_COLUMNS = set(COLUMN_SCHEMA)
+
+# Format of the date column in GA4 exports
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def schema_read_options() -> dict:
+    """
+    Returns the `pd.read_csv` options that apply `COLUMN_SCHEMA` at parse time.
+
+    Values that cannot be parsed as their declared dtype make the read fail.
+    """
+    return {
+        "dtype": {
+            column: dtype
+            for column, dtype in COLUMN_SCHEMA.items()
+            if not dtype.startswith("datetime")
+        },
+        "parse_dates": ["date"],
+        "date_format": DATE_FORMAT,
+    }
+
 
 def validate_columns(df: pd.DataFrame) -> None:
     """
@@ -32,3 +55,29 @@ def validate_columns(df: pd.DataFrame) -> None:
             f"CSV file is missing required columns: {', '.join(missing_columns)}"
         )
     logging.info("All required key columns are present.")
+
+
+def validate_dtypes(df: pd.DataFrame) -> None:
+    """
+    Checks that every required column has its declared dtype.
+
+    The date column is skipped: a CSV with unparseable dates keeps it as text,
+    and `parse_date_column` reports the positions of the invalid rows when the
+    data is cleaned.
+    """
+    mismatched = {
+        column: str(df[column].dtype)
+        for column, dtype in COLUMN_SCHEMA.items()
+        if column in df.columns
+        and not dtype.startswith("datetime")
+        and str(df[column].dtype) != dtype
+    }
+    if mismatched:
+        raise ValueError(
+            "CSV columns do not match the declared schema: "
+            + ", ".join(
+                f"{column} ({dtype}, expected {COLUMN_SCHEMA[column]})"
+                for column, dtype in sorted(mismatched.items())
+            )
+        )
+    logging.info("All required columns match the declared schema.")
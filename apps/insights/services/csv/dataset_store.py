@@ -0,0 +1,130 @@
+# apps/insights/services/csv/dataset_store.py
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+import pandas as pd
+from apps.insights.services.utils.data_utils import validate_dataframe
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Root of the partitioned dataset; unset means CSVProcessor reads the CSV file
+DATASET_PATH: Optional[str] = os.environ.get("INSIGHTS_DATASET_PATH") or None
+
+# Each partition directory holds a single Parquet file
+PARTITION_FILE = "part-0.parquet"
+
+
+def partition_dir(root: Path, iso_year: int, iso_week: int, source: str) -> Path:
+    """
+    Returns the Hive-style directory of a (ISO year, ISO week, source) partition.
+    """
+    return root / f"year={iso_year}" / f"week={iso_week:02d}" / f"source={source}"
+
+
+def ingest_dataset(df: pd.DataFrame, root: str) -> int:
+    """
+    Writes a cleaned DataFrame into a year/week/source partitioned Parquet dataset.
+
+    Partitions present in `df` are overwritten; other partitions are left alone,
+    so re-ingesting an export that only gained rows is idempotent. Each file keeps
+    the full schema and the original row labels.
+
+    Args:
+        df (pd.DataFrame): Cleaned DataFrame with a datetime `date` column.
+        root (str): Root directory of the dataset.
+
+    Returns:
+        int: Number of partitions written.
+    """
+    validate_dataframe(df)
+    root_path = Path(root)
+    iso = df["date"].dt.isocalendar()
+
+    written = 0
+    for (iso_year, iso_week, source), partition in df.groupby(
+        [iso["year"], iso["week"], df["source"]], observed=True, sort=True
+    ):
+        path = partition_dir(root_path, int(iso_year), int(iso_week), str(source))
+        path.mkdir(parents=True, exist_ok=True)
+        tmp_path = path / f"{PARTITION_FILE}.tmp"
+        partition.to_parquet(tmp_path)
+        os.replace(tmp_path, path / PARTITION_FILE)
+        written += 1
+
+    logging.info("Ingested %d rows into %d partitions at %s", len(df), written, root)
+    return written
+
+
+def partition_paths(
+    root: str, start_date: pd.Timestamp, traffic_source: str
+) -> List[Path]:
+    """
+    Returns the existing partition files covering a 7-day period for one source.
+
+    A 7-day period spans at most two ISO weeks, so at most two files are returned
+    regardless of how much history the dataset holds.
+
+    Args:
+        root (str): Root directory of the dataset.
+        start_date (pd.Timestamp): Start date of the period.
+        traffic_source (str): Traffic source to read (e.g., "organic").
+
+    Returns:
+        List[Path]: Partition files in chronological order.
+    """
+    paths = [
+        partition_dir(Path(root), iso_year, iso_week, traffic_source) / PARTITION_FILE
+        for iso_year, iso_week in _period_weeks(start_date)
+    ]
+    return [path for path in paths if path.exists()]
+
+
+def week_partitions(root: str, start_date: pd.Timestamp) -> List[Path]:
+    """
+    Returns the partition files of every traffic source covering a 7-day period.
+
+    Args:
+        root (str): Root directory of the dataset.
+        start_date (pd.Timestamp): Start date of the period.
+
+    Returns:
+        List[Path]: Partition files in (week, source) order.
+    """
+    return [
+        path
+        for iso_year, iso_week in _period_weeks(start_date)
+        for path in sorted(
+            partition_dir(Path(root), iso_year, iso_week, "*").parent.glob(
+                f"source=*/{PARTITION_FILE}"
+            )
+        )
+    ]
+
+
+def _period_weeks(start_date: pd.Timestamp) -> List[tuple[int, int]]:
+    """
+    Returns the (ISO year, ISO week) pairs a 7-day period overlaps.
+    """
+    return sorted(
+        {
+            tuple(day.isocalendar())[:2]
+            for day in (start_date, start_date + pd.Timedelta(days=6))
+        }
+    )
+
+
+def dataset_partitions(root: str) -> List[Path]:
+    """
+    Returns every partition file of a dataset in (year, week, source) order.
+
+    Args:
+        root (str): Root directory of the dataset.
+
+    Returns:
+        List[Path]: All partition files.
+    """
+    return sorted(Path(root).glob(f"year=*/week=*/source=*/{PARTITION_FILE}"))
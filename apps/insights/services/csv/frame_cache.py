@@ -0,0 +1,116 @@
+# apps/insights/services/csv/frame_cache.py
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Memory budget for cleaned DataFrames kept by each worker process
+FRAME_CACHE_MAX_BYTES = int(
+    os.environ.get("INSIGHTS_FRAME_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
+
+class FrameCache:
+    """
+    A thread-safe, size-bounded LRU cache of validated and cleaned DataFrames.
+
+    Entries are keyed by a data fingerprint and evicted least-recently-used first
+    once their combined memory usage exceeds `max_bytes`. Cached DataFrames are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes (int): Memory budget for all cached DataFrames combined.
+        """
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[pd.DataFrame, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """
+        Returns the cached DataFrame for `key`, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, df: pd.DataFrame) -> None:
+        """
+        Stores a DataFrame, evicting least-recently-used entries to stay within budget.
+
+        DataFrames larger than the whole budget are not cached.
+        """
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            logging.info(
+                "DataFrame of %d bytes exceeds the frame cache budget of %d bytes.",
+                size,
+                self.max_bytes,
+            )
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            self._entries[key] = (df, size)
+            self.current_bytes += size
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Removes the entry for `key`, e.g. once it has been superseded.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry[1]
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters, e.g. for logging or monitoring.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "current_bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Process-wide cache shared by all CSVProcessor instances
+frame_cache = FrameCache(FRAME_CACHE_MAX_BYTES)
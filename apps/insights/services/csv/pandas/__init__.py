@@ -0,0 +1,3 @@
+from .engine import PandasEngine
+
+__all__ = ["PandasEngine"]
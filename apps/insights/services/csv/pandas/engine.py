@@ -0,0 +1,125 @@
+# apps/insights/services/csv/pandas/engine.py
+from pathlib import Path
+from typing import List, Tuple
+import pandas as pd
+from ..csv_reader import read_csv
+from ..data_cleaner import CleaningReport, clean_data_with_report
+from ..data_filter import (
+    filter_data,
+    is_sorted_for_lookup,
+    sort_for_lookup,
+    split_week_by_source,
+)
+from ..data_overview import (
+    describe_overview,
+    generate_overview,
+    generate_weekly_overviews,
+)
+from ..data_validator import schema_read_options, validate_columns, validate_dtypes
+
+
+class PandasEngine:
+    """
+    The default CSVProcessor engine, backed by eager Pandas DataFrames.
+    """
+
+    name = "pandas"
+    # Cleaned frames can be kept in the process-wide frame cache
+    cacheable = True
+
+    def load(
+        self, file_path: str, use_cache: bool = True, incremental: bool = True
+    ) -> pd.DataFrame:
+        """
+        Loads the CSV file into a Pandas DataFrame, applying the declared
+        column schema at parse time.
+        """
+        return read_csv(
+            file_path,
+            use_cache=use_cache,
+            incremental=incremental,
+            **schema_read_options(),
+        )
+
+    def load_partitions(self, paths: List[Path]) -> pd.DataFrame:
+        """
+        Reads cleaned rows from partitioned dataset files into a Pandas DataFrame.
+        """
+        return pd.concat([pd.read_parquet(path) for path in paths])
+
+    def validate(self, df: pd.DataFrame) -> None:
+        """
+        Validates that the DataFrame contains all required columns with their
+        declared dtypes.
+        """
+        validate_columns(df)
+        validate_dtypes(df)
+
+    def clean(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, CleaningReport]:
+        """
+        Cleans the DataFrame by standardizing and formatting columns, then sorts
+        it by (source, date) so that repeated `filter` calls use binary search.
+        """
+        df, report = clean_data_with_report(df)
+        return sort_for_lookup(df), report
+
+    def append(
+        self, df: pd.DataFrame, appended_df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, CleaningReport]:
+        """
+        Cleans newly appended rows and merges them into an already cleaned
+        DataFrame, giving the same result as cleaning the whole file again.
+
+        The appended rows are labelled after the existing rows, as a full load
+        would label them.
+        """
+        appended_df, report = clean_data_with_report(appended_df)
+        start = int(df.index.max()) + 1 if len(df) else 0
+        appended_df.index = pd.RangeIndex(start, start + len(appended_df))
+        return sort_for_lookup(pd.concat([df, appended_df])), report
+
+    def is_sorted_for_lookup(self, df: pd.DataFrame) -> bool:
+        """
+        Checks whether the DataFrame is sorted as `clean` leaves it, so that
+        `filter` can use binary search.
+        """
+        return is_sorted_for_lookup(df)
+
+    def filter(
+        self,
+        df: pd.DataFrame,
+        start_date: pd.Timestamp,
+        traffic_source: str,
+        sorted_for_lookup: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Filters the DataFrame for the specified traffic source and week, with
+        binary search if it is known to be `sorted_for_lookup`.
+        """
+        return filter_data(df, start_date, traffic_source, sorted_for_lookup)
+
+    def split_sources(
+        self, df: pd.DataFrame, start_date: pd.Timestamp
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Filters the DataFrame for the week and splits it by traffic source.
+        """
+        return split_week_by_source(df, start_date)
+
+    def describe_overview(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Computes the structured statistical overview of the DataFrame.
+        """
+        return describe_overview(df)
+
+    def generate_overview(self, df: pd.DataFrame) -> str:
+        """
+        Generates a statistical overview of the DataFrame.
+        """
+        return generate_overview(df)
+
+    def generate_weekly_overviews(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generates the statistical overview of every (ISO week, source) pair.
+        """
+        return generate_weekly_overviews(df)
@@ -0,0 +1,3 @@
+from .engine import PolarsEngine
+
+__all__ = ["PolarsEngine"]
@@ -0,0 +1,254 @@
+# apps/insights/services/csv/polars/engine.py
+import logging
+from pathlib import Path
+from typing import List, Tuple
+import pandas as pd
+import polars as pl
+import polars.selectors as cs
+from ..data_cleaner import detect_date_column
+from ..data_overview import OVERVIEW_STATISTICS, WEEKLY_OVERVIEW_KEYS, iso_week_start
+from ..data_validator import COLUMN_SCHEMA, DATE_FORMAT, REQUIRED_COLUMNS
+
+# Polars equivalents of the declared Pandas dtypes
+POLARS_DTYPES = {
+    "category": pl.Categorical,
+    "int32": pl.Int32,
+    "float32": pl.Float32,
+    "float64": pl.Float64,
+}
+
+# Row labels and quantiles of `pd.DataFrame.describe`, in output order
+DESCRIBE_PERCENTILES = {"25%": 0.25, "50%": 0.5, "75%": 0.75}
+
+
+class PolarsEngine:
+    """
+    A CSVProcessor engine backed by Polars lazy frames.
+
+    `load` and `clean` only build a query plan over `pl.scan_csv`. Filtering
+    collects that plan with the source and date predicates pushed down into the
+    multi-threaded CSV scan, and the overview is computed as a single lazy
+    aggregation whose output matches the Pandas engine exactly.
+    """
+
+    name = "polars"
+    # Lazy frames are cheap to rebuild, so they are not kept in the frame cache
+    cacheable = False
+
+    def load(
+        self, file_path: str, use_cache: bool = True, incremental: bool = True
+    ) -> pl.LazyFrame:
+        """
+        Builds a lazy scan over the CSV file. Scans are not cached, so
+        `use_cache` and `incremental` have no effect.
+        """
+        file_path_obj = Path(file_path)
+        if not file_path_obj.exists():
+            logging.error("CSV file not found at: %s", file_path_obj)
+            raise FileNotFoundError(f"CSV file not found at: {file_path_obj}")
+
+        logging.info("Scanning CSV file with Polars from: %s", file_path_obj)
+        return pl.scan_csv(
+            file_path_obj,
+            schema_overrides={
+                column: POLARS_DTYPES[dtype]
+                for column, dtype in COLUMN_SCHEMA.items()
+                if dtype in POLARS_DTYPES
+            },
+        )
+
+    def load_partitions(self, paths: List[Path]) -> pl.LazyFrame:
+        """
+        Builds a lazy scan over partitioned dataset files.
+        """
+        # Drop the Pandas row labels stored alongside the data
+        return pl.scan_parquet(paths).select(~cs.starts_with("__index_level_"))
+
+    def validate(self, lf: pl.LazyFrame) -> None:
+        """
+        Validates that the scanned CSV contains all required columns.
+        """
+        missing_columns = REQUIRED_COLUMNS - set(lf.collect_schema().names())
+        if missing_columns:
+            raise ValueError(
+                f"CSV file is missing required columns: {', '.join(missing_columns)}"
+            )
+        logging.info("All required key columns are present.")
+
+    def clean(self, lf: pl.LazyFrame) -> Tuple[pl.LazyFrame, None]:
+        """
+        Adds strict datetime parsing of the date column to the query plan.
+
+        Invalid dates surface as an error when the plan is collected, so no
+        cleaning report is produced.
+        """
+        date_column = detect_date_column(pl.DataFrame(schema=lf.collect_schema()))
+        cleaned_lf = lf.with_columns(
+            pl.col(date_column).str.to_datetime(
+                DATE_FORMAT, time_unit="ns", strict=True
+            )
+        )
+        return cleaned_lf, None
+
+    def is_sorted_for_lookup(self, lf: pl.LazyFrame) -> bool:
+        """
+        Lazy frames are always filtered by a scan, so their order is not checked.
+        """
+        return False
+
+    def filter(
+        self,
+        lf: pl.LazyFrame,
+        start_date: pd.Timestamp,
+        traffic_source: str,
+        sorted_for_lookup: bool = False,
+    ) -> pl.DataFrame:
+        """
+        Collects the rows for the specified traffic source and week;
+        `sorted_for_lookup` is ignored, as the filter is pushed into the scan.
+        """
+        logging.info(
+            "Filtering '%s' traffic starting from %s...", traffic_source, start_date
+        )
+        end_date = start_date + pd.Timedelta(days=6)
+        source_matches = pl.col("source") == traffic_source
+
+        try:
+            filtered_df = lf.filter(
+                source_matches
+                & pl.col("date").is_between(
+                    start_date.to_pydatetime(), end_date.to_pydatetime()
+                )
+            ).collect()
+
+            if filtered_df.is_empty():
+                # Only the error path pays for a second scan to pick the message
+                if lf.filter(source_matches).select(pl.len()).collect().item() == 0:
+                    raise ValueError(
+                        f"No data found for traffic source '{traffic_source}'."
+                    )
+                raise ValueError(
+                    f"No data found in the 7-day period starting from {start_date}."
+                )
+        except pl.exceptions.PolarsError as e:
+            logging.error("Error processing CSV data with Polars: %s", e)
+            raise ValueError(f"Error processing CSV data with Polars: {e}") from e
+
+        logging.info("Filtered Data (Rows: %s):\n%s", len(filtered_df), filtered_df)
+        return filtered_df
+
+    def split_sources(
+        self, lf: pl.LazyFrame, start_date: pd.Timestamp
+    ) -> dict[str, pl.DataFrame]:
+        """
+        Collects the week's rows once and partitions them by traffic source.
+        """
+        end_date = start_date + pd.Timedelta(days=6)
+        try:
+            week_df = (
+                lf.lazy()
+                .filter(
+                    pl.col("date").is_between(
+                        start_date.to_pydatetime(), end_date.to_pydatetime()
+                    )
+                )
+                .collect()
+            )
+        except pl.exceptions.PolarsError as e:
+            logging.error("Error processing CSV data with Polars: %s", e)
+            raise ValueError(f"Error processing CSV data with Polars: {e}") from e
+
+        if week_df.is_empty():
+            raise ValueError(
+                f"No data found in the 7-day period starting from {start_date}."
+            )
+        partitions = week_df.partition_by("source", as_dict=True)
+        return {
+            str(source): partitions[(source,)]
+            for (source,) in sorted(partitions, key=lambda key: str(key[0]))
+        }
+
+    def describe_overview(self, df: pl.DataFrame | pl.LazyFrame) -> pd.DataFrame:
+        """
+        Computes the same structured overview as `pd.DataFrame.describe`.
+        """
+        numeric = df.lazy().select(cs.numeric()).collect_schema().names()
+        stats = (
+            df.lazy()
+            # Compute in float64, as the Pandas overview does for compact dtypes
+            .with_columns(pl.col(numeric).cast(pl.Float64))
+            .select(describe_exprs(numeric))
+            .collect()
+            .row(0, named=True)
+        )
+
+        return pd.DataFrame(
+            {c: [stats[f"{c}|{label}"] for label in OVERVIEW_STATISTICS] for c in numeric},
+            index=OVERVIEW_STATISTICS,
+            dtype="float64",
+        )
+
+    def generate_overview(self, df: pl.DataFrame | pl.LazyFrame) -> str:
+        """
+        Generates the same statistical overview string as the Pandas engine.
+        """
+        return self.describe_overview(df).to_string()
+
+    def generate_weekly_overviews(self, df: pl.DataFrame | pl.LazyFrame) -> pd.DataFrame:
+        """
+        Generates the same weekly overview table as the Pandas engine with a
+        single lazy group-by aggregation.
+        """
+        lf = df.lazy()
+        numeric = lf.select(cs.numeric()).collect_schema().names()
+        stats = (
+            lf.with_columns(pl.col(numeric).cast(pl.Float64))
+            .group_by(
+                pl.col("date").dt.iso_year().cast(pl.Int64).alias("iso_year"),
+                pl.col("date").dt.week().cast(pl.Int64).alias("iso_week"),
+                pl.col("source").cast(pl.String),
+            )
+            .agg(describe_exprs(numeric))
+            .collect()
+        )
+
+        # Move the metric names from the columns into a row level
+        overviews = (
+            pl.concat(
+                [
+                    stats.select(
+                        *WEEKLY_OVERVIEW_KEYS,
+                        pl.lit(position).alias("position"),
+                        pl.lit(c).alias("metric"),
+                        *[pl.col(f"{c}|{label}").alias(label) for label in OVERVIEW_STATISTICS],
+                    )
+                    for position, c in enumerate(numeric)
+                ]
+            )
+            .sort([*WEEKLY_OVERVIEW_KEYS, "position"])
+            .drop("position")
+            .to_pandas()
+        )
+        overviews.insert(
+            2, "week_start", iso_week_start(overviews["iso_year"], overviews["iso_week"])
+        )
+        return overviews
+
+
+def describe_exprs(numeric: List[str]) -> List[pl.Expr]:
+    """
+    Builds the aggregations of `pd.DataFrame.describe` for float64 columns,
+    named "<column>|<statistic>".
+    """
+    return (
+        [pl.col(c).count().cast(pl.Float64).alias(f"{c}|count") for c in numeric]
+        + [pl.col(c).mean().alias(f"{c}|mean") for c in numeric]
+        + [pl.col(c).std().alias(f"{c}|std") for c in numeric]
+        + [pl.col(c).min().alias(f"{c}|min") for c in numeric]
+        + [
+            pl.col(c).quantile(q, interpolation="linear").alias(f"{c}|{label}")
+            for label, q in DESCRIBE_PERCENTILES.items()
+            for c in numeric
+        ]
+        + [pl.col(c).max().alias(f"{c}|max") for c in numeric]
+    )
@@ -0,0 +1,268 @@
+# apps/insights/services/openai/batch.py
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Optional, Type
+from django.conf import settings
+from pydantic import BaseModel
+from .clients import get_openai_client
+
+logger = logging.getLogger(__name__)
+
+# Endpoint every batch request is sent to
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# The only completion window the Batch API accepts
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Batch statuses after which the batch no longer changes
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Defaults when OPENAI_BATCH_POLL_INTERVAL / OPENAI_BATCH_TIMEOUT are not set
+DEFAULT_POLL_INTERVAL = 60
+DEFAULT_BATCH_TIMEOUT = 24 * 60 * 60
+
+
+class BatchError(Exception):
+    """
+    Raised when a batch fails, expires or does not finish in time.
+    """
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    """
+    A single structured-output request of a batch.
+
+    Attributes:
+        custom_id (str): Identifier the result is returned under.
+        prompt (str): The user prompt.
+        response_model (Type[BaseModel]): Model the response is parsed into.
+    """
+
+    custom_id: str
+    prompt: str
+    response_model: Type[BaseModel]
+
+
+@dataclass(frozen=True)
+class BatchStatus:
+    """
+    The state of a submitted batch, as reported by the transport.
+    """
+
+    status: str
+    output_file_id: Optional[str] = None
+    error_file_id: Optional[str] = None
+
+
+class BatchTransport(ABC):
+    """
+    Moves batch files to and from a batch endpoint.
+
+    Subclasses implement the four calls of the OpenAI Batch API, so that
+    `run_batch` can be pointed at the OpenAI API or at a local fake.
+    """
+
+    @abstractmethod
+    def upload(self, content: bytes) -> str:
+        """Uploads a JSONL input file and returns its file ID."""
+
+    @abstractmethod
+    def create(self, input_file_id: str) -> str:
+        """Creates a batch from an uploaded file and returns the batch ID."""
+
+    @abstractmethod
+    def retrieve(self, batch_id: str) -> BatchStatus:
+        """Returns the current status of a batch."""
+
+    @abstractmethod
+    def download(self, file_id: str) -> bytes:
+        """Returns the contents of an output or error file."""
+
+
+class OpenAIBatchTransport(BatchTransport):
+    """
+    Transport using the OpenAI Files and Batches endpoints.
+
+    Args:
+        client: OpenAI client to use. Defaults to the shared client, whose
+            `base_url` can point at any server implementing the Batch API.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or get_openai_client()
+
+    def upload(self, content: bytes) -> str:
+        return self.client.files.create(
+            file=("batch_input.jsonl", content), purpose="batch"
+        ).id
+
+    def create(self, input_file_id: str) -> str:
+        return self.client.batches.create(
+            input_file_id=input_file_id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+        ).id
+
+    def retrieve(self, batch_id: str) -> BatchStatus:
+        batch = self.client.batches.retrieve(batch_id)
+        return BatchStatus(
+            status=batch.status,
+            output_file_id=batch.output_file_id,
+            error_file_id=batch.error_file_id,
+        )
+
+    def download(self, file_id: str) -> bytes:
+        return self.client.files.content(file_id).read()
+
+
+def response_format(response_model: Type[BaseModel]) -> dict:
+    """
+    Returns the JSON schema response format requesting `response_model`.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": response_model.__name__,
+            "schema": response_model.model_json_schema(),
+        },
+    }
+
+
+def build_batch_input(requests: list[BatchRequest], model: str) -> bytes:
+    """
+    Writes batch requests as a JSONL input file, one chat completion per line.
+
+    Args:
+        requests (list[BatchRequest]): Requests with unique custom IDs.
+        model (str): Name of the OpenAI model to use.
+
+    Returns:
+        bytes: The JSONL file contents.
+    """
+    custom_ids = [request.custom_id for request in requests]
+    if len(set(custom_ids)) != len(custom_ids):
+        raise ValueError("Batch request custom IDs must be unique.")
+
+    lines = [
+        json.dumps(
+            {
+                "custom_id": request.custom_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": {
+                    "model": model,
+                    "messages": [{"role": "user", "content": request.prompt}],
+                    "response_format": response_format(request.response_model),
+                },
+            }
+        )
+        for request in requests
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def parse_batch_output(
+    content: bytes, requests: list[BatchRequest]
+) -> dict[str, object]:
+    """
+    Parses a batch output or error file into the requests' response models.
+
+    Args:
+        content (bytes): JSONL contents of the file.
+        requests (list[BatchRequest]): The requests of the batch.
+
+    Returns:
+        dict[str, object]: The parsed model, or the exception explaining why
+        there is none, by custom ID. Lines of unknown requests are ignored.
+    """
+    response_models = {request.custom_id: request.response_model for request in requests}
+    results = {}
+    for line in content.decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        custom_id = record.get("custom_id")
+        if custom_id not in response_models:
+            logger.warning("Ignoring batch result for unknown request %s.", custom_id)
+            continue
+
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            results[custom_id] = BatchError(
+                f"Request {custom_id} failed: {record.get('error') or response.get('body')}"
+            )
+            continue
+        try:
+            message = response["body"]["choices"][0]["message"]["content"]
+            results[custom_id] = response_models[custom_id].model_validate_json(message)
+        except Exception as e:
+            results[custom_id] = e
+    return results
+
+
+def run_batch(
+    requests: list[BatchRequest],
+    model: str,
+    transport: Optional[BatchTransport] = None,
+    poll_interval: Optional[float] = None,
+    timeout: Optional[float] = None,
+) -> dict[str, object]:
+    """
+    Submits requests as one batch, waits for it to finish and parses the results.
+
+    Args:
+        requests (list[BatchRequest]): Requests with unique custom IDs.
+        model (str): Name of the OpenAI model to use.
+        transport (BatchTransport): Batch endpoint. Defaults to the OpenAI API.
+        poll_interval (float): Seconds between status checks. Defaults to
+            `OPENAI_BATCH_POLL_INTERVAL`.
+        timeout (float): Seconds to wait for the batch. Defaults to
+            `OPENAI_BATCH_TIMEOUT`.
+
+    Returns:
+        dict[str, object]: The parsed model, or the exception explaining why
+        there is none, for every request by custom ID.
+
+    Raises:
+        BatchError: If the batch fails, expires or does not finish in time.
+    """
+    if not requests:
+        return {}
+    transport = transport or OpenAIBatchTransport()
+    if poll_interval is None:
+        poll_interval = getattr(
+            settings, "OPENAI_BATCH_POLL_INTERVAL", DEFAULT_POLL_INTERVAL
+        )
+    if timeout is None:
+        timeout = getattr(settings, "OPENAI_BATCH_TIMEOUT", DEFAULT_BATCH_TIMEOUT)
+
+    input_file_id = transport.upload(build_batch_input(requests, model))
+    batch_id = transport.create(input_file_id)
+    logger.info("Submitted batch %s with %d requests.", batch_id, len(requests))
+
+    deadline = time.monotonic() + timeout
+    status = transport.retrieve(batch_id)
+    while status.status not in TERMINAL_STATUSES:
+        if time.monotonic() >= deadline:
+            raise BatchError(f"Batch {batch_id} did not finish within {timeout}s.")
+        time.sleep(poll_interval)
+        status = transport.retrieve(batch_id)
+
+    logger.info("Batch %s finished with status %s.", batch_id, status.status)
+    if status.status != "completed":
+        raise BatchError(f"Batch {batch_id} ended with status {status.status}.")
+
+    results = {}
+    for file_id in (status.error_file_id, status.output_file_id):
+        if file_id:
+            results.update(parse_batch_output(transport.download(file_id), requests))
+    for request in requests:
+        results.setdefault(
+            request.custom_id,
+            BatchError(f"Batch {batch_id} returned no result for {request.custom_id}."),
+        )
+    return results
@@ -0,0 +1,213 @@
+# apps/insights/services/openai/cache.py
+import asyncio
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+from typing import Any, Callable, Optional
+import redis
+from django.conf import settings
+from prometheus_client import Counter, Histogram
+from pydantic import BaseModel, ValidationError
+from .clients import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Prefix of all Redis keys written by `instructor_cache`
+CACHE_KEY_PREFIX = "instructor_cache"
+
+# Seconds a cached response is kept when OPENAI_CACHE_TTL is not set
+DEFAULT_CACHE_TTL = 3600
+
+# Exported through django-prometheus, by the Django Q workers on QCLUSTER_METRICS_PORT
+CACHE_REQUESTS = Counter(
+    "insights_llm_cache_requests_total",
+    "LLM response cache lookups by result (hit, miss or error).",
+    ["function", "model", "result"],
+)
+CACHE_LATENCY = Histogram(
+    "insights_llm_cache_latency_seconds",
+    "Time to serve a cached LLM call, including the API call on a miss.",
+    ["function", "model", "result"],
+)
+
+# Cleared during a cached call whose result must not be stored
+_cacheable: contextvars.ContextVar = contextvars.ContextVar(
+    "instructor_cacheable", default=True
+)
+
+
+def skip_cache() -> None:
+    """
+    Keeps the result of the current call out of the cache, e.g. when it was
+    answered by another model than the one its key was built for.
+    """
+    _cacheable.set(False)
+
+
+def get_cache_client() -> redis.Redis:
+    """
+    Returns the Redis client used for caching, from the shared connection pool.
+    """
+    return get_redis_client()
+
+
+def _normalize(value: Any) -> Any:
+    """
+    Converts values that JSON can not encode, such as Pydantic models.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def cache_key(
+    function_name: str, model: str, prompt_version: str, arguments: dict
+) -> str:
+    """
+    Builds a content-addressed cache key that is identical in every process.
+
+    Args:
+        function_name (str): Qualified name of the cached function.
+        model (str): Name of the OpenAI model the function calls.
+        prompt_version (str): Version of the prompt template the function uses.
+        arguments (dict): The function's bound arguments, by parameter name.
+
+    Returns:
+        str: The Redis key, "<prefix>:<function>:<sha256>".
+    """
+    payload = json.dumps(
+        {
+            "function": function_name,
+            "model": model,
+            "prompt_version": prompt_version,
+            "arguments": arguments,
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_normalize,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{function_name}:{digest}"
+
+
+def instructor_cache(
+    model: str, prompt_version: str, name: Optional[str] = None
+) -> Callable:
+    """
+    Caches a function that returns a Pydantic model in Redis.
+
+    The key is a SHA-256 over the model name, the prompt template version and
+    the function's arguments, normalized so that positional and keyword calls
+    share an entry. Entries expire after `OPENAI_CACHE_TTL` seconds. Results
+    of calls that called `skip_cache` are returned but not stored. Redis
+    failures are logged and the function is called directly. Coroutine
+    functions are supported; their Redis calls run in a worker thread.
+
+    Args:
+        model (str): Name of the OpenAI model the function calls.
+        prompt_version (str): Version of the prompt template; bump it when the
+            prompt or response model changes to stop serving old responses.
+        name (str): Name used in the key and metrics. Defaults to the function's
+            qualified name; functions making the same request, such as sync and
+            async variants, share entries by passing the same name.
+    """
+
+    def decorator(func):
+        return_type = inspect.signature(func).return_annotation
+        if not issubclass(return_type, BaseModel):
+            raise ValueError("Return type must be a Pydantic model.")
+
+        signature = inspect.signature(func)
+        function_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        def make_key(args, kwargs) -> str:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return cache_key(function_name, model, prompt_version, bound.arguments)
+
+        def lookup(key: str, start_time: float):
+            try:
+                cached = get_cache_client().get(key)
+            except redis.RedisError as e:
+                logger.warning("Cache lookup failed for %s: %s", function_name, e)
+                CACHE_REQUESTS.labels(function_name, model, "error").inc()
+                return None
+
+            if cached is None:
+                return None
+            try:
+                result = return_type.model_validate_json(cached)
+            except ValidationError as e:
+                logger.warning("Cache deserialization error: %s. Recomputing result.", e)
+                return None
+            CACHE_REQUESTS.labels(function_name, model, "hit").inc()
+            CACHE_LATENCY.labels(function_name, model, "hit").observe(
+                time.perf_counter() - start_time
+            )
+            return result
+
+        def store(
+            key: str, result: BaseModel, start_time: float, cacheable: bool
+        ) -> None:
+            CACHE_REQUESTS.labels(function_name, model, "miss").inc()
+            try:
+                if cacheable:
+                    get_cache_client().set(
+                        key,
+                        result.model_dump_json(),
+                        ex=getattr(settings, "OPENAI_CACHE_TTL", DEFAULT_CACHE_TTL),
+                    )
+            except redis.RedisError as e:
+                logger.warning("Cache write failed for %s: %s", function_name, e)
+            CACHE_LATENCY.labels(function_name, model, "miss").observe(
+                time.perf_counter() - start_time
+            )
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start_time = time.perf_counter()
+                key = make_key(args, kwargs)
+                result = await asyncio.to_thread(lookup, key, start_time)
+                if result is not None:
+                    return result
+
+                # Compute the result if not cached
+                token = _cacheable.set(True)
+                try:
+                    result = await func(*args, **kwargs)
+                    cacheable = _cacheable.get()
+                finally:
+                    _cacheable.reset(token)
+                await asyncio.to_thread(store, key, result, start_time, cacheable)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            key = make_key(args, kwargs)
+            result = lookup(key, start_time)
+            if result is not None:
+                return result
+
+            # Compute the result if not cached
+            token = _cacheable.set(True)
+            try:
+                result = func(*args, **kwargs)
+                cacheable = _cacheable.get()
+            finally:
+                _cacheable.reset(token)
+            store(key, result, start_time, cacheable)
+            return result
+
+        return wrapper
+
+    return decorator
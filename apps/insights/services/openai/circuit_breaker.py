@@ -0,0 +1,316 @@
+# apps/insights/services/openai/circuit_breaker.py
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import time
+from typing import Optional
+import openai
+import redis
+from django.conf import settings
+from prometheus_client import Counter
+from .cache import skip_cache
+from .clients import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Prefix of all Redis keys written by the circuit breaker
+CIRCUIT_KEY_PREFIX = "openai_circuit"
+
+# Defaults when the OPENAI_BREAKER_* settings are not set
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_FAILURE_WINDOW = 60
+DEFAULT_RESET_TIMEOUT = 30
+DEFAULT_SLOW_CALL_THRESHOLD = 20
+
+# Seconds a tripped breaker waits for a successful probe before closing anyway
+TRIPPED_TTL = 86400
+
+# Exported through django-prometheus, by the Django Q workers on QCLUSTER_METRICS_PORT
+CIRCUIT_CALLS = Counter(
+    "insights_llm_circuit_calls_total",
+    "LLM calls by circuit breaker route (primary, probe, fallback or rejected).",
+    ["model", "route"],
+)
+
+# Errors that indicate the API is unavailable, rather than a bad request
+OUTAGE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
+
+# Model the failing guarded call of the current context was routed to; kept
+# after the call raises, so that the retry strategy can read it
+_called_model: contextvars.ContextVar = contextvars.ContextVar(
+    "openai_called_model", default=None
+)
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised when the breaker of a model is open and no fallback model is set.
+    """
+
+
+def is_outage(exc: BaseException) -> bool:
+    """
+    Returns whether an exception, or one of its causes, is an API outage.
+    """
+    while exc is not None:
+        if isinstance(exc, OUTAGE_ERRORS):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for the calls to a model, shared through Redis by every
+    worker and pod.
+
+    The breaker is closed while the model is healthy. When
+    OPENAI_BREAKER_FAILURE_THRESHOLD calls fail with an outage error, or take
+    longer than OPENAI_BREAKER_SLOW_CALL_THRESHOLD seconds, within
+    OPENAI_BREAKER_FAILURE_WINDOW seconds, it opens: calls are sent to the
+    fallback model, or fail fast if none is set. After
+    OPENAI_BREAKER_RESET_TIMEOUT seconds it is half-open: a single call probes
+    the model and closes the breaker on success or opens it again on failure,
+    while the other calls keep using the fallback. Redis failures are logged
+    and the breaker is treated as closed.
+
+    Args:
+        model (str): Name of the OpenAI model the breaker protects.
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        prefix = f"{CIRCUIT_KEY_PREFIX}:{model}"
+        self.open_key = f"{prefix}:open"
+        self.tripped_key = f"{prefix}:tripped"
+        self.probe_key = f"{prefix}:probe"
+        self.failures_key = f"{prefix}:failures"
+
+    @property
+    def failure_threshold(self) -> int:
+        return getattr(
+            settings, "OPENAI_BREAKER_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD
+        )
+
+    @property
+    def failure_window(self) -> int:
+        return getattr(settings, "OPENAI_BREAKER_FAILURE_WINDOW", DEFAULT_FAILURE_WINDOW)
+
+    @property
+    def reset_timeout(self) -> int:
+        return getattr(settings, "OPENAI_BREAKER_RESET_TIMEOUT", DEFAULT_RESET_TIMEOUT)
+
+    @property
+    def slow_call_threshold(self) -> float:
+        return getattr(
+            settings, "OPENAI_BREAKER_SLOW_CALL_THRESHOLD", DEFAULT_SLOW_CALL_THRESHOLD
+        )
+
+    def state(self) -> str:
+        """
+        Returns "closed", "open" or "half_open".
+        """
+        try:
+            client = get_redis_client()
+            if client.exists(self.open_key):
+                return "open"
+            if client.exists(self.tripped_key):
+                return "half_open"
+        except redis.RedisError as e:
+            logger.warning("Circuit breaker unavailable, treating as closed: %s", e)
+        return "closed"
+
+    def allow_request(self) -> tuple[bool, bool]:
+        """
+        Decides whether a call may use the model.
+
+        Returns:
+            tuple[bool, bool]: Whether the call is allowed, and whether it is
+            the probe of a half-open breaker.
+        """
+        state = self.state()
+        if state == "closed":
+            return True, False
+        if state == "half_open":
+            try:
+                probe = get_redis_client().set(
+                    self.probe_key, 1, nx=True, ex=self.reset_timeout
+                )
+            except redis.RedisError as e:
+                logger.warning("Circuit breaker unavailable, treating as closed: %s", e)
+                return True, False
+            if probe:
+                logger.info("Probing %s after its circuit breaker opened.", self.model)
+                return True, True
+        return False, False
+
+    def record_success(self, elapsed: float, probe: bool = False) -> None:
+        """
+        Records a completed call; slow calls count as failures.
+        """
+        if elapsed > self.slow_call_threshold:
+            logger.warning("Slow call to %s took %.1fs.", self.model, elapsed)
+            self.record_failure(probe)
+            return
+        if probe:
+            try:
+                get_redis_client().delete(
+                    self.tripped_key, self.probe_key, self.failures_key
+                )
+                logger.info("Circuit breaker of %s closed.", self.model)
+            except redis.RedisError as e:
+                logger.warning("Failed to close the circuit breaker: %s", e)
+
+    def record_failure(self, probe: bool = False) -> None:
+        """
+        Records an outage, opening the breaker once the threshold is reached.
+        """
+        try:
+            client = get_redis_client()
+            if probe:
+                self._trip(client)
+                return
+            failures = client.incr(self.failures_key)
+            if failures == 1:
+                client.expire(self.failures_key, self.failure_window)
+            if failures >= self.failure_threshold:
+                self._trip(client)
+        except redis.RedisError as e:
+            logger.warning("Failed to record a failure in the circuit breaker: %s", e)
+
+    def _trip(self, client: redis.Redis) -> None:
+        pipeline = client.pipeline()
+        pipeline.set(self.open_key, 1, ex=self.reset_timeout)
+        pipeline.set(self.tripped_key, 1, ex=TRIPPED_TTL)
+        pipeline.delete(self.failures_key, self.probe_key)
+        pipeline.execute()
+        logger.error(
+            "Circuit breaker of %s opened for %ds.", self.model, self.reset_timeout
+        )
+
+
+_breakers: dict = {}
+
+
+def get_circuit_breaker(model: str) -> CircuitBreaker:
+    """
+    Returns the circuit breaker of a model.
+    """
+    if model not in _breakers:
+        _breakers[model] = CircuitBreaker(model)
+    return _breakers[model]
+
+
+def get_fallback_model() -> Optional[str]:
+    """
+    Returns the model used while the primary model's breaker is open, or None
+    to fail fast.
+    """
+    return getattr(settings, "OPENAI_FALLBACK_MODEL", "") or None
+
+
+def route(model: str) -> tuple[str, bool]:
+    """
+    Selects the model of a call.
+
+    Returns:
+        tuple[str, bool]: The model to call, and whether the call probes a
+        half-open breaker.
+
+    Raises:
+        CircuitOpenError: If the breaker is open and no fallback model is set.
+    """
+    allowed, probe = get_circuit_breaker(model).allow_request()
+    if allowed:
+        CIRCUIT_CALLS.labels(model, "probe" if probe else "primary").inc()
+        return model, probe
+
+    fallback_model = get_fallback_model()
+    if fallback_model is None:
+        CIRCUIT_CALLS.labels(model, "rejected").inc()
+        raise CircuitOpenError(f"Circuit breaker of {model} is open.")
+    CIRCUIT_CALLS.labels(model, "fallback").inc()
+    return fallback_model, False
+
+
+def called_model(default: str) -> str:
+    """
+    Returns the model the latest failed guarded call of the current context
+    was routed to, e.g. the fallback model, or `default` if there was none.
+    Retry strategies use it to act on the model that actually failed.
+    """
+    return _called_model.get() or default
+
+
+def circuit_breaker(model: str):
+    """
+    Decorator routing the calls of a function through the breaker of `model`.
+
+    The function must accept a `model` keyword argument, which receives the
+    primary model or, while the breaker is open, the fallback model. Only
+    outages of the primary model are recorded. Fallback answers are kept out
+    of an enclosing `instructor_cache`, whose key names the primary model.
+    Supports sync and async functions.
+
+    Args:
+        model (str): Name of the primary OpenAI model.
+    """
+    breaker = get_circuit_breaker(model)
+
+    def record(selected: str, probe: bool, start_time: float, error=None) -> None:
+        if selected != model:
+            return
+        if error is None:
+            breaker.record_success(time.perf_counter() - start_time, probe)
+        elif is_outage(error):
+            breaker.record_failure(probe)
+        elif probe:
+            # The model answered, so the probe succeeded
+            breaker.record_success(time.perf_counter() - start_time, probe)
+
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                selected, probe = await asyncio.to_thread(route, model)
+                token = _called_model.set(selected)
+                if selected != model:
+                    skip_cache()
+                start_time = time.perf_counter()
+                try:
+                    result = await func(*args, **{**kwargs, "model": selected})
+                except Exception as e:
+                    await asyncio.to_thread(record, selected, probe, start_time, e)
+                    raise
+                _called_model.reset(token)
+                await asyncio.to_thread(record, selected, probe, start_time)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            selected, probe = route(model)
+            token = _called_model.set(selected)
+            if selected != model:
+                skip_cache()
+            start_time = time.perf_counter()
+            try:
+                result = func(*args, **{**kwargs, "model": selected})
+            except Exception as e:
+                record(selected, probe, start_time, e)
+                raise
+            _called_model.reset(token)
+            record(selected, probe, start_time)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,226 @@
+# apps/insights/services/openai/clients.py
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Optional
+import redis
+from django.conf import settings
+from instructor import AsyncInstructor, Instructor, from_openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+from .logging import (
+    log_completion_kwargs,
+    log_completion_response,
+    log_completion_error,
+    log_parse_error,
+)
+from .telemetry import record_error, record_parse_error, record_request, record_response
+
+logger = logging.getLogger(__name__)
+
+# Seconds an OpenAI request may take when OPENAI_REQUEST_TIMEOUT is not set
+DEFAULT_REQUEST_TIMEOUT = 30
+
+# Reentrant, as creating the Instructor client creates the OpenAI client
+_lock = threading.RLock()
+# Clients created by this process, by name; cleared in forked children
+_clients: dict = {}
+# Async clients are bound to the event loop they were created in
+_loop_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _reset_after_fork() -> None:
+    """
+    Drops the parent's clients in a forked child, such as a qcluster worker.
+
+    Sockets inherited from the parent must not be shared, so the child opens
+    its own connection pools on first use. The inherited objects are not
+    closed, as that would close the parent's connections.
+    """
+    global _lock
+    _lock = threading.RLock()
+    _clients.clear()
+    _loop_clients.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _get_or_create(name: str, factory):
+    """
+    Returns the named client, creating it once per process.
+    """
+    client = _clients.get(name)
+    if client is not None:
+        return client
+    with _lock:
+        if name not in _clients:
+            _clients[name] = factory()
+            logger.info("Initialized %s client in process %s.", name, os.getpid())
+        return _clients[name]
+
+
+def get_openai_api_key() -> str:
+    """
+    Returns the OpenAI API key from settings.
+
+    Raises:
+        ValueError: If OPENAI_API_KEY is not set.
+    """
+    openai_api_key = getattr(settings, "OPENAI_API_KEY", "")
+    if not openai_api_key:
+        raise ValueError("OPENAI_API_KEY must be set in environment variables.")
+    return openai_api_key
+
+
+def get_openai_base_url() -> Optional[str]:
+    """
+    Returns the base URL of the OpenAI API from settings, or None for the
+    default endpoint.
+    """
+    return getattr(settings, "OPENAI_BASE_URL", "") or None
+
+
+def get_request_timeout() -> float:
+    """
+    Returns the timeout of a single OpenAI request from settings.
+
+    The clients do not retry requests themselves, so that each attempt is
+    bounded by this timeout and the Tenacity retries of the generators can
+    stop before the task timeout.
+    """
+    return getattr(settings, "OPENAI_REQUEST_TIMEOUT", DEFAULT_REQUEST_TIMEOUT)
+
+
+def get_task_timeout() -> Optional[float]:
+    """
+    Returns the seconds a Django Q task may run before its worker is killed,
+    or None if tasks are not timed out.
+    """
+    return getattr(settings, "Q_CLUSTER", {}).get("timeout")
+
+
+def get_http_client() -> DefaultHttpxClient:
+    """
+    Returns the HTTP client whose connection pool all OpenAI clients share.
+    """
+    return _get_or_create("http", DefaultHttpxClient)
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Returns the OpenAI client, created on first use.
+    """
+    return _get_or_create(
+        "openai",
+        lambda: OpenAI(
+            api_key=get_openai_api_key(),
+            base_url=get_openai_base_url(),
+            timeout=get_request_timeout(),
+            max_retries=0,
+            http_client=get_http_client(),
+        ),
+    )
+
+
+def _register_hooks(client):
+    """
+    Registers the metrics and logging hooks on an Instructor client.
+    """
+    client.on("completion:kwargs", record_request)
+    client.on("completion:response", record_response)
+    client.on("completion:error", record_error)
+    client.on("parse:error", record_parse_error)
+    client.on("completion:kwargs", log_completion_kwargs)
+    client.on("completion:response", log_completion_response)
+    client.on("completion:error", log_completion_error)
+    client.on("parse:error", log_parse_error)
+    return client
+
+
+def _create_instructor_client() -> Instructor:
+    """
+    Wraps the OpenAI client with Instructor and registers the logging hooks.
+    """
+    return _register_hooks(from_openai(get_openai_client()))
+
+
+def get_instructor_client() -> Instructor:
+    """
+    Returns the Instructor client for structured outputs, created on first use.
+    """
+    return _get_or_create("instructor", _create_instructor_client)
+
+
+def get_async_instructor_client() -> AsyncInstructor:
+    """
+    Returns the async Instructor client of the running event loop.
+
+    httpx async connections can not be shared between event loops, so each
+    loop gets its own client and connection pool, created on first use and
+    closed by `close_async_clients`.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        loop_clients = _loop_clients.setdefault(loop, {})
+        if "instructor" not in loop_clients:
+            http_client = DefaultAsyncHttpxClient()
+            loop_clients["http"] = http_client
+            loop_clients["instructor"] = _register_hooks(
+                from_openai(
+                    AsyncOpenAI(
+                        api_key=get_openai_api_key(),
+                        base_url=get_openai_base_url(),
+                        timeout=get_request_timeout(),
+                        max_retries=0,
+                        http_client=http_client,
+                    )
+                )
+            )
+            logger.info("Initialized async OpenAI client in process %s.", os.getpid())
+        return loop_clients["instructor"]
+
+
+async def close_async_clients() -> None:
+    """
+    Closes the async clients of the running event loop, if any were created.
+    """
+    with _lock:
+        loop_clients = _loop_clients.pop(asyncio.get_running_loop(), {})
+    http_client = loop_clients.get("http")
+    if http_client is not None:
+        await http_client.aclose()
+
+
+def get_redis_client() -> redis.Redis:
+    """
+    Returns a Redis client backed by the process-wide connection pool.
+    """
+    pool = _get_or_create(
+        "redis_pool",
+        lambda: redis.ConnectionPool(
+            host=settings.REDIS_HOST,
+            port=int(settings.REDIS_PORT),
+            db=int(settings.REDIS_DB),
+        ),
+    )
+    return redis.Redis(connection_pool=pool)
+
+
+def reset_clients() -> None:
+    """
+    Closes and forgets all clients, e.g. after settings change in tests.
+    """
+    with _lock:
+        for name, client in _clients.items():
+            try:
+                if name == "redis_pool":
+                    client.disconnect()
+                elif name == "http":
+                    client.close()
+            except Exception as e:
+                logger.warning("Failed to close %s client: %s", name, e)
+        _clients.clear()
+        _loop_clients.clear()
@@ -1,36 +1,56 @@
 import logging
 import pprint
 import json
+from .telemetry import current_call
 
 logger = logging.getLogger("apps.insights")
 
 
+class _Lazy:
+    """Formats a payload only if the log record is emitted."""
+
+    def __init__(self, format_payload, payload):
+        self.format_payload = format_payload
+        self.payload = payload
+
+    def __str__(self) -> str:
+        try:
+            return self.format_payload(self.payload)
+        except Exception as e:
+            return f"<unformattable payload: {e}>"
+
+
+def _format_response(response) -> str:
+    # Use model_dump for Pydantic models
+    response_dict = response.model_dump() if hasattr(response, "model_dump") else response
+    return json.dumps(response_dict, indent=4, default=str)
+
+
+def _log_payload() -> bool:
+    """Payloads are logged at DEBUG level, for the sampled share of LLM calls."""
+    return logger.isEnabledFor(logging.DEBUG) and current_call().sampled
+
+
 def log_completion_kwargs(*args, **kwargs) -> None:
-    """Log the arguments passed to the completion function."""
-    logger.info("## Completion kwargs:")
-    logger.info(pprint.pformat({"args": args, "kwargs": kwargs}))
+    """Log the arguments passed to the completion function of sampled calls."""
+    if _log_payload():
+        logger.debug(
+            "## Completion kwargs:\n%s",
+            _Lazy(pprint.pformat, {"args": args, "kwargs": kwargs}),
+        )
 
 
 def log_completion_response(response) -> None:
-    """Log the raw response object from the LLM."""
-    try:
-        # Use model_dump for Pydantic models
-        response_dict = (
-            response.model_dump() if hasattr(response, "model_dump") else response
-        )
-        logger.info("## Completion response:")
-        logger.info(json.dumps(response_dict, indent=4))
-    except Exception as e:
-        logger.error("Failed to format response for logging: %s", e)
+    """Log the raw response object from the LLM of sampled calls."""
+    if _log_payload():
+        logger.debug("## Completion response:\n%s", _Lazy(_format_response, response))
 
 
 def log_completion_error(error) -> None:
     """Log errors during completion."""
-    logger.error("## Completion error:")
-    logger.error(str(error))
+    logger.error("## Completion error: %s", error)
 
 
 def log_parse_error(error) -> None:
     """Log errors during parsing of the response."""
-    logger.error("## Parse error:")
-    logger.error(str(error))
+    logger.error("## Parse error: %s", error)
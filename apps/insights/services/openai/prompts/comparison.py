@@ -1,3 +1,6 @@
+# Bump when the prompt or its response model changes, to invalidate cached responses
+COMPARISON_PROMPT_VERSION = "3"
+
 COMPARISON_PROMPT = """
 You are a data analyst tasked with comparing two dataset summaries. Here are the summaries:
 
@@ -5,6 +8,10 @@ You are a data analyst tasked with comparing two dataset summaries. Here are the
 
 {summary2} is the week prior.
 
+The key metrics of both weeks, as CSV with the change from the previous week in percent:
+
+{metric_deltas}
+
 Think step-by-step to explain your reasoning for the comparison, and include this explanation in the field `chain_of_thought`.
 
 Please provide the comparison in the following JSON format:
@@ -20,8 +27,6 @@ Please provide the comparison in the following JSON format:
     "key_metrics_comparison": [
         {{
             "name": "Name of Metric",
-            "value1": Value from current week,
-            "value2": Value from previous week,
             "description": "Description of observed difference or trend between the previous week and the current week, including specific figures and percentages where appropriate."
         }}
         // Repeat for each key metric
@@ -30,18 +35,8 @@ Please provide the comparison in the following JSON format:
 }}
 
 Ensure that:
-- Numerical values for value1 and value2 are provided as numbers (not strings) for each metric.
-- The key_metrics_comparison includes the following metrics in this order:
-    - "Average Sessions"
-    - "Average Users"
-    - "Average New Users"
-    - "Average Pageviews"
-    - "Pages per Session"
-    - "Average Session Duration"
-    - "Bounce Rate"
-    - "Conversion Rate"
-    - "Average Transactions"
-    - "Average Revenue"
+- The key_metrics_comparison has one entry for each metric in the key metrics table, in the same order and with the same name.
+- Figures and percentages are taken from the key metrics table.
 - The description for each metric explains the difference or trend observed between the current week and one week prior, using precise figures (e.g., differences, statistics, percentages).
 - Refer to the summaries as "this week" and "the previous week" in your descriptions.
 """
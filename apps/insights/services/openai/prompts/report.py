@@ -0,0 +1,57 @@
+# apps/insights/services/openai/prompts/report.py
+from apps.insights.services.csv.data_overview import overview_legend
+
+# Bump when the prompt or its response model changes, to invalidate cached responses
+WEEKLY_REPORT_PROMPT_VERSION = "1"
+
+WEEKLY_REPORT_PROMPT = (
+    """
+You are a data analyst tasked with writing a weekly report on a dataset. The following are statistical summaries of the current week and of the week prior, as CSV with one row per column (aliases: """
+    + overview_legend()
+    + """).
+
+The current week:
+
+{current_overview}
+
+The week prior:
+
+{previous_overview}
+
+The key metrics of both weeks, as CSV with the change from the previous week in percent:
+
+{metric_deltas}
+
+Think step-by-step, and include your reasoning for each part of the report in its `chain_of_thought` field.
+
+Please provide the report in the following JSON format:
+
+{{
+    "current_week_summary": {{
+        "dataset_summary": "A concise, insightful summary of the current week highlighting significant findings, trends, or patterns observed in the data, referencing the actual values and what they indicate about user behavior or performance metrics.",
+        "chain_of_thought": "Step-by-step reasoning explaining how the summary was derived."
+    }},
+    "previous_week_summary": {{
+        "dataset_summary": "The same kind of summary for the week prior.",
+        "chain_of_thought": "Step-by-step reasoning explaining how the summary was derived."
+    }},
+    "comparison": {{
+        "comparison_summary": "A comprehensive summary of differences and similarities between the current week and previous week, including notable trends and observations, in at most 180 words. Refer to the weeks as 'this week' and 'the previous week', mention up to three salient numerical values and use commas to separate thousands.",
+        "key_metrics_comparison": [
+            {{
+                "name": "Name of Metric",
+                "description": "Description of observed difference or trend between the previous week and the current week, including specific figures and percentages where appropriate."
+            }}
+            // Repeat for each key metric
+        ],
+        "chain_of_thought": "Step-by-step reasoning explaining how the comparison summary and key metrics were derived."
+    }}
+}}
+
+Ensure that:
+- Each summary refers to the key metrics, which are the means of the columns: sessions, users, new users, pageviews, pages per session, session duration, bounce rate, conversion rate, transactions and revenue.
+- The key_metrics_comparison has one entry for each metric in the key metrics table, in the same order and with the same name.
+- Figures and percentages are taken from the statistical summaries and the key metrics table.
+- Focus on delivering specific insights derived from the data and avoid generic statements.
+"""
+)
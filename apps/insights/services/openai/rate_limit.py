@@ -0,0 +1,400 @@
+# apps/insights/services/openai/rate_limit.py
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+import openai
+import redis
+from django.conf import settings
+from tenacity import retry_if_not_exception_type, stop_after_attempt, wait_exponential
+from tenacity.stop import stop_base
+from .circuit_breaker import CircuitOpenError, called_model
+from .clients import get_redis_client, get_request_timeout, get_task_timeout
+from .telemetry import count_retry
+from .tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Prefix of all Redis keys written by the rate limiter
+RATE_LIMIT_KEY_PREFIX = "openai_rate_limit"
+
+# Defaults when OPENAI_RATE_LIMIT_RPM / _TPM are not set
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 30000
+
+# Longest wait for the rate limiter when tasks are not timed out
+DEFAULT_ACQUIRE_TIMEOUT = 600
+
+# Completion tokens reserved per request, on top of the prompt tokens
+COMPLETION_TOKEN_ESTIMATE = 1000
+
+# Priority classes: scheduled weekly work and ad-hoc runs from the admin
+PRIORITY_SCHEDULED = "scheduled"
+PRIORITY_ADHOC = "adhoc"
+
+# Share of each bucket that must remain after a request of the priority class,
+# so that ad-hoc runs leave headroom for scheduled work
+PRIORITY_RESERVES = {PRIORITY_SCHEDULED: 0.0, PRIORITY_ADHOC: 0.2}
+
+_priority: contextvars.ContextVar = contextvars.ContextVar(
+    "openai_priority", default=PRIORITY_ADHOC
+)
+# time.monotonic() by which the current task must have finished, if any
+_task_deadline: contextvars.ContextVar = contextvars.ContextVar(
+    "openai_task_deadline", default=None
+)
+
+# Refills both buckets from the Redis clock, then takes one request and the
+# estimated tokens if both have enough left above the priority's reserve.
+# Returns 0 when granted, otherwise the milliseconds to wait before retrying.
+TOKEN_BUCKET_SCRIPT = """
+local paused = redis.call('PTTL', KEYS[3])
+if paused > 0 then
+    return paused
+end
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local reserve = tonumber(ARGV[5])
+local levels = {}
+local wait = 0
+
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[i * 2 - 1])
+    local cost = math.min(tonumber(ARGV[i * 2]), capacity * (1 - reserve))
+    local bucket = redis.call('HMGET', KEYS[i], 'level', 'updated')
+    local level = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    level = math.min(capacity, level + (now - updated) * capacity / 60000)
+    levels[i] = level - cost
+    local missing = cost + capacity * reserve - level
+    if missing > 0 then
+        wait = math.max(wait, math.ceil(missing * 60000 / capacity))
+    end
+end
+
+if wait > 0 then
+    return wait
+end
+for i = 1, 2 do
+    redis.call('HSET', KEYS[i], 'level', levels[i], 'updated', now)
+    redis.call('PEXPIRE', KEYS[i], 120000)
+end
+return 0
+"""
+
+
+class RateLimitTimeout(Exception):
+    """
+    Raised when the rate limiter does not grant a request in time.
+    """
+
+
+@contextmanager
+def priority(name: str):
+    """
+    Runs the enclosed OpenAI calls under a priority class.
+
+    Args:
+        name (str): PRIORITY_SCHEDULED or PRIORITY_ADHOC.
+    """
+    if name not in PRIORITY_RESERVES:
+        raise ValueError(f"Unknown priority class: {name}")
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """
+    Returns the priority class of the current context.
+    """
+    return _priority.get()
+
+
+@contextmanager
+def task_deadline(seconds: Optional[float]):
+    """
+    Runs the enclosed OpenAI calls under a deadline `seconds` from now, such
+    as the Django Q task timeout, so that rate limit waits and retries give up
+    while the task can still fail cleanly.
+
+    Args:
+        seconds (float): Time the task may take, or None for no deadline.
+    """
+    token = _task_deadline.set(
+        None if seconds is None else time.monotonic() + seconds
+    )
+    try:
+        yield
+    finally:
+        _task_deadline.reset(token)
+
+
+def remaining_task_time() -> Optional[float]:
+    """
+    Returns the seconds left before the deadline of the current task, or None
+    if it has none.
+    """
+    deadline = _task_deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+class RateLimiter:
+    """
+    Token bucket limiting the requests and tokens per minute sent to a model,
+    shared through Redis by every worker and pod.
+
+    Each bucket holds up to one minute of its limit and refills continuously.
+    Requests of a lower priority class must leave part of each bucket unused.
+    A 429 response pauses the limiter for everyone for its Retry-After time.
+    Redis failures are logged and requests are let through, as the API's own
+    limits still apply.
+
+    Args:
+        model (str): Name of the OpenAI model the limits apply to.
+        requests_per_minute (int): Request limit. Defaults to OPENAI_RATE_LIMIT_RPM.
+        tokens_per_minute (int): Token limit. Defaults to OPENAI_RATE_LIMIT_TPM.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        self.model = model
+        self.requests_per_minute = requests_per_minute or getattr(
+            settings, "OPENAI_RATE_LIMIT_RPM", DEFAULT_REQUESTS_PER_MINUTE
+        )
+        self.tokens_per_minute = tokens_per_minute or getattr(
+            settings, "OPENAI_RATE_LIMIT_TPM", DEFAULT_TOKENS_PER_MINUTE
+        )
+        prefix = f"{RATE_LIMIT_KEY_PREFIX}:{model}"
+        self.keys = [f"{prefix}:requests", f"{prefix}:tokens", f"{prefix}:paused"]
+
+    def try_acquire(self, tokens: int, priority_class: Optional[str] = None) -> float:
+        """
+        Takes one request and `tokens` tokens if the buckets allow it.
+
+        Returns:
+            float: 0 if granted, otherwise the seconds to wait before retrying.
+        """
+        reserve = PRIORITY_RESERVES[priority_class or current_priority()]
+        try:
+            wait_ms = get_redis_client().eval(
+                TOKEN_BUCKET_SCRIPT,
+                len(self.keys),
+                *self.keys,
+                self.requests_per_minute,
+                1,
+                self.tokens_per_minute,
+                tokens,
+                reserve,
+            )
+        except redis.RedisError as e:
+            logger.warning("Rate limiter unavailable, not limiting: %s", e)
+            return 0.0
+        return int(wait_ms) / 1000
+
+    def acquire(
+        self,
+        tokens: int,
+        priority_class: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Blocks until one request and `tokens` tokens are granted.
+
+        Raises:
+            RateLimitTimeout: If they are not granted within `timeout` seconds
+            (default OPENAI_RATE_LIMIT_TIMEOUT, or `default_acquire_timeout`),
+            or in time for the request to finish before the task deadline.
+        """
+        deadline = self._deadline(timeout)
+        while wait := self.try_acquire(tokens, priority_class):
+            time.sleep(self._delay(wait, deadline))
+
+    async def acquire_async(
+        self,
+        tokens: int,
+        priority_class: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Async variant of `acquire` that does not block the event loop.
+        """
+        deadline = self._deadline(timeout)
+        priority_class = priority_class or current_priority()
+        while wait := await asyncio.to_thread(self.try_acquire, tokens, priority_class):
+            await asyncio.sleep(self._delay(wait, deadline))
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stops all workers from sending requests for `seconds`, e.g. after a 429.
+        """
+        try:
+            get_redis_client().set(self.keys[2], 1, px=max(1, int(seconds * 1000)))
+            logger.warning("Paused OpenAI requests to %s for %.1fs.", self.model, seconds)
+        except redis.RedisError as e:
+            logger.warning("Failed to pause the rate limiter: %s", e)
+
+    def _deadline(self, timeout: Optional[float]) -> float:
+        if timeout is None:
+            timeout = (
+                getattr(settings, "OPENAI_RATE_LIMIT_TIMEOUT", None)
+                or default_acquire_timeout()
+            )
+        deadline = time.monotonic() + timeout
+        remaining = remaining_task_time()
+        if remaining is not None:
+            # Leave the request itself time to finish within the task
+            deadline = min(
+                deadline, time.monotonic() + remaining - get_request_timeout()
+            )
+        return deadline
+
+    def _delay(self, wait: float, deadline: float) -> float:
+        """
+        Returns the jittered delay before the next attempt, so that waiting
+        workers do not retry in lockstep.
+        """
+        if time.monotonic() + wait > deadline:
+            raise RateLimitTimeout(
+                f"Rate limit for {self.model} not available within the timeout."
+            )
+        return wait * random.uniform(1.0, 1.2)
+
+
+_limiters: dict = {}
+
+
+def default_acquire_timeout() -> float:
+    """
+    Returns the longest wait for the rate limiter when OPENAI_RATE_LIMIT_TIMEOUT
+    is not set: the Django Q task timeout less the time one request may take,
+    so that a task waiting for its turn fails with RateLimitTimeout rather
+    than being killed by its worker.
+    """
+    task_timeout = get_task_timeout()
+    if task_timeout is None:
+        return DEFAULT_ACQUIRE_TIMEOUT
+    return max(0, task_timeout - get_request_timeout())
+
+
+def request_tokens(prompt: str, model: str) -> int:
+    """
+    Estimates the tokens a request takes from the token bucket: the prompt
+    tokens plus the expected completion tokens.
+    """
+    return count_tokens(prompt, model) + COMPLETION_TOKEN_ESTIMATE
+
+
+def get_rate_limiter(model: str) -> RateLimiter:
+    """
+    Returns the rate limiter of a model.
+    """
+    if model not in _limiters:
+        _limiters[model] = RateLimiter(model)
+    return _limiters[model]
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """
+    Returns the wait requested by a 429 response in or behind an exception.
+
+    Instructor may wrap the OpenAI error, so the exception's causes are
+    searched as well. Both the `retry-after-ms` and `retry-after` headers are
+    honoured.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the exception is not a
+        rate limit error or carries no Retry-After header.
+    """
+    while exc is not None and not isinstance(exc, openai.RateLimitError):
+        exc = exc.__cause__ or exc.__context__
+    if exc is None:
+        return None
+
+    headers = exc.response.headers
+    for header, scale in (("retry-after-ms", 1000), ("retry-after", 1)):
+        try:
+            return float(headers[header]) / scale
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+class wait_retry_after:
+    """
+    Tenacity wait strategy that honours Retry-After on rate limit errors.
+
+    A 429 pauses the shared rate limiter of the model that returned it, so
+    that every worker waits instead of only the one that was rejected. That
+    is the model the circuit breaker routed the failed call to, such as the
+    fallback model. Other errors use `fallback`.
+
+    Args:
+        model (str): Name of the primary OpenAI model being called.
+        fallback (Callable): Wait strategy for other errors.
+    """
+
+    def __init__(self, model: str, fallback: Callable):
+        self.model = model
+        self.fallback = fallback
+
+    def __call__(self, retry_state) -> float:
+        fallback_wait = self.fallback(retry_state)
+        seconds = retry_after_seconds(retry_state.outcome.exception())
+        if seconds is None:
+            return fallback_wait
+        get_rate_limiter(called_model(self.model)).pause(seconds)
+        return max(seconds, fallback_wait)
+
+
+class stop_before_task_deadline(stop_base):
+    """
+    Tenacity stop strategy that gives up when another attempt, after the
+    upcoming wait, could not finish before the deadline of the current task.
+    Calls outside a task deadline are not stopped.
+    """
+
+    def __call__(self, retry_state) -> bool:
+        remaining = remaining_task_time()
+        if remaining is None:
+            return False
+        return (retry_state.upcoming_sleep or 0) + get_request_timeout() > remaining
+
+
+def retry_options(generator: str, model: str) -> dict:
+    """
+    Returns the Tenacity `retry` options of a generator's calls to `model`.
+
+    Transient errors are retried with exponential backoff, or after the wait
+    requested by a 429 response. An open circuit breaker fails fast rather
+    than being retried, and no attempt is started that could outlast the
+    Django Q task.
+
+    Args:
+        generator (str): Name of the generator, used in the retry metrics.
+        model (str): Name of the primary OpenAI model being called.
+    """
+    return dict(
+        retry=retry_if_not_exception_type(CircuitOpenError),
+        stop=stop_after_attempt(settings.OPENAI_RETRY_ATTEMPTS)
+        | stop_before_task_deadline(),
+        wait=wait_retry_after(
+            model,
+            wait_exponential(
+                multiplier=settings.OPENAI_RETRY_WAIT_MULTIPLIER,
+                min=settings.OPENAI_RETRY_WAIT_MIN,
+                max=settings.OPENAI_RETRY_WAIT_MAX,
+            ),
+        ),
+        before_sleep=count_retry(generator, model),
+    )
@@ -0,0 +1,121 @@
+# apps/insights/services/openai/repair.py
+import difflib
+import logging
+import re
+from typing import Any, Optional
+from prometheus_client import Counter
+from apps.insights.services.csv.data_overview import KEY_METRIC_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+# Minimum difflib similarity for a metric name to be matched
+METRIC_NAME_CUTOFF = 0.8
+
+# Re-asks Instructor makes when an output can not be repaired locally
+MAX_REASKS = 1
+
+# Exported through django-prometheus, by the Django Q workers on QCLUSTER_METRICS_PORT
+REPAIRS = Counter(
+    "insights_llm_repairs_total",
+    "LLM output fields repaired locally instead of re-asking, by kind of repair.",
+    ["schema", "kind"],
+)
+
+def _normalize(name: str) -> str:
+    return " ".join(re.sub(r"[_\-]+", " ", name).lower().split())
+
+
+def _metric_names() -> dict[str, str]:
+    """
+    Returns the key metric names by their normalized names and column names.
+    """
+    names = {}
+    for name, column in KEY_METRIC_COLUMNS.items():
+        names[_normalize(name)] = name
+        names[_normalize(column)] = name
+    return names
+
+
+def match_metric_name(name: str) -> Optional[str]:
+    """
+    Returns the key metric a name refers to, ignoring case, separators and
+    small spelling differences, or None if no metric is close enough.
+    """
+    if name in KEY_METRIC_COLUMNS:
+        return name
+    names = _metric_names()
+    normalized = _normalize(name)
+    if normalized in names:
+        return names[normalized]
+    matches = difflib.get_close_matches(
+        normalized, names, n=1, cutoff=METRIC_NAME_CUTOFF
+    )
+    return names[matches[0]] if matches else None
+
+
+def repair_metric_name(name: Any, schema: str, strict: bool = True) -> Any:
+    """
+    Replaces a metric name by the key metric it refers to.
+
+    Args:
+        name: The raw metric name.
+        schema (str): Name of the schema being validated, for the metrics.
+        strict (bool): Whether names matching no key metric are rejected, or
+            kept as they are, e.g. for metrics read back from the database.
+
+    Raises:
+        ValueError: If `strict` and the name matches no key metric, so that
+        the output is re-asked.
+    """
+    if not isinstance(name, str):
+        return name
+    matched = match_metric_name(name)
+    if matched is None:
+        if not strict:
+            return name
+        raise ValueError(f"Unexpected metric name: {name}")
+    if matched != name:
+        logger.info("Repaired metric name %r to %r.", name, matched)
+        REPAIRS.labels(schema, "name").inc()
+    return matched
+
+
+def repair_metric_list(metrics: Any, schema: str) -> Any:
+    """
+    Repairs the names of a list of metrics, drops repeated metrics and
+    restores the order of `KeyMetric.ordered_metrics`.
+
+    Args:
+        metrics: The raw list of metrics, as dicts or models with a name.
+        schema (str): Name of the schema being validated, for the metrics.
+
+    Raises:
+        ValueError: If a metric name can not be repaired.
+    """
+    if not isinstance(metrics, list):
+        return metrics
+
+    order = list(KEY_METRIC_COLUMNS)
+    repaired = {}
+    for metric in metrics:
+        is_dict = isinstance(metric, dict)
+        name = metric.get("name") if is_dict else getattr(metric, "name", None)
+        if name is None:
+            return metrics
+        name = repair_metric_name(name, schema)
+        if name in repaired:
+            logger.info("Dropped repeated metric %r.", name)
+            REPAIRS.labels(schema, "duplicate").inc()
+            continue
+        if is_dict:
+            repaired[name] = {**metric, "name": name}
+        else:
+            repaired[name] = metric.model_copy(update={"name": name})
+
+    names = list(repaired)
+    ordered_names = sorted(names, key=order.index)
+    if names != ordered_names:
+        logger.info("Restored the order of the key metrics.")
+        REPAIRS.labels(schema, "order").inc()
+    return [repaired[name] for name in ordered_names]
+
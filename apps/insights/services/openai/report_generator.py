@@ -0,0 +1,75 @@
+# apps/insights/services/openai/report_generator.py
+import logging
+from tenacity import retry
+from .schemas import WeeklyReportOutput
+from .prompts.report import WEEKLY_REPORT_PROMPT, WEEKLY_REPORT_PROMPT_VERSION
+from .cache import instructor_cache
+from .circuit_breaker import circuit_breaker
+from .repair import MAX_REASKS
+from .tokens import record_prompt_tokens
+from .telemetry import llm_call
+from .rate_limit import get_rate_limiter, request_tokens, retry_options
+from .clients import get_instructor_client
+
+# OpenAI model used for structured outputs
+OPENAI_MODEL = "gpt-4o-2024-08-06"
+
+
+# Retry logic for transient errors
+@retry(**retry_options("weekly_report", OPENAI_MODEL))
+@instructor_cache(model=OPENAI_MODEL, prompt_version=WEEKLY_REPORT_PROMPT_VERSION)
+@circuit_breaker(OPENAI_MODEL)
+def call_openai_api(prompt: str, model: str = OPENAI_MODEL) -> WeeklyReportOutput:
+    """
+    Makes a call to the OpenAI API with a retry mechanism for transient errors.
+
+    Args:
+        prompt (str): The input prompt for the OpenAI model.
+        model (str): The model to call, chosen by the circuit breaker.
+
+    Returns:
+        WeeklyReportOutput: Both weekly summaries and their comparison.
+    """
+    get_rate_limiter(model).acquire(request_tokens(prompt, model))
+    try:
+        with llm_call("weekly_report", model):
+            return get_instructor_client().chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                response_model=WeeklyReportOutput,
+                max_retries=MAX_REASKS,
+            )
+    except Exception as e:
+        logging.error("Error during OpenAI API call: %s", e)
+        raise
+
+
+def generate_weekly_report(
+    current_overview: str, previous_overview: str, metric_deltas: str
+) -> WeeklyReportOutput:
+    """
+    Generates both weekly summaries and their comparison in a single request.
+
+    Args:
+        current_overview (str): Compact statistical overview of the current week.
+        previous_overview (str): Compact statistical overview of the previous week.
+        metric_deltas (str): Key metrics of both weeks as a CSV table.
+
+    Returns:
+        WeeklyReportOutput: Both weekly summaries and their comparison.
+    """
+    prompt = WEEKLY_REPORT_PROMPT.format(
+        current_overview=current_overview,
+        previous_overview=previous_overview,
+        metric_deltas=metric_deltas,
+    )
+    record_prompt_tokens("weekly_report", prompt, OPENAI_MODEL)
+    try:
+        logging.info("Requesting weekly report from OpenAI...")
+        response = call_openai_api(prompt)
+        logging.info("Successfully received structured response.")
+        return response
+
+    except Exception as e:
+        logging.error("Error generating weekly report: %s", e)
+        raise ValueError("Failed to generate weekly report using OpenAI.") from e
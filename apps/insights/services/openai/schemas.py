@@ -1,17 +1,23 @@
 # apps/insights/services/openai/schemas.py
 
-from pydantic import BaseModel, Field
-from typing import List
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
+from .repair import repair_metric_list, repair_metric_name
 
 
 class KeyMetric(BaseModel):
     """
-    Represents a single key metric extracted from the dataset summary.
+    Represents a single key metric of a dataset summary, computed from the data.
     """
 
     name: str
     value: float
 
+    @field_validator("name", mode="before")
+    @classmethod
+    def repair_name(cls, name):
+        return repair_metric_name(name, cls.__name__, strict=False)
+
     @classmethod
     def ordered_metrics(cls) -> List["KeyMetric"]:
         """
@@ -43,45 +49,41 @@ class KeyMetric(BaseModel):
 class SummaryOutput(BaseModel):
     """
     Structured output for a dataset summary response from the LLM.
+
+    The key metrics are computed from the data rather than requested from the
+    LLM, and are saved together with this narrative.
     """
 
     dataset_summary: str = Field(
         ..., description="A concise English summary of the dataset."
     )
-    key_metrics: List[KeyMetric] = Field(
-        ..., description="List of key metrics extracted from the dataset."
-    )
     chain_of_thought: str = Field(
         ...,
         description="Step-by-step reasoning explaining how the summary was derived.",
     )
 
-    def enforce_ordered_metrics(self):
-        """
-        Enforces that key metrics are in the exact order defined by `KeyMetric.ordered_metrics`.
-        """
-        ordered_names = [metric.name for metric in KeyMetric.ordered_metrics()]
-        self.key_metrics = sorted(
-            self.key_metrics,
-            key=lambda metric: (
-                ordered_names.index(metric.name)
-                if metric.name in ordered_names
-                else float("inf")
-            ),
-        )
-        # Ensure no unexpected metrics
-        for metric in self.key_metrics:
-            metric.validate_name()
-
 
-class KeyMetricComparison(BaseModel):
+class KeyMetricDelta(BaseModel):
     """
-    Represents a comparison of key metrics between two datasets.
+    The values of a key metric in two weeks, computed from the stored summaries.
     """
 
     name: str
     value1: float
     value2: float
+    percentage_difference: Optional[float] = None
+
+    @field_validator("name", mode="before")
+    @classmethod
+    def repair_name(cls, name):
+        return repair_metric_name(name, cls.__name__, strict=False)
+
+class KeyMetricComparison(BaseModel):
+    """
+    The LLM's description of how a key metric changed between two datasets.
+    """
+
+    name: str
     description: str
 
 
@@ -96,9 +98,35 @@ class ComparisonOutput(BaseModel):
     )
     key_metrics_comparison: List[KeyMetricComparison] = Field(
         ...,
-        description="Key metrics with values from both weeks and descriptions of differences.",
+        description="Descriptions of the differences in each key metric.",
     )
     chain_of_thought: str = Field(
         ...,
         description="Step-by-step reasoning explaining how the comparison was derived.",
     )
+
+    @field_validator("key_metrics_comparison", mode="before")
+    @classmethod
+    def repair_key_metrics(cls, metrics):
+        """
+        Repairs metric names and order locally; only names that match no key
+        metric fail validation and make Instructor re-ask.
+        """
+        return repair_metric_list(metrics, cls.__name__)
+
+
+class WeeklyReportOutput(BaseModel):
+    """
+    Structured output for a complete weekly report generated in a single request:
+    the summaries of both weeks and their comparison.
+    """
+
+    current_week_summary: SummaryOutput = Field(
+        ..., description="Summary of the current week's dataset."
+    )
+    previous_week_summary: SummaryOutput = Field(
+        ..., description="Summary of the previous week's dataset."
+    )
+    comparison: ComparisonOutput = Field(
+        ..., description="Comparison of the current week with the previous week."
+    )
@@ -1,105 +1,80 @@
 import logging
-import functools
-import inspect
-from pydantic import BaseModel, ValidationError
-import redis
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-)
-from django.conf import settings
-from instructor import from_openai
-from openai import OpenAI
+from tenacity import retry
 from .schemas import SummaryOutput
-from .prompts.summary import SUMMARY_PROMPT
-from .logging import (
-    log_completion_kwargs,
-    log_completion_response,
-    log_completion_error,
-    log_parse_error,
-)
-
-# Load OpenAI API key from settings
-openai_api_key = settings.OPENAI_API_KEY
-
-if not openai_api_key:
-    raise ValueError("OPENAI_API_KEY must be set in environment variables.")
-
-# Initialize OpenAI client
-client = from_openai(OpenAI(api_key=openai_api_key))
+from .prompts.summary import SUMMARY_PROMPT, SUMMARY_PROMPT_VERSION
+from .cache import instructor_cache
+from .circuit_breaker import circuit_breaker
+from .repair import MAX_REASKS
+from .tokens import record_prompt_tokens
+from .telemetry import llm_call
+from .rate_limit import get_rate_limiter, request_tokens, retry_options
+from .clients import get_async_instructor_client, get_instructor_client
+
+# OpenAI model used for structured outputs
+OPENAI_MODEL = "gpt-4o-2024-08-06"
+
+# Retry logic for transient errors, shared by the sync and async API calls
+RETRY_OPTIONS = retry_options("summary", OPENAI_MODEL)
+
+
+@retry(**RETRY_OPTIONS)
+@instructor_cache(model=OPENAI_MODEL, prompt_version=SUMMARY_PROMPT_VERSION)
+@circuit_breaker(OPENAI_MODEL)
+def call_openai_api(prompt: str, model: str = OPENAI_MODEL) -> SummaryOutput:
+    """
+    Makes a call to the OpenAI API with a retry mechanism for transient errors.
 
-# Register Instructor hooks for logging
-client.on("completion:kwargs", log_completion_kwargs)
-client.on("completion:response", log_completion_response)
-client.on("completion:error", log_completion_error)
-client.on("parse:error", log_parse_error)
+    Args:
+        prompt (str): The input prompt for the OpenAI model.
+        model (str): The model to call, chosen by the circuit breaker.
 
-# Initialize Redis client for caching
-cache = redis.Redis(
-    host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB
-)
+    Returns:
+        SummaryOutput: A structured summary containing dataset insights.
+    """
+    get_rate_limiter(model).acquire(request_tokens(prompt, model))
+    try:
+        # Make the API call
+        with llm_call("summary", model):
+            return get_instructor_client().chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                response_model=SummaryOutput,
+                max_retries=MAX_REASKS,
+            )
+    except Exception as e:
+        logging.error("Error during OpenAI API call: %s", e)
+        raise
 
 
-def instructor_cache(func):
-    """
-    Caches a function that returns a Pydantic model.
-    """
-    return_type = inspect.signature(func).return_annotation
-    if not issubclass(return_type, BaseModel):
-        raise ValueError("Return type must be a Pydantic model.")
-
-    @functools.wraps(func)
-    def wrapper(*args, **kwargs):
-        # Create a stable, hashable representation of arguments
-        key = f"{func.__name__}:{hash(str(args) + str(sorted(kwargs.items())))}"
-        # Check if the result is already cached
-        if (cached := cache.get(key)) is not None:
-            try:
-                # Deserialize the cached data
-                return return_type.model_validate_json(cached)
-            except ValidationError as e:
-                logging.warning(
-                    "Cache deserialization error: %s. Recomputing result.", e
-                )
-
-        # Compute the result if not cached
-        result = func(*args, **kwargs)
-
-        # Serialize and store the result in Redis with a TTL
-        cache.set(key, result.model_dump_json(), ex=3600)
-        return result
-
-    return wrapper
-
-
-# Retry logic for transient errors
-@retry(
-    stop=stop_after_attempt(settings.OPENAI_RETRY_ATTEMPTS),
-    wait=wait_exponential(
-        multiplier=settings.OPENAI_RETRY_WAIT_MULTIPLIER,
-        min=settings.OPENAI_RETRY_WAIT_MIN,
-        max=settings.OPENAI_RETRY_WAIT_MAX,
-    ),
+@retry(**RETRY_OPTIONS)
+@instructor_cache(
+    model=OPENAI_MODEL,
+    prompt_version=SUMMARY_PROMPT_VERSION,
+    name="summary_generator.call_openai_api",
 )
-@instructor_cache
-def call_openai_api(prompt: str) -> SummaryOutput:
+@circuit_breaker(OPENAI_MODEL)
+async def call_openai_api_async(
+    prompt: str, model: str = OPENAI_MODEL
+) -> SummaryOutput:
     """
-    Makes a call to the OpenAI API with a retry mechanism for transient errors.
+    Async variant of `call_openai_api`, sharing its retries and cache entries.
 
     Args:
         prompt (str): The input prompt for the OpenAI model.
+        model (str): The model to call, chosen by the circuit breaker.
 
     Returns:
-        SummaryOutput: A structured summary containing dataset insights and key metrics.
+        SummaryOutput: A structured summary containing dataset insights.
     """
+    await get_rate_limiter(model).acquire_async(request_tokens(prompt, model))
     try:
-        # Make the API call
-        return client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
-            messages=[{"role": "user", "content": prompt}],
-            response_model=SummaryOutput,
-        )
+        with llm_call("summary", model):
+            return await get_async_instructor_client().chat.completions.create(
+                model=model,
+                messages=[{"role": "user", "content": prompt}],
+                response_model=SummaryOutput,
+                max_retries=MAX_REASKS,
+            )
     except Exception as e:
         logging.error("Error during OpenAI API call: %s", e)
         raise
@@ -113,9 +88,10 @@ def generate_summary(statistical_summary: str) -> SummaryOutput:
         statistical_summary (str): Statistical summary of the dataset.
 
     Returns:
-        SummaryOutput: A structured summary containing dataset insights and key metrics.
+        SummaryOutput: A structured summary containing dataset insights.
     """
     prompt = SUMMARY_PROMPT.format(statistical_summary=statistical_summary)
+    record_prompt_tokens("summary", prompt, OPENAI_MODEL)
     try:
         logging.info("Requesting dataset summary from OpenAI...")
 
@@ -129,3 +105,27 @@ def generate_summary(statistical_summary: str) -> SummaryOutput:
     except Exception as e:
         logging.error("Error generating summary: %s", e)
         raise ValueError("Failed to generate summary using OpenAI.") from e
+
+
+async def generate_summary_async(statistical_summary: str) -> SummaryOutput:
+    """
+    Generates a structured dataset summary without blocking the event loop,
+    so that several summaries can be requested concurrently.
+
+    Args:
+        statistical_summary (str): Statistical summary of the dataset.
+
+    Returns:
+        SummaryOutput: A structured summary containing dataset insights.
+    """
+    prompt = SUMMARY_PROMPT.format(statistical_summary=statistical_summary)
+    record_prompt_tokens("summary", prompt, OPENAI_MODEL)
+    try:
+        logging.info("Requesting dataset summary from OpenAI...")
+        response = await call_openai_api_async(prompt)
+        logging.info("Successfully received structured response.")
+        return response
+
+    except Exception as e:
+        logging.error("Error generating summary: %s", e)
+        raise ValueError("Failed to generate summary using OpenAI.") from e
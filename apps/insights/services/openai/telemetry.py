@@ -0,0 +1,161 @@
+# apps/insights/services/openai/telemetry.py
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+from django.conf import settings
+from prometheus_client import Counter, Histogram
+
+# Share of LLM calls whose payloads are logged when OPENAI_LOG_SAMPLE_RATE is not set
+DEFAULT_LOG_SAMPLE_RATE = 0.01
+
+# Exported through django-prometheus, by the Django Q workers on QCLUSTER_METRICS_PORT
+LLM_REQUESTS = Counter(
+    "insights_llm_requests_total",
+    "LLM API requests by outcome (success or error).",
+    ["generator", "model", "outcome"],
+)
+LLM_LATENCY = Histogram(
+    "insights_llm_request_latency_seconds",
+    "Time of a single LLM API request, excluding parsing and retries.",
+    ["generator", "model"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120),
+)
+LLM_TOKENS = Histogram(
+    "insights_llm_tokens",
+    "Tokens used by a single LLM API request, as reported by the API.",
+    ["generator", "model", "kind"],
+    buckets=(100, 250, 500, 1000, 2000, 4000, 8000, 16000),
+)
+LLM_PARSE_ERRORS = Counter(
+    "insights_llm_parse_errors_total",
+    "LLM responses that did not match the response model.",
+    ["generator", "model"],
+)
+LLM_RETRIES = Counter(
+    "insights_llm_retries_total",
+    "LLM API requests repeated after a parse error (reask) or a failed call (error).",
+    ["generator", "model", "reason"],
+)
+
+
+@dataclass
+class LLMCall:
+    """
+    State of one generator call to the LLM, shared by the Instructor hooks.
+    """
+
+    generator: str
+    model: str
+    sampled: bool
+    attempts: int = 0
+    started: Optional[float] = None
+
+    def elapsed(self) -> Optional[float]:
+        """
+        Returns the seconds since the current attempt started, once.
+        """
+        if self.started is None:
+            return None
+        elapsed, self.started = time.perf_counter() - self.started, None
+        return elapsed
+
+
+_call: contextvars.ContextVar = contextvars.ContextVar("llm_call", default=None)
+
+
+def sample_payload() -> bool:
+    """
+    Decides whether the payloads of an LLM call are logged.
+    """
+    rate = getattr(settings, "OPENAI_LOG_SAMPLE_RATE", DEFAULT_LOG_SAMPLE_RATE)
+    return rate > 0 and random.random() < rate
+
+
+@contextmanager
+def llm_call(generator: str, model: str):
+    """
+    Labels the Instructor hook metrics of the enclosed LLM call.
+
+    Args:
+        generator (str): Name of the generator making the call (e.g., "summary").
+        model (str): Name of the OpenAI model called.
+    """
+    token = _call.set(LLMCall(generator, model, sampled=sample_payload()))
+    try:
+        yield
+    finally:
+        _call.reset(token)
+
+
+def current_call() -> LLMCall:
+    """
+    Returns the state of the running LLM call.
+
+    Requests made outside `llm_call` get a new unlabelled state per hook, so
+    they are counted, but their latency and reasks are not recorded.
+    """
+    call = _call.get()
+    if call is None:
+        return LLMCall("unknown", "unknown", sampled=sample_payload())
+    return call
+
+
+def record_request(**kwargs) -> None:
+    """
+    Starts timing an API request; later requests of the same call are reasks.
+    """
+    call = current_call()
+    if call.attempts:
+        LLM_RETRIES.labels(call.generator, call.model, "reask").inc()
+    call.attempts += 1
+    call.started = time.perf_counter()
+
+
+def record_response(response) -> None:
+    """
+    Records the latency and token usage of a successful API request.
+    """
+    call = current_call()
+    elapsed = call.elapsed()
+    if elapsed is not None:
+        LLM_LATENCY.labels(call.generator, call.model).observe(elapsed)
+    LLM_REQUESTS.labels(call.generator, call.model, "success").inc()
+
+    usage = getattr(response, "usage", None)
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens is not None:
+            LLM_TOKENS.labels(call.generator, call.model, kind).observe(tokens)
+
+
+def record_error(error, **kwargs) -> None:
+    """
+    Records a failed API request.
+    """
+    call = current_call()
+    elapsed = call.elapsed()
+    if elapsed is not None:
+        LLM_LATENCY.labels(call.generator, call.model).observe(elapsed)
+    LLM_REQUESTS.labels(call.generator, call.model, "error").inc()
+
+
+def record_parse_error(error, **kwargs) -> None:
+    """
+    Records a response that did not match the response model.
+    """
+    call = current_call()
+    LLM_PARSE_ERRORS.labels(call.generator, call.model).inc()
+
+
+def count_retry(generator: str, model: str):
+    """
+    Returns a tenacity `before_sleep` callback counting retried calls.
+    """
+
+    def before_sleep(retry_state) -> None:
+        LLM_RETRIES.labels(generator, model, "error").inc()
+
+    return before_sleep
@@ -0,0 +1,73 @@
+# apps/insights/services/openai/tokens.py
+import functools
+import logging
+from prometheus_client import Histogram
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken is an optional dependency
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Average characters per token, used to estimate counts without tiktoken
+CHARS_PER_TOKEN = 4
+
+# Encoding used for models tiktoken does not know
+DEFAULT_ENCODING = "o200k_base"
+
+# Exported through django-prometheus, by the Django Q workers on QCLUSTER_METRICS_PORT
+PROMPT_TOKENS = Histogram(
+    "insights_llm_prompt_tokens",
+    "Size of the prompts sent to the LLM, in tokens.",
+    ["prompt"],
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _encoding(model: str):
+    """
+    Returns the tiktoken encoding of a model.
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    Counts the tokens of a text for a model.
+
+    Uses tiktoken when it is installed, and otherwise estimates the count from
+    the text length.
+
+    Args:
+        text (str): The text to count.
+        model (str): Name of the OpenAI model the text is sent to.
+
+    Returns:
+        int: Number of tokens.
+    """
+    if tiktoken is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(_encoding(model).encode(text))
+
+
+def record_prompt_tokens(prompt_name: str, prompt: str, model: str) -> int:
+    """
+    Counts the tokens of a prompt, logs the count and exports it to Prometheus.
+
+    Args:
+        prompt_name (str): Name of the prompt template (e.g., "summary").
+        prompt (str): The formatted prompt.
+        model (str): Name of the OpenAI model the prompt is sent to.
+
+    Returns:
+        int: Number of tokens.
+    """
+    tokens = count_tokens(prompt, model)
+    PROMPT_TOKENS.labels(prompt_name).observe(tokens)
+    logger.info("The %s prompt has %d tokens.", prompt_name, tokens)
+    return tokens
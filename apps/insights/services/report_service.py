@@ -0,0 +1,111 @@
+# apps/insights/services/report_service.py
+"""
+Report Service for Fused Weekly Report Generation
+Generates the summaries of the current and previous weeks and their comparison with a single LLM request.
+
+The standard weekly chain makes three sequential LLM round trips: a summary of each week, then a comparison of the two summaries. Since the key metrics and their changes are computed locally, the comparison does not depend on the LLM summaries, so this service sends both weeks' statistical overviews and the key metric table in one structured-output request that returns all three parts. The results are saved with the existing `db_operations` functions in one transaction, so a report is stored completely or not at all. If either summary already exists, the service falls back to the standard path so that existing summaries are not regenerated.
+"""
+import logging
+from django.db import transaction
+from apps.insights.models.summary import Summary
+from apps.insights.services.comparison_service import (
+    compute_metric_deltas,
+    create_comparison,
+    format_metric_deltas,
+)
+from apps.insights.services.csv.data_overview import compact_overview
+from apps.insights.services.openai.report_generator import generate_weekly_report
+from apps.insights.services.summary_service import (
+    TRAFFIC_SOURCE,
+    adjust_start_date,
+    compute_key_metrics,
+    create_weekly_summaries,
+    get_statistical_overview,
+)
+from apps.insights.services.utils.db_operations import (
+    save_comparison_to_database,
+    save_summary_to_database,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def create_weekly_report(start_date: str) -> dict:
+    """
+    Generates and saves both weekly summaries and their comparison in one
+    LLM round trip.
+
+    Args:
+        start_date (str): Start date of the current week (YYYY-MM-DD).
+
+    Returns:
+        dict: 'summaries' (dataset_summary and key metrics by week start date)
+        and 'comparison_summary'.
+    """
+    logger.info("Starting weekly report creation: start_date=%s", start_date)
+    current_start_date = adjust_start_date(start_date, 1)
+    previous_start_date = adjust_start_date(start_date, 2)
+
+    if Summary.objects.filter(
+        start_date__in=[current_start_date, previous_start_date],
+        traffic_source=TRAFFIC_SOURCE,
+    ).exists():
+        logger.info(
+            "Summaries exist for the weeks of %s, creating the report step by step.",
+            start_date,
+        )
+        summaries = create_weekly_summaries(start_date)
+        create_comparison(start_date, TRAFFIC_SOURCE)
+        return {"summaries": summaries, "comparison_summary": None}
+
+    current_overview = get_statistical_overview(current_start_date, TRAFFIC_SOURCE)
+    previous_overview = get_statistical_overview(previous_start_date, TRAFFIC_SOURCE)
+    key_metrics = {
+        current_start_date: compute_key_metrics(current_overview),
+        previous_start_date: compute_key_metrics(previous_overview),
+    }
+    metric_deltas = compute_metric_deltas(
+        *(
+            {"key_metrics": [metric.model_dump() for metric in metrics]}
+            for metrics in key_metrics.values()
+        )
+    )
+
+    report = generate_weekly_report(
+        compact_overview(current_overview),
+        compact_overview(previous_overview),
+        format_metric_deltas(metric_deltas),
+    )
+
+    logger.info("Saving weekly report to database...")
+    with transaction.atomic():
+        summary1 = save_summary_to_database(
+            current_start_date,
+            report.current_week_summary,
+            key_metrics[current_start_date],
+            traffic_source=TRAFFIC_SOURCE,
+        )
+        summary2 = save_summary_to_database(
+            previous_start_date,
+            report.previous_week_summary,
+            key_metrics[previous_start_date],
+            traffic_source=TRAFFIC_SOURCE,
+        )
+        save_comparison_to_database(
+            summary1.id, summary2.id, report.comparison, metric_deltas
+        )
+
+    logger.info("Weekly report generation completed.")
+    return {
+        "summaries": {
+            current_start_date: {
+                "dataset_summary": report.current_week_summary.dataset_summary,
+                "key_metrics": key_metrics[current_start_date],
+            },
+            previous_start_date: {
+                "dataset_summary": report.previous_week_summary.dataset_summary,
+                "key_metrics": key_metrics[previous_start_date],
+            },
+        },
+        "comparison_summary": report.comparison.comparison_summary,
+    }
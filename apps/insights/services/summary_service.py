@@ -3,16 +3,34 @@
 Summary Service for Single-Week Data Processing
 Handles CSV data processing, summary generation, and key metric extraction for a single week.
 
-This service processes a single week's data from a CSV file, generating a summary and key metrics using OpenAI's LLM, and saving the results to both the database and a JSON file. It uses the CSVProcessor to load, validate, clean, and filter data based on the provided start date. A statistical overview is generated for the specified week, which is then summarized into a dataset summary and key metrics. The results are stored in the Summary and KeyMetric models and saved as JSON for debugging or visualization. Errors are logged at each step.
+This service processes a single week's data from a CSV file, generating a summary and key metrics using OpenAI's LLM, and saving the results to the database. It uses the CSVProcessor to load, validate, clean, and filter data based on the provided start date. A statistical overview is generated for the specified week and stored in the StatisticalOverview model for reuse, which is then summarized into a dataset summary and key metrics. Stored overviews are recomputed when the CSV data changes. The results are stored in the Summary and KeyMetric models. Errors are logged at each step.
 
 """
+import asyncio
+import contextvars
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+from django.conf import settings
 from django.core.exceptions import ValidationError
 import pandas as pd
 from apps.insights.models.summary import Summary
 from apps.insights.services.csv.csv_processor import CSVProcessor
-from apps.insights.services.openai.summary_generator import generate_summary
-from apps.insights.services.utils.db_operations import save_summary_to_database
+from apps.insights.services.csv.data_overview import (
+    compact_overview,
+    key_metric_values,
+)
+from apps.insights.services.openai.clients import close_async_clients
+from apps.insights.services.openai.schemas import KeyMetric
+from apps.insights.services.openai.summary_generator import (
+    generate_summary,
+    generate_summary_async,
+)
+from apps.insights.services.utils.db_operations import (
+    load_overview_from_database,
+    save_overview_to_database,
+    save_summary_to_database,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -20,10 +38,97 @@ logging.basicConfig(
 )
 
 
+# Traffic source the weekly summaries are generated for
+TRAFFIC_SOURCE = "organic"
+
+
+def adjust_start_date(start_date: str, week_number: int) -> str:
+    """
+    Returns the start date of the requested week, validating that it is not in
+    the future.
+
+    Args:
+        start_date (str): Start date of the current week (YYYY-MM-DD).
+        week_number (int): Week number to process (1 = current week, 2 = previous week).
+
+    Returns:
+        str: Start date of the requested week (YYYY-MM-DD).
+    """
+    start_date_dt = pd.to_datetime(start_date)
+    if week_number == 2:
+        start_date_dt -= pd.Timedelta(days=7)
+    adjusted_start_date_str = start_date_dt.strftime("%Y-%m-%d")
+
+    if start_date_dt > pd.Timestamp.now():
+        raise ValidationError(
+            f"Start date {adjusted_start_date_str} cannot be in the future."
+        )
+    return adjusted_start_date_str
+
+
+def get_statistical_overview(start_date: str, traffic_source: str) -> pd.DataFrame:
+    """
+    Returns the statistical overview of a week, reading the stored
+    StatisticalOverview rows when they were computed from the current data and
+    otherwise computing it from the CSV data and storing it.
+
+    Args:
+        start_date (str): Start date of the week (YYYY-MM-DD).
+        traffic_source (str): Traffic source to summarize.
+
+    Returns:
+        DataFrame: The structured overview (see `describe_overview`).
+    """
+    processor = CSVProcessor()
+    data_version = processor.data_version(start_date)
+    overview = load_overview_from_database(start_date, traffic_source, data_version)
+    if overview is not None:
+        logging.info("Using stored statistical overview for %s.", start_date)
+        return overview
+
+    # Process dataset
+    logging.info("Initializing and processing dataset...")
+    processor.load()
+    processor.validate()
+    processor.clean()
+    week_df = processor.filter(start_date, traffic_source)
+
+    if len(week_df) == 0:
+        raise ValidationError(
+            f"No data available for the specified week starting on {start_date}."
+        )
+
+    processor.df = week_df
+    overview = processor.describe_overview()
+    save_overview_to_database(start_date, traffic_source, overview, data_version)
+    return overview
+
+
+def compute_key_metrics(overview: pd.DataFrame) -> list[KeyMetric]:
+    """
+    Computes the key metrics of a summary from a week's statistical overview.
+
+    Args:
+        overview (DataFrame): The structured overview of the week.
+
+    Returns:
+        list[KeyMetric]: The key metrics in display order.
+    """
+    return [
+        KeyMetric(name=name, value=value)
+        for name, value in key_metric_values(overview).items()
+    ]
+
+
 def create_summary(start_date: str, week_number: int) -> dict:
     """
     Processes a single week's data and generates an LLM summary.
 
+    The week's statistical overview is stored in StatisticalOverview, so later
+    runs for the same week reuse it instead of recomputing it from the CSV file.
+    The key metrics are computed from the overview; the LLM only writes the
+    narrative.
+
     Args:
         start_date (str): Start date for the dataset (YYYY-MM-DD).
         week_number (int): Week number to process (1 = current week, 2 = previous week).
@@ -38,44 +143,29 @@ def create_summary(start_date: str, week_number: int) -> dict:
             week_number,
         )
 
-        # Adjust and validate start_date
-        start_date_dt = pd.to_datetime(start_date)
-        if week_number == 2:
-            start_date_dt -= pd.Timedelta(days=7)
-        adjusted_start_date_str = start_date_dt.strftime("%Y-%m-%d")
-
-        if start_date_dt > pd.Timestamp.now():
-            raise ValidationError(
-                f"Start date {adjusted_start_date_str} cannot be in the future."
-            )
+        adjusted_start_date_str = adjust_start_date(start_date, week_number)
 
-        if Summary.objects.filter(start_date=adjusted_start_date_str).exists():
+        if Summary.objects.filter(
+            start_date=adjusted_start_date_str, traffic_source=TRAFFIC_SOURCE
+        ).exists():
             raise ValidationError(
                 f"A summary for the start date {adjusted_start_date_str} already exists."
             )
 
-        # Initialize and process dataset
-        logging.info("Initializing and processing dataset...")
-        processor = CSVProcessor()
-        processor.load()
-        processor.validate()
-        processor.clean()
-        week_df = processor.filter(adjusted_start_date_str)
-
-        if week_df.empty:
-            raise ValidationError(
-                f"No data available for the specified week starting on {adjusted_start_date_str}."
-            )
-
-        # Generate overview and LLM summary
-        processor.df = week_df
-        statistical_summary = processor.generate_overview()
+        # Generate overview, key metrics and LLM summary
+        overview = get_statistical_overview(adjusted_start_date_str, TRAFFIC_SOURCE)
+        key_metrics = compute_key_metrics(overview)
         logging.info("Generating LLM summary...")
-        llm_summary = generate_summary(statistical_summary)
+        llm_summary = generate_summary(compact_overview(overview))
 
         # Save results to database
         logging.info("Saving summary to database...")
-        save_summary_to_database(adjusted_start_date_str, llm_summary)
+        save_summary_to_database(
+            adjusted_start_date_str,
+            llm_summary,
+            key_metrics,
+            traffic_source=TRAFFIC_SOURCE,
+        )
 
     except ValidationError as ve:
         logging.error("Validation error: %s", ve)
@@ -86,5 +176,220 @@ def create_summary(start_date: str, week_number: int) -> dict:
 
     return {
         "dataset_summary": llm_summary.dataset_summary,
-        "key_metrics": llm_summary.key_metrics,
+        "key_metrics": key_metrics,
     }
+
+
+async def _generate_summaries(overviews: dict[str, pd.DataFrame]) -> list:
+    """
+    Requests the summaries of several overviews concurrently.
+
+    Returns:
+        list: The SummaryOutput or the raised exception of each overview, in order.
+    """
+    try:
+        return await asyncio.gather(
+            *(
+                generate_summary_async(compact_overview(overview))
+                for overview in overviews.values()
+            ),
+            return_exceptions=True,
+        )
+    finally:
+        await close_async_clients()
+
+
+def create_weekly_summaries(start_date: str) -> dict:
+    """
+    Generates the current and previous week's summaries with concurrent LLM calls.
+
+    Both overviews are prepared first, then the two summaries are requested
+    together on an event loop, so the task takes about one LLM round trip
+    instead of two. Weeks that already have a summary are skipped, and a
+    summary that succeeds is saved even if the other fails.
+
+    Args:
+        start_date (str): Start date of the current week (YYYY-MM-DD).
+
+    Returns:
+        dict: dataset_summary and key metrics of each newly summarized week,
+        by week start date.
+    """
+    logging.info("Starting weekly summaries creation: start_date=%s", start_date)
+
+    overviews = {}
+    for week_number in (1, 2):
+        adjusted_start_date_str = adjust_start_date(start_date, week_number)
+        if Summary.objects.filter(
+            start_date=adjusted_start_date_str, traffic_source=TRAFFIC_SOURCE
+        ).exists():
+            logging.info(
+                "A summary for the start date %s already exists.",
+                adjusted_start_date_str,
+            )
+            continue
+        overviews[adjusted_start_date_str] = get_statistical_overview(
+            adjusted_start_date_str, TRAFFIC_SOURCE
+        )
+    if not overviews:
+        return {}
+
+    logging.info("Generating LLM summaries for %s...", ", ".join(overviews))
+    outcomes = asyncio.run(_generate_summaries(overviews))
+
+    # Results are saved outside the event loop, which Django's ORM requires
+    results = {}
+    failed_dates = []
+    for week_start_date, outcome in zip(overviews, outcomes):
+        if isinstance(outcome, BaseException):
+            logging.error("Failed to summarize week %s: %s", week_start_date, outcome)
+            failed_dates.append(week_start_date)
+            continue
+        key_metrics = compute_key_metrics(overviews[week_start_date])
+        save_summary_to_database(
+            week_start_date, outcome, key_metrics, traffic_source=TRAFFIC_SOURCE
+        )
+        results[week_start_date] = {
+            "dataset_summary": outcome.dataset_summary,
+            "key_metrics": key_metrics,
+        }
+
+    if failed_dates:
+        raise RuntimeError(
+            f"Failed to create summaries for weeks starting: {', '.join(failed_dates)}."
+        )
+    return results
+
+
+def get_source_overviews(
+    start_date: str, traffic_sources: Optional[Iterable[str]] = None
+) -> dict[str, pd.DataFrame]:
+    """
+    Returns the statistical overview of every traffic source in a week.
+
+    The CSV data is loaded and cleaned once and split by source with a single
+    groupby. Stored StatisticalOverview rows computed from the current data are
+    reused, and the CSV file is not read at all if every requested source
+    already has one.
+
+    Args:
+        start_date (str): Start date of the week (YYYY-MM-DD).
+        traffic_sources (Iterable[str]): Sources to include. Defaults to all
+            sources with data in the week.
+
+    Returns:
+        dict[str, DataFrame]: Structured overview of each traffic source.
+    """
+    traffic_sources = list(traffic_sources) if traffic_sources else None
+    processor = CSVProcessor()
+    data_version = processor.data_version(start_date)
+    overviews = {}
+    for source in traffic_sources or []:
+        stored = load_overview_from_database(start_date, source, data_version)
+        if stored is not None:
+            overviews[source] = stored
+    if traffic_sources and len(overviews) == len(traffic_sources):
+        logging.info("Using stored statistical overviews for %s.", start_date)
+        return overviews
+
+    logging.info("Initializing and processing dataset...")
+    processor.load()
+    processor.validate()
+    processor.clean()
+
+    for source, source_df in processor.split_sources(start_date).items():
+        if source in overviews or (traffic_sources and source not in traffic_sources):
+            continue
+        stored = load_overview_from_database(start_date, source, data_version)
+        if stored is None:
+            stored = processor.engine.describe_overview(source_df)
+            save_overview_to_database(start_date, source, stored, data_version)
+        overviews[source] = stored
+    return overviews
+
+
+def create_source_summaries(
+    start_date: str,
+    week_number: int,
+    traffic_sources: Optional[Iterable[str]] = None,
+) -> dict:
+    """
+    Generates an LLM summary for every traffic source of a week in one pass.
+
+    The overviews of all sources come from a single load of the dataset, and
+    the LLM requests for the sources without a summary are sent concurrently,
+    up to `OPENAI_MAX_CONCURRENCY` at a time. Summaries that succeed are saved
+    even if others fail, so a retry only requests the missing ones.
+
+    Args:
+        start_date (str): Start date for the dataset (YYYY-MM-DD).
+        week_number (int): Week number to process (1 = current week, 2 = previous week).
+        traffic_sources (Iterable[str]): Sources to summarize. Defaults to all
+            sources with data in the week.
+
+    Returns:
+        dict: dataset_summary and key metrics of each newly summarized source.
+    """
+    logging.info(
+        "Starting summary creation for all sources: start_date=%s, week_number=%s",
+        start_date,
+        week_number,
+    )
+    adjusted_start_date_str = adjust_start_date(start_date, week_number)
+
+    existing_sources = set(
+        Summary.objects.filter(start_date=adjusted_start_date_str).values_list(
+            "traffic_source", flat=True
+        )
+    )
+    pending = {
+        source: overview
+        for source, overview in get_source_overviews(
+            adjusted_start_date_str, traffic_sources
+        ).items()
+        if source not in existing_sources
+    }
+    if not pending:
+        logging.info(
+            "Summaries for all sources starting %s already exist.",
+            adjusted_start_date_str,
+        )
+        return {}
+
+    logging.info("Generating LLM summaries for %s...", ", ".join(pending))
+    max_workers = min(getattr(settings, "OPENAI_MAX_CONCURRENCY", 4), len(pending))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Each thread runs in a copy of this context to keep the rate limit priority
+        futures = {
+            source: executor.submit(
+                contextvars.copy_context().run,
+                generate_summary,
+                compact_overview(overview),
+            )
+            for source, overview in pending.items()
+        }
+
+    # Results are saved from this thread, which owns the database connection
+    results = {}
+    failed_sources = []
+    for source, future in futures.items():
+        try:
+            llm_summary = future.result()
+            key_metrics = compute_key_metrics(pending[source])
+            save_summary_to_database(
+                adjusted_start_date_str, llm_summary, key_metrics, traffic_source=source
+            )
+        except Exception as e:
+            logging.error("Failed to summarize traffic source '%s': %s", source, e)
+            failed_sources.append(source)
+            continue
+        results[source] = {
+            "dataset_summary": llm_summary.dataset_summary,
+            "key_metrics": key_metrics,
+        }
+
+    if failed_sources:
+        raise RuntimeError(
+            f"Failed to create summaries for traffic sources: {', '.join(failed_sources)}."
+        )
+    return results
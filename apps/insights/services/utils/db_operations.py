@@ -1,22 +1,39 @@
 # apps/insights/services/utils/db_operations.py
 import logging
+from typing import List, Optional
+import pandas as pd
 from django.core.exceptions import ValidationError
 from django.db import transaction, IntegrityError
 from apps.insights.models.summary import Summary, KeyMetric
+from apps.insights.models.statistical_overview import StatisticalOverview
+from apps.insights.services.csv.data_overview import (
+    OVERVIEW_FIELDS,
+    overview_from_records,
+    overview_to_records,
+)
+from apps.insights.services.openai.schemas import KeyMetric as KeyMetricOutput
 from apps.insights.services.openai.schemas import SummaryOutput
 from apps.insights.models.comparison import Comparison, KeyMetricComparison
-from apps.insights.services.openai.schemas import ComparisonOutput
+from apps.insights.services.openai.schemas import ComparisonOutput, KeyMetricDelta
 
 logger = logging.getLogger(__name__)
 
 
-def save_summary_to_database(start_date: str, llm_summary: SummaryOutput):
+def save_summary_to_database(
+    start_date: str,
+    llm_summary: SummaryOutput,
+    key_metrics: List[KeyMetricOutput],
+    traffic_source: str = "organic",
+):
     """
-    Saves the structured summary result and its key metrics to the database.
+    Saves the LLM summary narrative together with the locally computed key
+    metrics to the database.
 
     Args:
         start_date (str): Start date for the summary (YYYY-MM-DD).
         llm_summary (SummaryOutput): The structured summary result.
+        key_metrics (List[KeyMetricOutput]): Key metrics computed from the data.
+        traffic_source (str): Traffic source the summary was generated for.
 
     Returns:
         Summary: The created Summary object.
@@ -26,9 +43,9 @@ def save_summary_to_database(start_date: str, llm_summary: SummaryOutput):
         if not llm_summary.dataset_summary:
             logger.error("Dataset summary is missing in the LLM output.")
             raise ValidationError("Dataset summary is missing in the LLM output.")
-        if not llm_summary.key_metrics:
-            logger.error("Key metrics are missing in the LLM output.")
-            raise ValidationError("Key metrics are missing in the LLM output.")
+        if not key_metrics:
+            logger.error("Key metrics are missing for the summary.")
+            raise ValidationError("Key metrics are missing for the summary.")
 
         with transaction.atomic():
             logger.info(
@@ -40,6 +57,7 @@ def save_summary_to_database(start_date: str, llm_summary: SummaryOutput):
                 summary = Summary.objects.create(
                     start_date=start_date,
                     dataset_summary=llm_summary.dataset_summary,
+                    traffic_source=traffic_source,
                 )
                 logger.info(f"Summary created with ID: {summary.id}")
             except IntegrityError as ie:
@@ -51,7 +69,7 @@ def save_summary_to_database(start_date: str, llm_summary: SummaryOutput):
                 ) from ie
 
             # Create KeyMetric objects
-            for metric in llm_summary.key_metrics:
+            for metric in key_metrics:
                 try:
                     KeyMetric.objects.create(
                         summary=summary,
@@ -70,7 +88,7 @@ def save_summary_to_database(start_date: str, llm_summary: SummaryOutput):
                     ) from ie
 
             logger.info(
-                f"Saved summary for start_date={start_date} with {len(llm_summary.key_metrics)} key metrics."
+                f"Saved summary for start_date={start_date} with {len(key_metrics)} key metrics."
             )
             return summary
 
@@ -88,15 +106,20 @@ def save_summary_to_database(start_date: str, llm_summary: SummaryOutput):
 
 
 def save_comparison_to_database(
-    summary1_id: int, summary2_id: int, comparison_result: ComparisonOutput
+    summary1_id: int,
+    summary2_id: int,
+    comparison_result: ComparisonOutput,
+    metric_deltas: List[KeyMetricDelta],
 ):
     """
-    Saves the LLM comparison result to the database.
+    Saves the LLM comparison result together with the locally computed key
+    metric values to the database.
 
     Args:
         summary1_id (int): ID of the first summary (Week 1).
         summary2_id (int): ID of the second summary (Week 2).
         comparison_result (ComparisonOutput): The structured comparison result from LLM.
+        metric_deltas (List[KeyMetricDelta]): Key metric values of both weeks.
 
     Returns:
         Comparison: The created Comparison object.
@@ -106,11 +129,16 @@ def save_comparison_to_database(
         if not comparison_result.comparison_summary:
             logger.error("Comparison summary is missing in the LLM output.")
             raise ValidationError("Comparison summary is missing in the LLM output.")
-        if not comparison_result.key_metrics_comparison:
-            logger.error("Key metrics comparison is missing in the LLM output.")
-            raise ValidationError(
-                "Key metrics comparison is missing in the LLM output."
-            )
+        if not metric_deltas:
+            logger.error("Key metric values are missing for the comparison.")
+            raise ValidationError("Key metric values are missing for the comparison.")
+        descriptions = {
+            metric.name: metric.description
+            for metric in comparison_result.key_metrics_comparison
+        }
+        missing = [m.name for m in metric_deltas if m.name not in descriptions]
+        if missing:
+            logger.warning(f"No LLM description for key metrics: {', '.join(missing)}")
 
         with transaction.atomic():
             logger.info(
@@ -154,14 +182,14 @@ def save_comparison_to_database(
                 ) from ie
 
             # Create KeyMetricComparison objects
-            for metric in comparison_result.key_metrics_comparison:
+            for metric in metric_deltas:
                 try:
                     KeyMetricComparison.objects.create(
                         comparison=comparison,
                         name=metric.name,
                         value1=metric.value1,
                         value2=metric.value2,
-                        description=metric.description,
+                        description=descriptions.get(metric.name),
                     )
                     logger.info(
                         f"KeyMetricComparison created for metric {metric.name}."
@@ -190,3 +218,90 @@ def save_comparison_to_database(
     except Exception as e:
         logger.error(f"Unexpected error while saving comparison: {e}")
         raise RuntimeError("Failed to save comparison and key metrics.") from e
+
+
+def save_overview_to_database(
+    start_date: str, source: str, overview: pd.DataFrame, data_version: str = ""
+) -> list[StatisticalOverview]:
+    """
+    Saves a structured statistical overview with one StatisticalOverview row per
+    column, using a single bulk insert. Rows already stored for the same week,
+    source and column are updated in place.
+
+    Args:
+        start_date (str): Start date of the week (YYYY-MM-DD).
+        source (str): Traffic source the overview was computed for.
+        overview (pd.DataFrame): Overview from `CSVProcessor.describe_overview`.
+        data_version (str): Digest of the data the overview was computed from,
+            from `CSVProcessor.data_version`.
+
+    Returns:
+        list[StatisticalOverview]: The saved rows.
+    """
+    if overview.empty:
+        logger.error("Statistical overview is empty.")
+        raise ValidationError("Statistical overview is empty.")
+
+    try:
+        with transaction.atomic():
+            overviews = StatisticalOverview.objects.bulk_create(
+                [
+                    StatisticalOverview(
+                        start_date=start_date,
+                        source=source,
+                        data_version=data_version,
+                        **record,
+                    )
+                    for record in overview_to_records(overview)
+                ],
+                update_conflicts=True,
+                unique_fields=["start_date", "source", "column_name"],
+                update_fields=[*OVERVIEW_FIELDS.values(), "data_version"],
+            )
+        logger.info(
+            f"Saved statistical overview for start_date={start_date}, source={source} "
+            f"with {len(overviews)} columns."
+        )
+        return overviews
+    except IntegrityError as ie:
+        logger.error(f"Database integrity error while saving overview: {ie}")
+        raise ValidationError(
+            "A database integrity error occurred while saving the overview."
+        ) from ie
+
+
+def load_overview_from_database(
+    start_date: str, source: str, data_version: Optional[str] = None
+) -> Optional[pd.DataFrame]:
+    """
+    Loads a stored statistical overview for a week and traffic source.
+
+    Args:
+        start_date (str): Start date of the week (YYYY-MM-DD).
+        source (str): Traffic source of the overview.
+        data_version (str): Digest of the current data, from
+            `CSVProcessor.data_version`. An overview computed from another
+            version is stale and not returned. None skips the check.
+
+    Returns:
+        Optional[pd.DataFrame]: The structured overview, or None if none is
+        stored or it is stale.
+    """
+    records = list(
+        StatisticalOverview.objects.filter(start_date=start_date, source=source)
+        .order_by("id")
+        .values("column_name", "data_version", *OVERVIEW_FIELDS.values())
+    )
+    if not records:
+        return None
+    versions = {record.pop("data_version") for record in records}
+    if data_version is not None and versions != {data_version}:
+        logger.info(
+            f"Stored statistical overview for start_date={start_date}, source={source} "
+            "is stale."
+        )
+        return None
+    logger.info(
+        f"Loaded stored statistical overview for start_date={start_date}, source={source}."
+    )
+    return overview_from_records(records)
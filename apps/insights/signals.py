@@ -1,6 +1,9 @@
 # apps/insights/signals.py
+from django.conf import settings
 from django.dispatch import receiver
-from django_q.signals import post_execute
+from django_prometheus.exports import SetupPrometheusEndpointOnPortRange
+from django_q.conf import Conf
+from django_q.signals import post_execute, post_spawn
 from django_q.models import Task
 from apps.insights.models.task_record import TaskRecord
 from apps.insights.models.summary import Summary  # Import as needed
@@ -50,3 +53,20 @@ def handle_post_execute(sender, task, **kwargs):
         logger.exception(
             f"Error handling post_execute signal for Task ID {task.get('id')}: {e}"
         )
+
+
+@receiver(post_spawn)
+def export_worker_metrics(sender, proc_name, **kwargs):
+    """
+    Exports the Prometheus metrics of a Django Q worker, where the LLM calls
+    run, on the first free port of QCLUSTER_METRICS_PORT and the ports after
+    it, one per worker. A recycled worker takes over the port of the worker
+    it replaces.
+    """
+    port = getattr(settings, "QCLUSTER_METRICS_PORT", None)
+    if not port:
+        return
+    ports = range(port, port + Conf.WORKERS)
+    exported_port = SetupPrometheusEndpointOnPortRange(ports)
+    if exported_port:
+        logger.info(f"Worker {proc_name} exports its metrics on port {exported_port}")
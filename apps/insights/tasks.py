@@ -1,8 +1,18 @@
 from datetime import datetime, date, timedelta
 from django.conf import settings
-from django.utils.timezone import now  # Correct import for timezone.now
+from django.utils.timezone import is_aware, localdate, now  # Correct import for timezone.now
+from django.utils.module_loading import import_string
 from django_q.tasks import schedule, Chain, async_task
 import logging
+from apps.insights.services.csv.csv_processor import CSVProcessor
+from apps.insights.services.csv.dataset_store import DATASET_PATH
+from apps.insights.services.openai.clients import get_task_timeout
+from apps.insights.services.openai.rate_limit import (
+    PRIORITY_ADHOC,
+    PRIORITY_SCHEDULED,
+    priority as rate_limit_priority,
+    task_deadline,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -11,14 +21,19 @@ def schedule_weekly_summary_task():
     """
     Schedules the weekly task to trigger the schedule_summary_chain
     every Monday at 00:00.
+
+    The start date is not stored with the schedule, as it would stay fixed at
+    the day the schedule was created. Django Q passes each run's date as
+    `run_date` instead, from which the chain works out the week to summarize.
     """
     try:
         schedule(
             "apps.insights.tasks.schedule_summary_chain",
-            args=[now().date()],
+            priority=PRIORITY_SCHEDULED,
             name="weekly_summary_chain",
             schedule_type="C",
             cron="0 0 * * 1",  # Every Monday at 00:00
+            intended_date_kwarg="run_date",
         )
         logger.info("Scheduled weekly summary task successfully.")
     except Exception as e:
@@ -30,13 +45,35 @@ def schedule_weekly_summary_task():
         )
 
 
-def schedule_summary_chain(start_date):
+def weekly_start_date(run_date=None):
+    """
+    Returns the start date (Monday) of the last full week before `run_date`,
+    an ISO date or datetime string defaulting to today.
+    """
+    if run_date is None:
+        day = localdate()
+    else:
+        run_at = datetime.fromisoformat(run_date)
+        day = localdate(run_at) if is_aware(run_at) else run_at.date()
+    return day - timedelta(days=day.weekday() + 7)
+
+
+def schedule_summary_chain(
+    start_date=None, all_sources=False, priority=PRIORITY_ADHOC, run_date=None
+):
     """
     Wrapper function to schedule the summary chain after a delay.
 
     Schedules the `schedule_summary_tasks` function to run
     after a predefined delay with `start_date`, with retry logic and error logging.
+    Without `start_date`, the last full week before `run_date` is summarized.
+    With `all_sources`, every traffic source is summarized and compared.
+    `priority` is the rate limit priority class of the LLM requests: the weekly
+    schedule runs as scheduled work, and runs from the admin as ad-hoc work.
     """
+    if start_date is None:
+        start_date = weekly_start_date(run_date)
+
     time_delay = getattr(settings, "SUMMARY_TASK_TIME_DELAY", 60)
 
     logger.info(
@@ -54,6 +91,8 @@ def schedule_summary_chain(start_date):
         schedule(
             "apps.insights.tasks.schedule_summary_tasks",  # Function path
             start_date_str,  # Positional argument as string
+            all_sources,
+            priority,
             name="summary_task_chain",  # Task name for identification
             schedule_type="O",  # 'O' stands for Once
             next_run=now()
@@ -71,14 +110,50 @@ def schedule_summary_chain(start_date):
         logger.info("Retrying scheduling of summary chain.")
         async_task(
             "apps.insights.tasks.schedule_summary_chain",
-            start_date,  # Retry with the same argument
+            start_date_str,  # Retry with the same arguments
+            all_sources,
+            priority,
             q_options={"retry": 3, "retry_delay": 300},  # Retry 3 times with 5 min gaps
         )
 
 
-def schedule_summary_tasks(start_date):
+def refresh_dataset(dataset_path=None):
+    """
+    Re-ingests the CSV file into the partitioned dataset, so the summaries
+    read the rows added to it since the last ingest. Does nothing when no
+    dataset path is configured.
+    """
+    dataset_path = dataset_path or DATASET_PATH
+    if not dataset_path:
+        logger.info("No dataset path configured, skipping dataset refresh.")
+        return 0
+    written = CSVProcessor(dataset_path=dataset_path).ingest()
+    logger.info("Refreshed %d dataset partitions at %s.", written, dataset_path)
+    return written
+
+
+def run_with_priority(priority, func_path, *args):
+    """
+    Runs a chained task function under a rate limit priority class, as the
+    priority of the scheduling process does not carry over to the worker.
+    Its OpenAI calls are bounded by the Django Q task timeout.
+    """
+    with rate_limit_priority(priority), task_deadline(get_task_timeout()):
+        return import_string(func_path)(*args)
+
+
+def schedule_summary_tasks(start_date, all_sources=False, priority=PRIORITY_ADHOC):
     """
-    Runs sequential tasks to process summaries for Week 1, Week 2, and a Week Over Week Comparison.
+    Runs sequential tasks to process summaries for Week 1 and Week 2, requested
+    concurrently in one task, and a Week Over Week Comparison.
+
+    With a partitioned dataset configured, the chain first re-ingests the CSV
+    file into it. With `all_sources`, each task covers every traffic source:
+    the data is loaded once per week and the per-source LLM summaries run
+    concurrently.
+    With the `WEEKLY_REPORT_FUSED` setting, the summaries and the comparison
+    are generated by a single task in one LLM request. Each task runs under
+    the rate limit `priority` class.
     """
     # Convert start_date to string #
     start_date_str = (
@@ -90,31 +165,73 @@ def schedule_summary_tasks(start_date):
     # Create a task chain
     chain = Chain()
 
-    # Append Task 1: Generate current week summary
-    chain.append(
-        "apps.insights.services.summary_service.create_summary",
-        start_date_str,
-        1,
-        q_options={"task_name": "current_week_summary"},
-    )
-    logger.info("Added Task 1 to chain: Generate Current Week Summary.")
+    # Refresh the partitioned dataset first, as the summaries read it instead
+    # of the CSV file when it is configured
+    if DATASET_PATH:
+        chain.append(
+            "apps.insights.tasks.refresh_dataset",
+            q_options={"task_name": "refresh_dataset"},
+        )
+
+    if all_sources:
+        chain.append(
+            "apps.insights.tasks.run_with_priority",
+            priority,
+            "apps.insights.services.summary_service.create_source_summaries",
+            start_date_str,
+            1,
+            q_options={"task_name": "current_week_source_summaries"},
+        )
+        chain.append(
+            "apps.insights.tasks.run_with_priority",
+            priority,
+            "apps.insights.services.summary_service.create_source_summaries",
+            start_date_str,
+            2,
+            q_options={"task_name": "past_week_source_summaries"},
+        )
+        chain.append(
+            "apps.insights.tasks.run_with_priority",
+            priority,
+            "apps.insights.services.comparison_service.create_source_comparisons",
+            start_date_str,
+            q_options={"task_name": "week_over_week_source_comparisons"},
+        )
+        chain.run()
+        logger.info(f"Ran all-sources summary chain for start date {start_date_str}.")
+        return
+
+    if getattr(settings, "WEEKLY_REPORT_FUSED", False):
+        chain.append(
+            "apps.insights.tasks.run_with_priority",
+            priority,
+            "apps.insights.services.report_service.create_weekly_report",
+            start_date_str,
+            q_options={"task_name": "weekly_report"},
+        )
+        chain.run()
+        logger.info(f"Ran fused weekly report for start date {start_date_str}.")
+        return
 
-    # Append Task 2: Generate past week summary
+    # Append Task 1: Generate current and past week summaries concurrently
     chain.append(
-        "apps.insights.services.summary_service.create_summary",
+        "apps.insights.tasks.run_with_priority",
+        priority,
+        "apps.insights.services.summary_service.create_weekly_summaries",
         start_date_str,
-        2,
-        q_options={"task_name": "past_week_summary"},
+        q_options={"task_name": "weekly_summaries"},
     )
-    logger.info("Added Task 2 to chain: Generate Past Week Summary.")
+    logger.info("Added Task 1 to chain: Generate Current and Past Week Summaries.")
 
-    # Append Task 3: Generate comparison of current and past weeks summaries
+    # Append Task 2: Generate comparison of current and past weeks summaries
     chain.append(
+        "apps.insights.tasks.run_with_priority",
+        priority,
         "apps.insights.services.comparison_service.create_comparison",
         start_date_str,
         q_options={"task_name": "week_over_week_comparison"},
     )
-    logger.info("Added Task 3 to chain: Generate Week Over Week Comparison.")
+    logger.info("Added Task 2 to chain: Generate Week Over Week Comparison.")
 
     # Run the task chain
     chain.run()
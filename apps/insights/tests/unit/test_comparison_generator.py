@@ -53,9 +53,13 @@ def test_generate_comparison():
     - Average Revenue: 2087.17
     """
 
+    metric_deltas = """metric,this_week,previous_week,change_pct
+    Average Sessions,1543,1683,-8.3
+    Average Revenue,1623,2087,-22.3"""
+
     try:
         # Call the generator
-        result = generate_comparison(summary1, summary2)
+        result = generate_comparison(summary1, summary2, metric_deltas)
 
         # Verify the output type
         assert isinstance(
@@ -67,12 +71,7 @@ def test_generate_comparison():
         print(result.comparison_summary)
         print("\nKey Metrics Comparison:")
         for metric in result.key_metrics_comparison:
-            print(
-                f"{metric.name}: "
-                f"Week 1 Value = {metric.value1}, "
-                f"Week 2 Value = {metric.value2} "
-                f"({metric.description})"
-            )
+            print(f"{metric.name}: {metric.description}")
 
         print("Test completed successfully.")
 
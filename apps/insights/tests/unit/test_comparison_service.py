@@ -0,0 +1,119 @@
+# tests/unit/test_comparison_service.py
+import pytest
+from apps.insights.models.comparison import Comparison, KeyMetricComparison
+from apps.insights.models.summary import KeyMetric, Summary
+from apps.insights.services import comparison_service
+from apps.insights.services.comparison_service import (
+    comparison_prompt_fields,
+    compute_metric_deltas,
+    format_metric_deltas,
+)
+from apps.insights.services.openai.schemas import ComparisonOutput
+
+
+@pytest.fixture
+def data_summaries():
+    """Fixture providing current and past week summaries with key metrics."""
+    return (
+        {
+            "dataset_summary": "This week.",
+            "key_metrics": [
+                {"name": "Average Revenue", "value": 1622.53},
+                {"name": "Average Sessions", "value": 1543.43},
+                {"name": "Bounce Rate", "value": 0.0},
+            ],
+        },
+        {
+            "dataset_summary": "Last week.",
+            "key_metrics": [
+                {"name": "Average Sessions", "value": 1682.57},
+                {"name": "Average Revenue", "value": 2087.17},
+                {"name": "Bounce Rate", "value": 0.16},
+                {"name": "Conversion Rate", "value": 0.04},
+            ],
+        },
+    )
+
+
+def test_metric_deltas_use_stored_values(data_summaries):
+    """Test that shared metrics are paired in display order with their change."""
+    deltas = compute_metric_deltas(*data_summaries)
+
+    assert [delta.name for delta in deltas] == [
+        "Average Sessions",
+        "Bounce Rate",
+        "Average Revenue",
+    ]
+    assert (deltas[0].value1, deltas[0].value2) == (1543.43, 1682.57)
+    assert deltas[0].percentage_difference == pytest.approx(-8.2695, abs=1e-4)
+    assert deltas[1].percentage_difference == -100
+
+
+@pytest.mark.parametrize(
+    "value1, value2, expected",
+    [(0.0, 0.16, -100.0), (15.0, 10.0, 50.0), (5.0, 0.0, None), (0.0, 0.0, None)],
+)
+def test_percentage_difference(value1, value2, expected):
+    """Test that only a zero past value leaves the change undefined."""
+    assert (
+        KeyMetricComparison.compute_percentage_difference(value1, value2) == expected
+    )
+
+
+def test_format_metric_deltas_is_compact_csv(data_summaries):
+    """Test the table of key metric changes sent to the LLM."""
+    table = format_metric_deltas(compute_metric_deltas(*data_summaries))
+
+    assert table.splitlines() == [
+        "metric,this_week,previous_week,change_pct",
+        "Average Sessions,1543,1683,-8.3",
+        "Bounce Rate,0,0.16,-100.0",
+        "Average Revenue,1623,2087,-22.3",
+    ]
+
+
+def test_prompt_fields_require_key_metrics(data_summaries):
+    """Test that summaries without key metrics can not be compared."""
+    fields = comparison_prompt_fields(*data_summaries)
+    assert fields["summary1"] == "This week."
+
+    with pytest.raises(ValueError, match="key_metrics"):
+        comparison_prompt_fields({"dataset_summary": "x"}, data_summaries[1])
+
+
+@pytest.mark.django_db
+def test_create_comparison_computes_deltas_once(data_summaries, monkeypatch):
+    """Test that the deltas sent to the LLM are the ones saved."""
+    for start_date, data_summary in zip(("2024-01-15", "2024-01-08"), data_summaries):
+        summary = Summary.objects.create(
+            start_date=start_date,
+            dataset_summary=data_summary["dataset_summary"],
+            traffic_source="organic",
+        )
+        for metric in data_summary["key_metrics"]:
+            KeyMetric.objects.create(summary=summary, **metric)
+
+    computed = []
+    monkeypatch.setattr(
+        comparison_service,
+        "compute_metric_deltas",
+        lambda *args: computed.append(args) or compute_metric_deltas(*args),
+    )
+    prompts = []
+    monkeypatch.setattr(
+        comparison_service,
+        "generate_comparison",
+        lambda **fields: prompts.append(fields)
+        or ComparisonOutput(
+            comparison_summary="Fewer sessions.",
+            key_metrics_comparison=[],
+            chain_of_thought="Compared the tables.",
+        ),
+    )
+
+    comparison_service.create_comparison("2024-01-15")
+
+    assert len(computed) == 1
+    comparison = Comparison.objects.get()
+    assert comparison.key_metrics_comparison.count() == 3
+    assert "Bounce Rate,0,0.16,-100.0" in prompts[0]["metric_deltas"]
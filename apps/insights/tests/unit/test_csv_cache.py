@@ -0,0 +1,73 @@
+# tests/unit/test_csv_cache.py
+import os
+import pandas as pd
+import pytest
+from apps.insights.services.csv import csv_cache
+from apps.insights.services.csv.csv_reader import read_csv
+
+pytest.importorskip("pyarrow")
+
+CSV_CONTENT = "date,source,sessions\n2024-01-01,organic,10\n2024-01-02,organic,20\n"
+
+
+@pytest.fixture
+def tmp_csv_file(tmp_path):
+    """Fixture to create a temporary CSV file."""
+    file_path = tmp_path / "data.csv"
+    file_path.write_text(CSV_CONTENT)
+    return file_path
+
+
+def test_first_load_writes_sidecar_cache(tmp_csv_file):
+    """Test that the first load writes the Feather copy and its metadata."""
+    df = read_csv(file_path=str(tmp_csv_file))
+    data_path, meta_path = csv_cache.cache_paths(tmp_csv_file, {})
+    assert data_path.exists()
+    assert meta_path.exists()
+    assert len(df) == 2
+
+
+def test_second_load_skips_text_parsing(tmp_csv_file, monkeypatch):
+    """Test that a fresh cache is read without calling `pd.read_csv`."""
+    expected = read_csv(file_path=str(tmp_csv_file))
+
+    def fail_read_csv(*args, **kwargs):
+        raise AssertionError("CSV should have been served from the cache")
+
+    monkeypatch.setattr(pd, "read_csv", fail_read_csv)
+    df = read_csv(file_path=str(tmp_csv_file))
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_touched_file_keeps_cache(tmp_csv_file, monkeypatch):
+    """Test that a new mtime with unchanged contents still hits the cache."""
+    read_csv(file_path=str(tmp_csv_file))
+    stat = tmp_csv_file.stat()
+    os.utime(tmp_csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    monkeypatch.setattr(pd, "read_csv", None)
+    assert len(read_csv(file_path=str(tmp_csv_file))) == 2
+
+
+def test_changed_file_rebuilds_cache(tmp_csv_file):
+    """Test that a modified file is re-parsed and the cache is rebuilt."""
+    read_csv(file_path=str(tmp_csv_file))
+    tmp_csv_file.write_text(CSV_CONTENT + "2024-01-03,organic,30\n")
+
+    df = read_csv(file_path=str(tmp_csv_file))
+    assert len(df) == 3
+    assert len(csv_cache.load_cached_frame(tmp_csv_file, {})) == 3
+
+
+def test_different_options_do_not_share_cache(tmp_csv_file):
+    """Test that frames parsed with different options are cached separately."""
+    read_csv(file_path=str(tmp_csv_file))
+    df = read_csv(file_path=str(tmp_csv_file), nrows=1)
+    assert len(df) == 1
+
+    # Both reads keep their own sidecar
+    assert csv_cache.cache_paths(tmp_csv_file, {}) != csv_cache.cache_paths(
+        tmp_csv_file, {"nrows": 1}
+    )
+    assert len(csv_cache.load_cached_frame(tmp_csv_file, {})) == 2
+    assert len(csv_cache.load_cached_frame(tmp_csv_file, {"nrows": 1})) == 1
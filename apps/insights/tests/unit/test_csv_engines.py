@@ -0,0 +1,39 @@
+# tests/unit/test_csv_engines.py
+import pytest
+from apps.insights.services.csv.csv_processor import CSVProcessor, get_engine
+
+pytest.importorskip("polars")
+
+CSV_FILE_PATH = "./apps/insights/data/ga4_data.csv"
+
+
+def run_pipeline(engine: str, start_date: str, traffic_source: str) -> str:
+    """Runs the full CSVProcessor pipeline and returns the overview string."""
+    processor = CSVProcessor(file_path=CSV_FILE_PATH, use_cache=False, engine=engine)
+    processor.load()
+    processor.validate()
+    processor.clean()
+    processor.df = processor.filter(start_date, traffic_source)
+    return processor.generate_overview()
+
+
+@pytest.mark.parametrize("traffic_source", ["organic", "email", "direct"])
+@pytest.mark.parametrize("start_date", ["2024-01-01", "2024-01-15"])
+def test_overview_identical_across_engines(start_date, traffic_source):
+    """Test that the Polars engine produces exactly the Pandas overview."""
+    pandas_overview = run_pipeline("pandas", start_date, traffic_source)
+    polars_overview = run_pipeline("polars", start_date, traffic_source)
+    assert polars_overview == pandas_overview
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+def test_unknown_traffic_source(engine):
+    """Test that both engines raise the same error for an unknown source."""
+    with pytest.raises(ValueError, match="No data found for traffic source"):
+        run_pipeline(engine, "2024-01-01", "unknown")
+
+
+def test_unknown_engine():
+    """Test ValueError for an unsupported engine name."""
+    with pytest.raises(ValueError):
+        get_engine("spark")
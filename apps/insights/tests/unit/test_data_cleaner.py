@@ -0,0 +1,40 @@
+# tests/unit/test_data_cleaner.py
+import pandas as pd
+import pytest
+from apps.insights.services.csv.data_cleaner import (
+    DataCleaningError,
+    clean_data_with_report,
+)
+
+
+def test_clean_data_report_for_valid_dates():
+    """Test that valid dates are parsed once and reported as clean."""
+    df = pd.DataFrame({"date": ["2024-01-01", "2024-01-02"], "sessions": [1, 2]})
+    cleaned_df, report = clean_data_with_report(df)
+
+    assert str(cleaned_df["date"].dtype) == "datetime64[ns]"
+    assert report.date_column == "date"
+    assert report.total_rows == 2
+    assert report.invalid_date_count == 0
+    assert report.invalid_date_positions == []
+
+
+def test_clean_data_reports_invalid_positions():
+    """Test that invalid dates raise an error carrying their positions."""
+    df = pd.DataFrame(
+        {"date": ["2024-01-01", "not a date", "2024-01-03", ""], "sessions": [1, 2, 3, 4]}
+    )
+    with pytest.raises(DataCleaningError) as exc_info:
+        clean_data_with_report(df)
+
+    assert isinstance(exc_info.value, ValueError)
+    assert exc_info.value.report.invalid_date_count == 2
+    assert exc_info.value.report.invalid_date_positions == [1, 3]
+
+
+def test_clean_data_accepts_parsed_dates():
+    """Test that a date column parsed at read time is only validated."""
+    df = pd.DataFrame({"date": pd.to_datetime(["2024-01-01", None])})
+    with pytest.raises(DataCleaningError) as exc_info:
+        clean_data_with_report(df)
+    assert exc_info.value.report.invalid_date_positions == [1]
@@ -0,0 +1,158 @@
+# tests/unit/test_data_filter.py
+import pandas as pd
+import pytest
+from apps.insights.services.csv import data_filter
+from apps.insights.services.csv.pandas import engine as pandas_engine
+from apps.insights.services.csv.csv_processor import CSVProcessor
+from apps.insights.services.csv.data_filter import filter_data, is_sorted_for_lookup
+
+HEADER = (
+    "date,source,sessions,users,new_users,pageviews,pages_per_session,"
+    "avg_session_duration,bounce_rate,conversion_rate,transactions,revenue\n"
+)
+
+
+@pytest.fixture
+def tmp_csv_file(tmp_path):
+    """Fixture to create a temporary GA4-style CSV file covering three weeks."""
+    rows = [
+        f"{day.date()},{source},{i},{i},{i},{i},1.5,60.0,0.5,0.01,{i},{i}.5\n"
+        for i, (day, source) in enumerate(
+            (day, source)
+            for day in pd.date_range("2024-01-01", periods=21)
+            for source in ("direct", "organic", "email")
+        )
+    ]
+    file_path = tmp_path / "ga4.csv"
+    file_path.write_text(HEADER + "".join(rows))
+    return file_path
+
+
+def test_stream_filter_matches_filter(tmp_csv_file):
+    """Test that the chunked reader returns the same frame as `filter`."""
+    processor = CSVProcessor(file_path=str(tmp_csv_file), use_cache=False)
+    processor.load()
+    processor.validate()
+    processor.clean()
+    # The in-memory frame stores `source` as a categorical for sorted lookups
+    expected = processor.filter("2024-01-08").astype({"source": object})
+
+    streamed = CSVProcessor(file_path=str(tmp_csv_file)).stream_filter(
+        "2024-01-08", chunksize=10
+    )
+    pd.testing.assert_frame_equal(streamed.astype({"source": object}), expected)
+    assert len(streamed) == 7
+
+
+def test_stream_filter_unknown_source(tmp_csv_file):
+    """Test ValueError when the traffic source never occurs."""
+    with pytest.raises(ValueError, match="traffic source"):
+        CSVProcessor(file_path=str(tmp_csv_file)).stream_filter(
+            "2024-01-08", traffic_source="paid_search", chunksize=10
+        )
+
+
+def test_stream_filter_empty_week(tmp_csv_file):
+    """Test ValueError when no rows fall in the requested week."""
+    with pytest.raises(ValueError, match="7-day period"):
+        CSVProcessor(file_path=str(tmp_csv_file)).stream_filter(
+            "2025-01-01", chunksize=10
+        )
+
+
+def test_sorted_lookup_matches_mask_filter(tmp_csv_file):
+    """Test that binary-search slicing returns the rows the boolean masks select."""
+    processor = CSVProcessor(file_path=str(tmp_csv_file), use_cache=False)
+    processor.load()
+    processor.validate()
+    processor.clean()
+    assert is_sorted_for_lookup(processor.df)
+
+    unsorted_df = processor.df.astype({"source": object}).sort_index()
+    for start_date in ("2023-12-30", "2024-01-01", "2024-01-05", "2024-01-17"):
+        for source in ("direct", "email", "organic"):
+            sliced = filter_data(
+                processor.df, pd.Timestamp(start_date), source, sorted_for_lookup=True
+            )
+            masked = filter_data(unsorted_df, pd.Timestamp(start_date), source)
+            pd.testing.assert_frame_equal(sliced.astype({"source": object}), masked)
+
+
+def test_lookup_order_is_checked_once(tmp_csv_file, monkeypatch):
+    """Test that the order is checked when cleaning, not on every filter."""
+    checks = []
+    monkeypatch.setattr(
+        pandas_engine,
+        "is_sorted_for_lookup",
+        lambda df: checks.append(len(df)) or is_sorted_for_lookup(df),
+    )
+    slices = []
+    monkeypatch.setattr(
+        data_filter,
+        "_slice_sorted",
+        lambda *args, _slice=data_filter._slice_sorted: slices.append(args)
+        or _slice(*args),
+    )
+    processor = CSVProcessor(file_path=str(tmp_csv_file), use_cache=False)
+    processor.load()
+    processor.clean()
+
+    for start_date in ("2024-01-01", "2024-01-08", "2024-01-15"):
+        processor.filter(start_date, traffic_source="email")
+
+    assert checks == [63]
+    assert len(slices) == 3
+
+
+def test_resorted_frame_is_not_sliced(tmp_csv_file):
+    """Test that a prepared frame re-sorted by another key is filtered with masks."""
+    processor = CSVProcessor(file_path=str(tmp_csv_file), use_cache=False)
+    processor.load()
+    processor.clean()
+    expected = processor.filter("2024-01-01", traffic_source="email")
+
+    processor.df = processor.df.sort_values("sessions")
+    assert not is_sorted_for_lookup(processor.df)
+    pd.testing.assert_frame_equal(
+        processor.filter("2024-01-01", traffic_source="email").sort_index(),
+        expected.sort_index(),
+    )
+
+
+def test_sorted_lookup_unknown_source(tmp_csv_file):
+    """Test ValueError from the sorted path when the source does not exist."""
+    processor = CSVProcessor(file_path=str(tmp_csv_file), use_cache=False)
+    processor.load()
+    processor.clean()
+    with pytest.raises(ValueError, match="traffic source"):
+        processor.filter("2024-01-08", traffic_source="paid_search")
+
+
+@pytest.mark.parametrize("engine", ["pandas", "polars"])
+def test_split_sources_matches_filter(tmp_csv_file, engine):
+    """Test that one split gives every source's `filter` result."""
+    if engine == "polars":
+        pytest.importorskip("polars")
+    processor = CSVProcessor(
+        file_path=str(tmp_csv_file), use_cache=False, engine=engine, dataset_path=None
+    )
+    processor.load()
+    processor.validate()
+    processor.clean()
+
+    sources = processor.split_sources("2024-01-03")
+    assert list(sources) == ["direct", "email", "organic"]
+    for source, source_df in sources.items():
+        assert processor.engine.generate_overview(
+            source_df
+        ) == processor.engine.generate_overview(processor.filter("2024-01-03", source))
+
+
+def test_split_sources_empty_week(tmp_csv_file):
+    """Test ValueError when no source has data in the week."""
+    processor = CSVProcessor(file_path=str(tmp_csv_file), use_cache=False, dataset_path=None)
+    processor.load()
+    processor.validate()
+    processor.clean()
+    with pytest.raises(ValueError, match="No data found in the 7-day period"):
+        processor.split_sources("2025-01-01")
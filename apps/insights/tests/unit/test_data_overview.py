@@ -0,0 +1,170 @@
+# tests/unit/test_data_overview.py
+import pandas as pd
+import pytest
+from apps.insights.services.csv.csv_processor import CSVProcessor
+from apps.insights.services.openai.schemas import KeyMetric
+from apps.insights.services.csv.data_overview import (
+    OVERVIEW_STATISTICS,
+    compact_overview,
+    describe_overview,
+    format_significant,
+    generate_overview,
+    generate_weekly_overviews,
+    key_metric_values,
+    overview_from_records,
+    overview_to_records,
+)
+
+CSV_FILE_PATH = "./apps/insights/data/ga4_data.csv"
+
+
+@pytest.fixture
+def csv_processor():
+    """Fixture providing a cleaned CSVProcessor over the bundled GA4 data."""
+    processor = CSVProcessor(file_path=CSV_FILE_PATH, use_cache=False, dataset_path=None)
+    processor.load()
+    processor.validate()
+    processor.clean()
+    return processor
+
+
+def test_overview_records_round_trip(csv_processor):
+    """Test that stored overview records rebuild the identical overview string."""
+    filtered_df = csv_processor.filter("2024-01-15", "organic")
+    records = overview_to_records(csv_processor.engine.describe_overview(filtered_df))
+
+    assert records[0]["column_name"] == "sessions"
+    assert isinstance(records[0]["count"], int)
+    assert overview_from_records(records).to_string() == generate_overview(filtered_df)
+
+
+def test_overview_records_store_missing_statistics_as_none():
+    """Test that the undefined std of a single row is stored as None."""
+    df = pd.DataFrame({"date": pd.to_datetime(["2024-01-01"]), "sessions": [5]})
+    records = overview_to_records(describe_overview(df))
+    assert records == [
+        {
+            "column_name": "sessions",
+            "count": 1,
+            "mean": 5.0,
+            "std": None,
+            "min": 5.0,
+            "percentile_25": 5.0,
+            "median": 5.0,
+            "percentile_75": 5.0,
+            "max": 5.0,
+        }
+    ]
+    assert overview_from_records(records).to_string() == generate_overview(df)
+
+
+def test_key_metric_values_are_exact_column_means(csv_processor):
+    """Test that key metrics are the week's column means in display order."""
+    filtered_df = csv_processor.filter("2024-01-15", "organic")
+    values = key_metric_values(csv_processor.engine.describe_overview(filtered_df))
+
+    assert list(values) == [metric.name for metric in KeyMetric.ordered_metrics()]
+    assert values["Average Sessions"] == pytest.approx(filtered_df["sessions"].mean())
+    assert values["Bounce Rate"] == pytest.approx(filtered_df["bounce_rate"].mean())
+
+
+def test_key_metric_values_reject_missing_means():
+    """Test that an overview without data can not produce key metrics."""
+    overview = describe_overview(pd.DataFrame({"sessions": [float("nan")]}))
+    with pytest.raises(ValueError, match="Average Sessions"):
+        key_metric_values(overview)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (1543.428571, "1543"),
+        (243.254912, "243.3"),
+        (0.0278, "0.0278"),
+        (7.0, "7"),
+        (123456.7, "123500"),
+        (float("nan"), ""),
+    ],
+)
+def test_format_significant(value, expected):
+    """Test rounding to four significant digits without exponents."""
+    assert format_significant(value) == expected
+
+
+def test_compact_overview_uses_aliases_and_fewer_characters(csv_processor):
+    """Test that the compact overview has one aliased row per column."""
+    overview = csv_processor.engine.describe_overview(
+        csv_processor.filter("2024-01-15", "organic")
+    )
+    lines = compact_overview(overview).splitlines()
+
+    assert lines[0] == "col,n,mean,sd,min,p25,p50,p75,max"
+    assert [line.split(",")[0] for line in lines[1:3]] == ["ses", "usr"]
+    assert all(len(line.split(",")) == 9 for line in lines)
+    assert len(compact_overview(overview)) < len(overview.to_string()) / 2
+
+
+def test_weekly_overviews_match_single_week_describe(csv_processor):
+    """Test that each weekly row equals `describe` on the filtered week."""
+    overviews = generate_weekly_overviews(csv_processor.df)
+    week = overviews[
+        (overviews["week_start"] == "2024-01-15") & (overviews["source"] == "organic")
+    ].set_index("metric")[OVERVIEW_STATISTICS]
+
+    filtered_df = csv_processor.filter("2024-01-15", "organic")
+    expected = (
+        filtered_df.drop(columns=["date"])
+        .select_dtypes(include="number")
+        .astype("float64")
+        .describe()
+        .T
+    )
+    pd.testing.assert_frame_equal(week, expected, check_names=False)
+
+
+def test_weekly_overviews_cover_every_week_and_source(csv_processor):
+    """Test one row per (ISO week, source, metric) with Monday week starts."""
+    overviews = generate_weekly_overviews(csv_processor.df)
+    df = csv_processor.df
+    iso = df["date"].dt.isocalendar()
+    pairs = pd.DataFrame({"week": iso["week"], "source": df["source"]})
+
+    assert overviews.groupby(["iso_year", "iso_week", "source"]).ngroups == len(
+        pairs.drop_duplicates()
+    )
+    assert (overviews["week_start"].dt.dayofweek == 0).all()
+    assert not overviews.duplicated(["iso_year", "iso_week", "source", "metric"]).any()
+
+
+def test_weekly_overviews_identical_across_engines(csv_processor):
+    """Test that the Polars engine builds the same weekly overview table."""
+    pytest.importorskip("polars")
+    processor = CSVProcessor(file_path=CSV_FILE_PATH, use_cache=False, engine="polars")
+    processor.load()
+    processor.validate()
+    processor.clean()
+
+    pd.testing.assert_frame_equal(
+        processor.generate_weekly_overviews(),
+        csv_processor.generate_weekly_overviews(),
+    )
+
+
+def test_weekly_overviews_from_dataset(csv_processor, tmp_path):
+    """Test that a partitioned dataset yields the same weekly overviews."""
+    pytest.importorskip("pyarrow")
+    csv_processor.ingest(str(tmp_path))
+    processor = CSVProcessor(file_path=CSV_FILE_PATH, dataset_path=str(tmp_path))
+    processor.load()
+
+    pd.testing.assert_frame_equal(
+        processor.generate_weekly_overviews(),
+        csv_processor.generate_weekly_overviews(),
+    )
+
+
+def test_weekly_overviews_require_clean_data():
+    """Test ValueError when overviews are requested before cleaning."""
+    processor = CSVProcessor(file_path=CSV_FILE_PATH, use_cache=False, dataset_path=None)
+    with pytest.raises(ValueError):
+        processor.generate_weekly_overviews()
@@ -0,0 +1,71 @@
+# tests/unit/test_data_validator.py
+import pandas as pd
+import pytest
+from apps.insights.services.csv.csv_processor import CSVProcessor
+from apps.insights.services.csv.data_cleaner import DataCleaningError
+from apps.insights.services.csv.data_validator import COLUMN_SCHEMA, validate_dtypes
+
+HEADER = (
+    "date,source,sessions,users,new_users,pageviews,pages_per_session,"
+    "avg_session_duration,bounce_rate,conversion_rate,transactions,revenue\n"
+)
+ROW = "2024-01-01,organic,10,8,3,40,4.0,120.5,0.2,0.03,1,50.0\n"
+
+
+def test_schema_applied_at_load(tmp_path):
+    """Test that every column is parsed with its declared dtype."""
+    file_path = tmp_path / "ga4.csv"
+    file_path.write_text(HEADER + ROW)
+
+    processor = CSVProcessor(file_path=str(file_path), use_cache=False)
+    processor.load()
+    processor.validate()
+
+    for column, dtype in COLUMN_SCHEMA.items():
+        assert str(processor.df[column].dtype) == dtype
+
+
+def test_load_fails_fast_on_bad_value(tmp_path):
+    """Test ValueError when a counter column holds a non-integer value."""
+    file_path = tmp_path / "ga4.csv"
+    file_path.write_text(HEADER + ROW.replace(",10,", ",ten,"))
+
+    processor = CSVProcessor(file_path=str(file_path), use_cache=False)
+    with pytest.raises(ValueError):
+        processor.load()
+
+
+def test_validate_dtypes_reports_mismatch():
+    """Test ValueError listing the columns that do not match the schema."""
+    df = pd.DataFrame({"sessions": [1.5], "source": ["organic"]})
+    with pytest.raises(ValueError, match="sessions"):
+        validate_dtypes(df)
+
+
+def test_bad_date_is_reported_by_clean(tmp_path):
+    """Test that an unparseable date passes validation and is reported by clean."""
+    file_path = tmp_path / "ga4.csv"
+    file_path.write_text(HEADER + ROW + ROW.replace("2024-01-01", "not-a-date"))
+
+    processor = CSVProcessor(file_path=str(file_path), use_cache=False, dataset_path=None)
+    processor.load()
+    processor.validate()
+    with pytest.raises(DataCleaningError):
+        processor.clean()
+
+    assert processor.cleaning_report.invalid_date_count == 1
+    assert processor.cleaning_report.invalid_date_positions == [1]
+
+
+def test_cached_frame_has_cleaning_report(tmp_path):
+    """Test that a frame served from the frame cache still has a report."""
+    file_path = tmp_path / "ga4.csv"
+    file_path.write_text(HEADER + ROW)
+    for _ in range(2):
+        processor = CSVProcessor(file_path=str(file_path), dataset_path=None)
+        processor.load()
+        processor.validate()
+        processor.clean()
+
+    assert processor.cleaning_report.total_rows == 1
+    assert processor.cleaning_report.invalid_date_count == 0
@@ -0,0 +1,116 @@
+# tests/unit/test_dataset_store.py
+import pandas as pd
+import pytest
+from apps.insights import tasks
+from apps.insights.services.csv.csv_processor import CSVProcessor
+from apps.insights.services.csv.dataset_store import partition_paths
+
+pytest.importorskip("pyarrow")
+
+CSV_FILE_PATH = "./apps/insights/data/ga4_data.csv"
+
+
+@pytest.fixture
+def csv_processor():
+    """Fixture providing a cleaned CSVProcessor over the bundled GA4 data."""
+    processor = CSVProcessor(file_path=CSV_FILE_PATH, use_cache=False, dataset_path=None)
+    processor.load()
+    processor.validate()
+    processor.clean()
+    return processor
+
+
+@pytest.fixture
+def dataset_path(csv_processor, tmp_path):
+    """Fixture ingesting the GA4 data into a partitioned dataset."""
+    root = tmp_path / "dataset"
+    csv_processor.ingest(str(root))
+    return root
+
+
+def test_ingest_writes_hive_partitions(dataset_path):
+    """Test the year/week/source directory layout."""
+    assert (dataset_path / "year=2024" / "week=01" / "source=organic").is_dir()
+    assert (dataset_path / "year=2024" / "week=01" / "source=email").is_dir()
+
+
+def test_partition_paths_covers_at_most_two_weeks(dataset_path):
+    """Test that a mid-week start opens two partitions and a Monday start one."""
+    assert len(partition_paths(dataset_path, pd.Timestamp("2024-01-01"), "organic")) == 1
+    assert len(partition_paths(dataset_path, pd.Timestamp("2024-01-03"), "organic")) == 2
+
+
+@pytest.mark.parametrize("start_date", ["2024-01-01", "2024-01-10"])
+def test_filter_from_partitions_matches_csv(csv_processor, dataset_path, start_date):
+    """Test that filtering the partitions returns the frame filtered from the CSV."""
+    expected = csv_processor.filter(start_date)
+
+    processor = CSVProcessor(dataset_path=str(dataset_path))
+    processor.load()
+    processor.validate()
+    processor.clean()
+    pd.testing.assert_frame_equal(processor.filter(start_date), expected)
+
+
+def test_filter_missing_partition(dataset_path):
+    """Test ValueError when no partition covers the requested week."""
+    processor = CSVProcessor(dataset_path=str(dataset_path))
+    with pytest.raises(ValueError, match="7-day period"):
+        processor.filter("2030-01-01")
+
+
+def test_split_sources_from_partitions_matches_csv(csv_processor, dataset_path):
+    """Test that splitting a week read from partitions matches the CSV split."""
+    expected = csv_processor.split_sources("2024-01-10")
+
+    processor = CSVProcessor(dataset_path=str(dataset_path))
+    sources = processor.split_sources("2024-01-10")
+    assert list(sources) == list(expected)
+    for source, source_df in sources.items():
+        assert processor.engine.generate_overview(
+            source_df
+        ) == csv_processor.engine.generate_overview(expected[source])
+
+
+def test_filter_missing_source_names_it(dataset_path):
+    """Test that a source missing from an ingested week is named in the error."""
+    processor = CSVProcessor(dataset_path=str(dataset_path))
+    with pytest.raises(ValueError, match="traffic source 'unknown'"):
+        processor.filter("2024-01-01", traffic_source="unknown")
+
+
+def test_ingest_reads_the_csv_file(tmp_path):
+    """Test that a processor reading a dataset ingests the rows added to the CSV."""
+    csv_path = tmp_path / "ga4_data.csv"
+    with open(CSV_FILE_PATH) as f:
+        lines = f.readlines()
+    # Leave out the last ISO week, which starts on Monday 2024-04-15
+    csv_path.write_text(
+        "".join(lines[:1] + [line for line in lines[1:] if line < "2024-04-15"])
+    )
+    root = tmp_path / "dataset"
+
+    processor = CSVProcessor(file_path=str(csv_path), dataset_path=str(root))
+    processor.ingest()
+    before = len(processor.generate_weekly_overviews())
+
+    csv_path.write_text("".join(lines))
+    processor.ingest()
+    assert len(processor.generate_weekly_overviews()) > before
+
+
+def test_summary_chain_refreshes_dataset_first(monkeypatch, tmp_path):
+    """Test that the weekly chain re-ingests the CSV before summarizing."""
+    steps = []
+
+    class FakeChain:
+        def append(self, func, *args, **kwargs):
+            steps.append(func)
+
+        def run(self):
+            pass
+
+    monkeypatch.setattr(tasks, "Chain", FakeChain)
+    monkeypatch.setattr(tasks, "DATASET_PATH", str(tmp_path / "dataset"))
+    tasks.schedule_summary_tasks("2024-01-08")
+    assert steps[0] == "apps.insights.tasks.refresh_dataset"
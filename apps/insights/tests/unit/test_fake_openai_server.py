@@ -0,0 +1,70 @@
+# tests/unit/test_fake_openai_server.py
+import openai
+import pytest
+from instructor import from_openai
+from apps.insights.benchmarks.fake_openai_server import FakeOpenAIServer
+from apps.insights.services.openai.batch import response_format
+from apps.insights.services.openai.rate_limit import retry_after_seconds
+from apps.insights.services.openai.schemas import (
+    ComparisonOutput,
+    SummaryOutput,
+    WeeklyReportOutput,
+)
+
+
+@pytest.fixture
+def server():
+    """Fixture serving the fake OpenAI API without latency."""
+    with FakeOpenAIServer(latency=0, jitter=0, seed=0) as fake_server:
+        yield fake_server
+
+
+def openai_client(server: FakeOpenAIServer) -> openai.OpenAI:
+    """Returns an OpenAI client of the fake server that does not retry."""
+    return openai.OpenAI(api_key="sk-test", base_url=server.url, max_retries=0)
+
+
+@pytest.mark.parametrize(
+    "response_model", [SummaryOutput, ComparisonOutput, WeeklyReportOutput]
+)
+def test_server_returns_structured_outputs(server, response_model):
+    """Test that Instructor parses the canned output of each response model."""
+    client = from_openai(openai_client(server))
+
+    result = client.chat.completions.create(
+        model="gpt-4o-2024-08-06",
+        messages=[{"role": "user", "content": "Summarize the data."}],
+        response_model=response_model,
+    )
+
+    assert isinstance(result, response_model)
+    assert server.stats == {"ok": 1}
+
+
+def test_server_answers_json_schema_requests(server):
+    """Test that batch-style JSON schema requests get the output as content."""
+    completion = openai_client(server).chat.completions.create(
+        model="gpt-4o-2024-08-06",
+        messages=[{"role": "user", "content": "Summarize the data."}],
+        response_format=response_format(SummaryOutput),
+    )
+
+    SummaryOutput.model_validate_json(completion.choices[0].message.content)
+
+
+def test_server_injects_rate_limits_and_errors():
+    """Test that the configured shares of requests fail with 429 and 500 errors."""
+    with FakeOpenAIServer(latency=0, jitter=0, rate_limit_rate=1, retry_after=3) as server:
+        with pytest.raises(openai.RateLimitError) as exc_info:
+            openai_client(server).chat.completions.create(
+                model="gpt-4o-2024-08-06",
+                messages=[{"role": "user", "content": "Summarize the data."}],
+            )
+    assert retry_after_seconds(exc_info.value) == 3
+
+    with FakeOpenAIServer(latency=0, jitter=0, error_rate=1) as server:
+        with pytest.raises(openai.InternalServerError):
+            openai_client(server).chat.completions.create(
+                model="gpt-4o-2024-08-06",
+                messages=[{"role": "user", "content": "Summarize the data."}],
+            )
@@ -0,0 +1,91 @@
+# tests/unit/test_frame_cache.py
+import pandas as pd
+import pytest
+from apps.insights.services.csv.pandas import PandasEngine
+from apps.insights.services.csv.csv_processor import CSVProcessor
+from apps.insights.services.csv.frame_cache import FrameCache, frame_cache
+
+CSV_CONTENT = (
+    "date,source,sessions,users,new_users,pageviews,pages_per_session,"
+    "avg_session_duration,bounce_rate,conversion_rate,transactions,revenue\n"
+    "2024-01-01,organic,10,8,3,40,4.0,120.5,0.2,0.03,1,50.0\n"
+    "2024-01-02,organic,20,16,6,80,4.0,130.5,0.3,0.02,2,75.5\n"
+)
+
+
+@pytest.fixture
+def tmp_csv_file(tmp_path):
+    """Fixture to create a temporary GA4-style CSV file."""
+    file_path = tmp_path / "ga4.csv"
+    file_path.write_text(CSV_CONTENT)
+    return file_path
+
+
+@pytest.fixture(autouse=True)
+def empty_frame_cache():
+    """Fixture to isolate the process-wide frame cache between tests."""
+    frame_cache.clear()
+    yield
+    frame_cache.clear()
+
+
+def test_lru_eviction_respects_budget():
+    """Test that the least recently used entry is evicted first."""
+    df = pd.DataFrame({"value": range(100)})
+    size = int(df.memory_usage(deep=True).sum())
+    cache = FrameCache(max_bytes=size * 2)
+
+    cache.put("a", df)
+    cache.put("b", df)
+    assert cache.get("a") is df  # "a" becomes most recently used
+    cache.put("c", df)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is df
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["current_bytes"] <= cache.max_bytes
+
+
+def test_oversized_frame_is_not_cached():
+    """Test that a DataFrame larger than the budget is skipped."""
+    cache = FrameCache(max_bytes=1)
+    cache.put("a", pd.DataFrame({"value": range(100)}))
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_processors_share_cleaned_frame(tmp_csv_file, monkeypatch):
+    """Test that a second processor reuses the cleaned DataFrame of the first."""
+    first = CSVProcessor(file_path=str(tmp_csv_file))
+    first.load()
+    first.validate()
+    first.clean()
+
+    def fail_clean_data(self, df):
+        raise AssertionError("Cleaned data should have been served from the cache")
+
+    monkeypatch.setattr(PandasEngine, "clean", fail_clean_data)
+    second = CSVProcessor(file_path=str(tmp_csv_file))
+    second.load()
+    second.validate()
+    second.clean()
+
+    assert second.df is first.df
+    assert frame_cache.stats()["hits"] == 1
+    assert frame_cache.stats()["misses"] == 1
+    assert len(second.filter("2024-01-01")) == 2
+
+
+def test_modified_file_misses_cache(tmp_csv_file):
+    """Test that changing the file produces a new fingerprint."""
+    processor = CSVProcessor(file_path=str(tmp_csv_file))
+    processor.load()
+    processor.clean()
+
+    tmp_csv_file.write_text(CSV_CONTENT + CSV_CONTENT.splitlines()[-1] + "\n")
+    # Appended rows would otherwise be merged into the cached frame
+    processor = CSVProcessor(file_path=str(tmp_csv_file), incremental=False)
+    processor.load()
+
+    assert not processor.is_clean
+    assert len(processor.df) == 3
@@ -0,0 +1,142 @@
+# tests/unit/test_incremental_load.py
+from pathlib import Path
+import pandas as pd
+import pytest
+from apps.insights.services.csv import csv_cache
+from apps.insights.services.csv.csv_processor import CSVProcessor
+from apps.insights.services.csv.csv_reader import read_csv, read_csv_since
+from apps.insights.services.csv.data_validator import schema_read_options
+from apps.insights.services.csv.frame_cache import frame_cache
+from apps.insights.services.csv.pandas import PandasEngine
+
+pytest.importorskip("pyarrow")
+
+CSV_FILE_PATH = Path("./apps/insights/data/ga4_data.csv")
+
+# Number of data rows written before the rest of the file is appended
+INITIAL_ROWS = 300
+
+
+@pytest.fixture
+def csv_lines():
+    """Fixture providing the lines of the bundled GA4 CSV file."""
+    return CSV_FILE_PATH.read_bytes().splitlines(keepends=True)
+
+
+@pytest.fixture
+def tmp_csv_file(tmp_path, csv_lines):
+    """Fixture to create a GA4 CSV file holding only the first rows."""
+    file_path = tmp_path / "ga4.csv"
+    file_path.write_bytes(b"".join(csv_lines[: INITIAL_ROWS + 1]))
+    return file_path
+
+
+@pytest.fixture(autouse=True)
+def empty_frame_cache():
+    """Fixture to isolate the process-wide frame cache between tests."""
+    frame_cache.clear()
+    yield
+    frame_cache.clear()
+
+
+def load_processor(file_path: Path, use_cache: bool = True) -> CSVProcessor:
+    """Runs load, validate and clean on a CSV file."""
+    processor = CSVProcessor(file_path=str(file_path), use_cache=use_cache, dataset_path=None)
+    processor.load()
+    processor.validate()
+    processor.clean()
+    return processor
+
+
+def test_sidecar_cache_parses_only_appended_rows(tmp_csv_file, csv_lines):
+    """Test that appended rows are merged into the cached rows exactly."""
+    read_csv(str(tmp_csv_file), **schema_read_options())
+    with open(tmp_csv_file, "ab") as f:
+        f.write(b"".join(csv_lines[INITIAL_ROWS + 1 :]))
+
+    cached_prefix = csv_cache.load_cached_prefix(tmp_csv_file, schema_read_options())
+    assert cached_prefix is not None
+    assert len(cached_prefix[0]) == INITIAL_ROWS
+
+    df = read_csv(str(tmp_csv_file), **schema_read_options())
+    expected = pd.read_csv(tmp_csv_file, **schema_read_options())
+    pd.testing.assert_frame_equal(df, expected)
+    # The merged cache is fresh for the grown file
+    pd.testing.assert_frame_equal(
+        csv_cache.load_cached_frame(tmp_csv_file, schema_read_options()), expected
+    )
+
+
+def test_row_position_options_reload_in_full(tmp_csv_file, csv_lines):
+    """Test that nrows is applied to the whole file, not to the appended rows."""
+    options = {**schema_read_options(), "nrows": INITIAL_ROWS + 10}
+    read_csv(str(tmp_csv_file), **options)
+    with open(tmp_csv_file, "ab") as f:
+        f.write(b"".join(csv_lines[INITIAL_ROWS + 1 :]))
+
+    df = read_csv(str(tmp_csv_file), **options)
+
+    pd.testing.assert_frame_equal(df, pd.read_csv(tmp_csv_file, **options))
+    assert len(df) == INITIAL_ROWS + 10
+    with pytest.raises(ValueError, match="nrows"):
+        read_csv_since(tmp_csv_file, 0, nrows=10)
+
+
+def test_processor_merges_appended_rows(tmp_csv_file, csv_lines):
+    """Test that appended rows are cleaned and merged into the cached frame."""
+    load_processor(tmp_csv_file)
+    with open(tmp_csv_file, "ab") as f:
+        f.write(b"".join(csv_lines[INITIAL_ROWS + 1 :]))
+
+    processor = load_processor(tmp_csv_file)
+    expected = load_processor(tmp_csv_file, use_cache=False)
+
+    assert processor.cleaning_report.total_rows == len(csv_lines) - 1 - INITIAL_ROWS
+    pd.testing.assert_frame_equal(processor.df, expected.df)
+    assert frame_cache.stats()["entries"] == 1
+
+
+def test_incomplete_last_line_is_left_for_next_load(tmp_csv_file, csv_lines):
+    """Test that a partially written row is not merged until it is complete."""
+    load_processor(tmp_csv_file)
+    next_line = csv_lines[INITIAL_ROWS + 1]
+    with open(tmp_csv_file, "ab") as f:
+        f.write(next_line[:10])
+
+    assert len(load_processor(tmp_csv_file).df) == INITIAL_ROWS
+
+    with open(tmp_csv_file, "ab") as f:
+        f.write(next_line[10:])
+    assert len(load_processor(tmp_csv_file).df) == INITIAL_ROWS + 1
+
+
+def test_rows_before_incomplete_line_are_kept_cached(
+    tmp_csv_file, csv_lines, monkeypatch
+):
+    """Test that rows merged before a partial line need no full reload later."""
+    load_processor(tmp_csv_file)
+    next_lines = csv_lines[INITIAL_ROWS + 1 : INITIAL_ROWS + 4]
+    with open(tmp_csv_file, "ab") as f:
+        f.write(b"".join(next_lines[:2]) + next_lines[2][:10])
+    assert len(load_processor(tmp_csv_file).df) == INITIAL_ROWS + 2
+
+    def fail_load(*args, **kwargs):
+        raise AssertionError("The cached rows should have been reused")
+
+    monkeypatch.setattr(PandasEngine, "load", fail_load)
+    with open(tmp_csv_file, "ab") as f:
+        f.write(next_lines[2][10:])
+    assert len(load_processor(tmp_csv_file).df) == INITIAL_ROWS + 3
+    assert frame_cache.stats()["entries"] == 1
+
+
+def test_changed_prefix_falls_back_to_full_reload(tmp_csv_file, csv_lines):
+    """Test that rewritten earlier rows force a full reload."""
+    load_processor(tmp_csv_file)
+    rewritten = b"".join(csv_lines[: INITIAL_ROWS + 1]).replace(b"organic", b"Organic")
+    tmp_csv_file.write_bytes(rewritten + b"".join(csv_lines[INITIAL_ROWS + 1 :]))
+
+    assert csv_cache.load_cached_prefix(tmp_csv_file, schema_read_options()) is None
+    processor = load_processor(tmp_csv_file)
+    assert processor.cleaning_report.total_rows == len(csv_lines) - 1
+    assert "Organic" in processor.df["source"].cat.categories
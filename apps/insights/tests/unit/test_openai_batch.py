@@ -0,0 +1,226 @@
+# tests/unit/test_openai_batch.py
+import functools
+import json
+import pytest
+from django.core.management import call_command
+from pydantic import BaseModel
+from apps.insights.benchmarks.fake_openai_server import CANNED_OUTPUTS
+from apps.insights.management.commands import regenerate_weeks_batch as command
+from apps.insights.models.comparison import Comparison
+from apps.insights.models.summary import Summary
+from apps.insights.services import batch_service, summary_service
+from apps.insights.services.csv.csv_processor import CSVProcessor
+from apps.insights.services.openai.batch import (
+    BatchError,
+    BatchRequest,
+    BatchStatus,
+    BatchTransport,
+    build_batch_input,
+    run_batch,
+)
+
+
+class Answer(BaseModel):
+    text: str
+
+
+def upper_case_answer(request: dict) -> str:
+    """Answers a request with its prompt in upper case."""
+    prompt = request["body"]["messages"][0]["content"]
+    return Answer(text=prompt.upper()).model_dump_json()
+
+
+class FakeBatchTransport(BatchTransport):
+    """In-memory batch endpoint answering each request with `answer(request)`."""
+
+    def __init__(
+        self,
+        pending_polls: int = 1,
+        final_status: str = "completed",
+        answer=upper_case_answer,
+    ):
+        self.files = {}
+        self.batches = {}
+        self.pending_polls = pending_polls
+        self.final_status = final_status
+        self.answer = answer
+        self.polls = 0
+
+    def upload(self, content: bytes) -> str:
+        file_id = f"file-{len(self.files)}"
+        self.files[file_id] = content
+        return file_id
+
+    def create(self, input_file_id: str) -> str:
+        batch_id = f"batch-{len(self.batches)}"
+        self.batches[batch_id] = input_file_id
+        return batch_id
+
+    def retrieve(self, batch_id: str) -> BatchStatus:
+        self.polls += 1
+        if self.polls <= self.pending_polls:
+            return BatchStatus(status="in_progress")
+        if self.final_status != "completed":
+            return BatchStatus(status=self.final_status)
+
+        outputs, errors = [], []
+        for line in self.files[self.batches[batch_id]].decode().splitlines():
+            request = json.loads(line)
+            prompt = request["body"]["messages"][0]["content"]
+            if prompt == "fail":
+                errors.append(
+                    {
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": 400, "body": {"error": "bad"}},
+                        "error": None,
+                    }
+                )
+                continue
+            content = self.answer(request)
+            outputs.append(
+                {
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {"choices": [{"message": {"content": content}}]},
+                    },
+                    "error": None,
+                }
+            )
+        self.files["output"] = "\n".join(map(json.dumps, outputs)).encode()
+        self.files["errors"] = "\n".join(map(json.dumps, errors)).encode()
+        return BatchStatus("completed", output_file_id="output", error_file_id="errors")
+
+    def download(self, file_id: str) -> bytes:
+        return self.files[file_id]
+
+
+def make_requests(*prompts):
+    """Returns one request per prompt, identified by its position."""
+    return [
+        BatchRequest(custom_id=str(index), prompt=prompt, response_model=Answer)
+        for index, prompt in enumerate(prompts)
+    ]
+
+
+def test_build_batch_input_writes_one_request_per_line():
+    """Test that each request becomes a chat completion with a JSON schema."""
+    lines = build_batch_input(make_requests("a", "b"), "test-model").splitlines()
+
+    assert len(lines) == 2
+    request = json.loads(lines[0])
+    assert request["custom_id"] == "0"
+    assert request["url"] == "/v1/chat/completions"
+    assert request["body"]["model"] == "test-model"
+    assert request["body"]["response_format"]["json_schema"]["name"] == "Answer"
+
+
+def test_build_batch_input_rejects_duplicate_ids():
+    """Test that results could not be told apart with duplicate custom IDs."""
+    with pytest.raises(ValueError, match="unique"):
+        build_batch_input(make_requests("a") * 2, "test-model")
+
+
+def test_run_batch_polls_and_parses_results():
+    """Test that the batch is polled until done and failures are reported per request."""
+    transport = FakeBatchTransport(pending_polls=2)
+
+    results = run_batch(
+        make_requests("hello", "fail"), "test-model", transport, poll_interval=0
+    )
+
+    assert transport.polls == 3
+    assert results["0"] == Answer(text="HELLO")
+    assert isinstance(results["1"], BatchError)
+
+
+@pytest.mark.parametrize("final_status", ["failed", "expired"])
+def test_run_batch_raises_when_batch_does_not_complete(final_status):
+    """Test that a failed or expired batch raises BatchError."""
+    transport = FakeBatchTransport(final_status=final_status)
+
+    with pytest.raises(BatchError, match=final_status):
+        run_batch(make_requests("hello"), "test-model", transport, poll_interval=0)
+
+
+def test_run_batch_times_out():
+    """Test that a batch still running at the deadline raises BatchError."""
+    transport = FakeBatchTransport(pending_polls=10**6)
+
+    with pytest.raises(BatchError, match="did not finish"):
+        run_batch(
+            make_requests("hello"), "test-model", transport, poll_interval=0, timeout=0
+        )
+
+
+def canned_answer(request: dict) -> str:
+    """Answers a request with the canned output of its response model."""
+    name = request["body"]["response_format"]["json_schema"]["name"]
+    return json.dumps(CANNED_OUTPUTS[name])
+
+
+@pytest.fixture
+def csv_data(monkeypatch):
+    """Fixture reading the bundled GA4 data without writing caches."""
+    monkeypatch.setattr(
+        summary_service,
+        "CSVProcessor",
+        functools.partial(CSVProcessor, use_cache=False, dataset_path=None),
+    )
+
+
+@pytest.mark.django_db
+def test_regenerate_weeks_batch_saves_summaries_and_comparisons(csv_data):
+    """Test that batch results are saved as summaries, then compared."""
+    transport = FakeBatchTransport(pending_polls=0, answer=canned_answer)
+
+    saved = batch_service.regenerate_weeks_batch("2024-01-15", 2, transport=transport)
+
+    assert saved == {
+        "summaries": ["2024-01-15", "2024-01-08", "2024-01-01"],
+        "comparisons": ["2024-01-15", "2024-01-08"],
+    }
+    summary = Summary.objects.get(start_date="2024-01-15", traffic_source="organic")
+    assert summary.dataset_summary == CANNED_OUTPUTS["SummaryOutput"]["dataset_summary"]
+    assert summary.key_metrics.count() == 10
+    assert summary.data_source is None
+    comparison = Comparison.objects.get(summary1=summary)
+    assert comparison.summary2.start_date.isoformat() == "2024-01-08"
+    assert comparison.key_metrics_comparison.count() == 10
+
+    # A rerun finds nothing left to submit
+    assert batch_service.regenerate_weeks_batch(
+        "2024-01-15", 2, transport=transport
+    ) == {"summaries": [], "comparisons": []}
+
+
+@pytest.mark.django_db
+def test_failed_batch_results_are_reported_after_saving_others(csv_data):
+    """Test that a failed summary is reported once the others are saved."""
+
+    def fail_first_week(request: dict) -> str:
+        if request["custom_id"] == "2024-01-15":
+            return "not json"
+        return canned_answer(request)
+
+    transport = FakeBatchTransport(pending_polls=0, answer=fail_first_week)
+    with pytest.raises(RuntimeError, match="2024-01-15"):
+        batch_service.create_summaries_batch(
+            ["2024-01-15", "2024-01-08"], transport=transport
+        )
+
+    saved = Summary.objects.values_list("start_date", flat=True)
+    assert [start_date.isoformat() for start_date in saved] == ["2024-01-08"]
+
+
+def test_command_runs_batch_regeneration(monkeypatch):
+    """Test that the management command regenerates the requested weeks."""
+    calls = []
+    monkeypatch.setattr(
+        command,
+        "regenerate_weeks_batch",
+        lambda *args: calls.append(args) or {"summaries": [], "comparisons": []},
+    )
+
+    call_command("regenerate_weeks_batch", "2024-01-15", "--weeks", "4")
+    assert calls == [("2024-01-15", 4, "organic")]
@@ -0,0 +1,149 @@
+# tests/unit/test_openai_cache.py
+import asyncio
+import os
+import subprocess
+import sys
+import pytest
+import redis
+from prometheus_client import REGISTRY
+from pydantic import BaseModel
+from apps.insights.services.openai import cache as openai_cache
+from apps.insights.services.openai.cache import cache_key, instructor_cache
+
+
+class Answer(BaseModel):
+    text: str
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the cache."""
+
+    def __init__(self, fail: bool = False):
+        self.values = {}
+        self.ttls = {}
+        self.fail = fail
+
+    def get(self, key):
+        if self.fail:
+            raise redis.ConnectionError("Redis is down")
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        if self.fail:
+            raise redis.ConnectionError("Redis is down")
+        self.values[key] = value
+        self.ttls[key] = ex
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Fixture replacing the Redis client of the cache."""
+    client = FakeRedis()
+    monkeypatch.setattr(openai_cache, "get_cache_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def calls():
+    """Fixture recording the calls that reached the wrapped function."""
+    return []
+
+
+@pytest.fixture
+def cached_function(calls):
+    """Fixture providing a cached function that records its calls."""
+
+    @instructor_cache(model="test-model", prompt_version="1")
+    def ask(prompt: str, temperature: float = 0.0) -> Answer:
+        calls.append(prompt)
+        return Answer(text=prompt.upper())
+
+    return ask
+
+
+def requests_count(result: str) -> float:
+    """Returns the exported request counter for the test function."""
+    return (
+        REGISTRY.get_sample_value(
+            "insights_llm_cache_requests_total",
+            {
+                "function": "test_openai_cache.cached_function.<locals>.ask",
+                "model": "test-model",
+                "result": result,
+            },
+        )
+        or 0.0
+    )
+
+
+def test_cache_hit_skips_call(fake_redis, cached_function, calls, settings):
+    """Test that a repeated call is served from Redis with the configured TTL."""
+    settings.OPENAI_CACHE_TTL = 120
+    hits, misses = requests_count("hit"), requests_count("miss")
+
+    assert cached_function("hello") == Answer(text="HELLO")
+    # Keyword and defaulted arguments normalize to the same key
+    assert cached_function(prompt="hello", temperature=0.0) == Answer(text="HELLO")
+
+    assert calls == ["hello"]
+    assert list(fake_redis.ttls.values()) == [120]
+    assert requests_count("hit") == hits + 1
+    assert requests_count("miss") == misses + 1
+
+
+def test_cache_key_depends_on_model_and_prompt_version():
+    """Test that model and prompt template changes produce new keys."""
+    arguments = {"prompt": "hello"}
+    key = cache_key("f", "model-a", "1", arguments)
+    assert key == cache_key("f", "model-a", "1", {"prompt": "hello"})
+    assert key != cache_key("f", "model-b", "1", arguments)
+    assert key != cache_key("f", "model-a", "2", arguments)
+    assert key.startswith("instructor_cache:f:")
+
+
+def test_cache_key_is_stable_across_processes():
+    """Test that the key does not depend on the per-process hash seed."""
+    script = (
+        "from apps.insights.services.openai.cache import cache_key;"
+        "print(cache_key('f', 'model', '1', {'prompt': 'hello', 'n': 1}))"
+    )
+    keys = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert keys == {cache_key("f", "model", "1", {"prompt": "hello", "n": 1})}
+
+
+def test_redis_failure_falls_back_to_call(monkeypatch, cached_function, calls):
+    """Test that an unavailable Redis does not fail the call."""
+    monkeypatch.setattr(openai_cache, "get_cache_client", lambda: FakeRedis(fail=True))
+    errors = requests_count("error")
+
+    assert cached_function("hello") == Answer(text="HELLO")
+    assert calls == ["hello"]
+    assert requests_count("error") == errors + 1
+
+
+def test_async_function_shares_cache_entries(fake_redis, cached_function, calls):
+    """Test that an async variant with the same name reuses the sync entries."""
+
+    @instructor_cache(
+        model="test-model",
+        prompt_version="1",
+        name="test_openai_cache.cached_function.<locals>.ask",
+    )
+    async def ask(prompt: str, temperature: float = 0.0) -> Answer:
+        calls.append(prompt)
+        return Answer(text=prompt.upper())
+
+    cached_function("hello")
+    assert asyncio.run(ask("hello")) == Answer(text="HELLO")
+    assert asyncio.run(ask("world")) == Answer(text="WORLD")
+    assert calls == ["hello", "world"]
+    assert len(fake_redis.values) == 2
@@ -0,0 +1,259 @@
+# tests/unit/test_openai_circuit_breaker.py
+import asyncio
+import openai
+import pytest
+import redis
+from pydantic import BaseModel
+from apps.insights.services.openai import cache as cache_module
+from apps.insights.services.openai import circuit_breaker as breaker_module
+from apps.insights.services.openai.cache import instructor_cache
+from apps.insights.services.openai.circuit_breaker import (
+    CircuitOpenError,
+    circuit_breaker,
+    get_circuit_breaker,
+    is_outage,
+)
+
+
+class FakeRedis:
+    """In-memory stand-in for the Redis commands used by the circuit breaker."""
+
+    def __init__(self, fail: bool = False):
+        self.values = {}
+        self.fail = fail
+
+    def _check(self):
+        if self.fail:
+            raise redis.ConnectionError("Redis is down")
+
+    def get(self, key):
+        self._check()
+        return self.values.get(key)
+
+    def exists(self, key):
+        self._check()
+        return int(key in self.values)
+
+    def set(self, key, value, nx=False, ex=None):
+        self._check()
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def delete(self, *keys):
+        self._check()
+        for key in keys:
+            self.values.pop(key, None)
+
+    def incr(self, key):
+        self._check()
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    def expire(self, key, seconds):
+        self._check()
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Runs the queued commands of a pipeline on execute."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append(
+            (getattr(self.client, name), args, kwargs)
+        )
+
+    def execute(self):
+        return [command(*args, **kwargs) for command, args, kwargs in self.commands]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Fixture replacing the Redis client of the circuit breaker."""
+    client = FakeRedis()
+    monkeypatch.setattr(breaker_module, "get_redis_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def breaker_settings(settings):
+    """Fixture opening the breaker after two failures, with a fallback model."""
+    settings.OPENAI_BREAKER_FAILURE_THRESHOLD = 2
+    settings.OPENAI_BREAKER_SLOW_CALL_THRESHOLD = 60
+    settings.OPENAI_FALLBACK_MODEL = "fallback-model"
+    return settings
+
+
+def outage() -> openai.APIConnectionError:
+    return openai.APIConnectionError(request=None)
+
+
+def make_call(outcomes: list):
+    """Returns a guarded function failing or answering per `outcomes`."""
+    calls = []
+
+    @circuit_breaker("primary-model")
+    def call(prompt: str, model: str = "primary-model") -> str:
+        calls.append(model)
+        if outcomes and outcomes.pop(0) is not None:
+            raise outage()
+        return f"{model}: {prompt}"
+
+    return call, calls
+
+
+def expire_open_state(fake_redis):
+    """Simulates the reset timeout passing."""
+    fake_redis.delete("openai_circuit:primary-model:open")
+
+
+def test_breaker_opens_and_routes_to_fallback(fake_redis, breaker_settings):
+    """Test that repeated outages open the breaker and route calls to the fallback."""
+    call, calls = make_call([outage(), outage()])
+
+    for _ in range(2):
+        with pytest.raises(openai.APIConnectionError):
+            call("hello")
+    assert get_circuit_breaker("primary-model").state() == "open"
+
+    assert call("hello") == "fallback-model: hello"
+    assert calls == ["primary-model", "primary-model", "fallback-model"]
+
+
+def test_open_breaker_fails_fast_without_fallback(fake_redis, breaker_settings):
+    """Test that an open breaker rejects calls when no fallback model is set."""
+    breaker_settings.OPENAI_FALLBACK_MODEL = ""
+    call, calls = make_call([outage(), outage()])
+    for _ in range(2):
+        with pytest.raises(openai.APIConnectionError):
+            call("hello")
+
+    with pytest.raises(CircuitOpenError):
+        call("hello")
+    assert len(calls) == 2
+
+
+def test_half_open_probe_closes_breaker(fake_redis, breaker_settings):
+    """Test that one probe reaches the primary model and closes the breaker."""
+    breaker = get_circuit_breaker("primary-model")
+    breaker.record_failure()
+    breaker.record_failure()
+    expire_open_state(fake_redis)
+    assert breaker.state() == "half_open"
+
+    # A concurrent call does not probe while the probe is running
+    assert breaker.allow_request() == (True, True)
+    assert breaker.allow_request() == (False, False)
+    fake_redis.delete("openai_circuit:primary-model:probe")
+
+    call, calls = make_call([None])
+    assert call("hello") == "primary-model: hello"
+    assert breaker.state() == "closed"
+
+
+def test_failed_probe_reopens_breaker(fake_redis, breaker_settings):
+    """Test that a failing probe opens the breaker again at once."""
+    breaker = get_circuit_breaker("primary-model")
+    breaker.record_failure()
+    breaker.record_failure()
+    expire_open_state(fake_redis)
+
+    call, calls = make_call([outage()])
+    with pytest.raises(openai.APIConnectionError):
+        call("hello")
+
+    assert breaker.state() == "open"
+    assert call("hello") == "fallback-model: hello"
+
+
+def test_only_outages_and_slow_calls_count(fake_redis, breaker_settings):
+    """Test that bad requests do not open the breaker, but slow calls do."""
+    breaker = get_circuit_breaker("primary-model")
+
+    @circuit_breaker("primary-model")
+    def invalid(prompt: str, model: str = "primary-model") -> str:
+        raise ValueError("Invalid response")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            invalid("hello")
+    assert breaker.state() == "closed"
+
+    breaker.record_success(elapsed=61)
+    breaker.record_success(elapsed=61)
+    assert breaker.state() == "open"
+
+
+def test_breaker_without_redis_stays_closed(monkeypatch, breaker_settings):
+    """Test that an unavailable Redis does not block OpenAI calls."""
+    client = FakeRedis(fail=True)
+    monkeypatch.setattr(breaker_module, "get_redis_client", lambda: client)
+    call, calls = make_call([outage(), outage(), None])
+
+    for _ in range(2):
+        with pytest.raises(openai.APIConnectionError):
+            call("hello")
+    assert call("hello") == "primary-model: hello"
+
+
+def test_async_function_is_guarded(fake_redis, breaker_settings):
+    """Test that async functions are routed through the breaker too."""
+    breaker = get_circuit_breaker("primary-model")
+    breaker.record_failure()
+    breaker.record_failure()
+
+    @circuit_breaker("primary-model")
+    async def call(prompt: str, model: str = "primary-model") -> str:
+        return f"{model}: {prompt}"
+
+    assert asyncio.run(call("hello")) == "fallback-model: hello"
+
+
+class Answer(BaseModel):
+    text: str
+
+
+def test_fallback_answers_are_not_cached(fake_redis, breaker_settings, monkeypatch):
+    """Test that an answer of the fallback model is not cached as the primary's."""
+    monkeypatch.setattr(cache_module, "get_cache_client", lambda: fake_redis)
+    outcomes = ["outage", "outage"]
+    calls = []
+
+    @instructor_cache(model="primary-model", prompt_version="v1")
+    @circuit_breaker("primary-model")
+    def call(prompt: str, model: str = "primary-model") -> Answer:
+        calls.append(model)
+        if outcomes and outcomes.pop(0) is not None:
+            raise outage()
+        return Answer(text=f"{model}: {prompt}")
+
+    for _ in range(2):
+        with pytest.raises(openai.APIConnectionError):
+            call("hello")
+    assert call("hello").text == "fallback-model: hello"
+    assert not any(key.startswith("instructor_cache") for key in fake_redis.values)
+
+    expire_open_state(fake_redis)
+    assert call("hello").text == "primary-model: hello"
+    assert call("hello").text == "primary-model: hello"
+    assert calls == ["primary-model"] * 2 + ["fallback-model", "primary-model"]
+
+
+def test_is_outage_follows_causes():
+    """Test that wrapped API outages are recognized."""
+    try:
+        try:
+            raise outage()
+        except openai.APIConnectionError as e:
+            raise ValueError("Failed to generate summary") from e
+    except ValueError as e:
+        assert is_outage(e)
+
+    assert not is_outage(ValueError("Invalid response"))
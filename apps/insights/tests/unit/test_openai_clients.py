@@ -0,0 +1,106 @@
+# tests/unit/test_openai_clients.py
+import asyncio
+import importlib
+import os
+import pytest
+from apps.insights.services.openai import clients
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """Fixture isolating the process-wide client registry between tests."""
+    clients.reset_clients()
+    yield
+    clients.reset_clients()
+
+
+def test_generators_import_without_api_key(settings):
+    """Test that importing the generators creates no clients."""
+    settings.OPENAI_API_KEY = ""
+    for module in ("summary_generator", "comparison_generator"):
+        importlib.reload(
+            importlib.import_module(f"apps.insights.services.openai.{module}")
+        )
+    assert clients._clients == {}
+
+    with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+        clients.get_openai_client()
+
+
+def test_clients_share_one_pool(settings):
+    """Test that clients are created once and share the HTTP and Redis pools."""
+    settings.OPENAI_API_KEY = "sk-test"
+
+    instructor_client = clients.get_instructor_client()
+    assert clients.get_instructor_client() is instructor_client
+    assert clients.get_openai_client()._client is clients.get_http_client()
+    assert (
+        clients.get_redis_client().connection_pool
+        is clients.get_redis_client().connection_pool
+    )
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_creates_its_own_clients(settings):
+    """Test that a forked worker does not reuse the parent's connections."""
+    settings.OPENAI_API_KEY = "sk-test"
+    clients.get_redis_client()
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - runs in the child process
+        os.close(read_fd)
+        os.write(write_fd, b"0" if clients._clients == {} else b"1")
+        os._exit(0)
+
+    os.close(write_fd)
+    os.waitpid(pid, 0)
+    assert os.read(read_fd, 1) == b"0"
+    os.close(read_fd)
+
+
+def test_async_clients_are_bound_to_their_event_loop(settings):
+    """Test that each event loop gets its own async client, closed after use."""
+    settings.OPENAI_API_KEY = "sk-test"
+
+    async def use_client():
+        client = clients.get_async_instructor_client()
+        assert clients.get_async_instructor_client() is client
+        http_client = client.client._client
+        await clients.close_async_clients()
+        return client, http_client
+
+    first, first_http = asyncio.run(use_client())
+    second, _ = asyncio.run(use_client())
+    assert first is not second
+    assert first_http.is_closed
+    assert len(clients._loop_clients) == 0
+
+
+def test_clients_use_configured_base_url(settings):
+    """Test that OPENAI_BASE_URL points the clients at another endpoint."""
+    settings.OPENAI_API_KEY = "sk-test"
+    settings.OPENAI_BASE_URL = "http://localhost:8001/v1"
+
+    assert str(clients.get_openai_client().base_url) == "http://localhost:8001/v1/"
+
+    async def async_base_url():
+        client = clients.get_async_instructor_client()
+        await clients.close_async_clients()
+        return str(client.client.base_url)
+
+    assert asyncio.run(async_base_url()) == "http://localhost:8001/v1/"
+
+
+def test_clients_do_not_retry_requests(settings):
+    """Test that only the generators retry, so each attempt has one timeout."""
+    settings.OPENAI_API_KEY = "sk-test"
+
+    assert clients.get_openai_client().max_retries == 0
+
+    async def async_max_retries():
+        client = clients.get_async_instructor_client()
+        await clients.close_async_clients()
+        return client.client.max_retries
+
+    assert asyncio.run(async_max_retries()) == 0
@@ -0,0 +1,322 @@
+# tests/unit/test_openai_rate_limit.py
+import asyncio
+import contextvars
+from types import SimpleNamespace
+import openai
+import pytest
+import redis
+from tenacity import (
+    RetryCallState,
+    RetryError,
+    Retrying,
+    retry,
+    stop_after_attempt,
+    wait_fixed,
+)
+from apps.insights import tasks
+from apps.insights.services.openai import circuit_breaker as breaker_module
+from apps.insights.services.openai import rate_limit
+from apps.insights.services.openai.circuit_breaker import (
+    CircuitOpenError,
+    circuit_breaker,
+)
+from apps.insights.services.openai.rate_limit import (
+    PRIORITY_ADHOC,
+    PRIORITY_RESERVES,
+    PRIORITY_SCHEDULED,
+    RateLimiter,
+    RateLimitTimeout,
+    current_priority,
+    priority,
+    retry_after_seconds,
+    retry_options,
+    stop_before_task_deadline,
+    task_deadline,
+    wait_retry_after,
+)
+
+
+class FakeRedis:
+    """Stand-in for Redis returning scripted token bucket waits, in ms."""
+
+    def __init__(self, waits=(), fail: bool = False):
+        self.waits = list(waits)
+        self.fail = fail
+        self.evals = []
+        self.values = {}
+
+    def eval(self, script, numkeys, *args):
+        if self.fail:
+            raise redis.ConnectionError("Redis is down")
+        self.evals.append(args[numkeys:])
+        return self.waits.pop(0) if self.waits else 0
+
+    def set(self, key, value, px=None):
+        if self.fail:
+            raise redis.ConnectionError("Redis is down")
+        self.values[key] = px
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Fixture replacing the Redis client of the rate limiter."""
+    client = FakeRedis()
+    monkeypatch.setattr(rate_limit, "get_redis_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Fixture recording the delays instead of sleeping."""
+    delays = []
+    monkeypatch.setattr(rate_limit.time, "sleep", delays.append)
+    monkeypatch.setattr(rate_limit.random, "uniform", lambda low, high: low)
+    return delays
+
+
+def rate_limit_error(headers: dict) -> openai.RateLimitError:
+    """Builds the error the OpenAI client raises on a 429 response."""
+    response = SimpleNamespace(status_code=429, headers=headers, request=None)
+    return openai.RateLimitError("Rate limit reached", response=response, body=None)
+
+
+def retry_state(exception: BaseException) -> RetryCallState:
+    """Builds the tenacity state of a call that failed with `exception`."""
+    state = RetryCallState(Retrying(), fn=None, args=(), kwargs={})
+    state.set_exception((type(exception), exception, None))
+    return state
+
+
+def test_acquire_passes_limits_and_cost(fake_redis, sleeps):
+    """Test that a granted request sends both limits, its cost and the reserve."""
+    RateLimiter("test-model", requests_per_minute=60, tokens_per_minute=1000).acquire(
+        250, PRIORITY_SCHEDULED
+    )
+
+    assert fake_redis.evals == [(60, 1, 1000, 250, 0.0)]
+    assert sleeps == []
+
+
+def test_acquire_waits_until_granted(fake_redis, sleeps):
+    """Test that the limiter sleeps for the waits returned by the token bucket."""
+    fake_redis.waits = [1500, 250]
+
+    RateLimiter("test-model").acquire(100)
+
+    assert sleeps == [1.5, 0.25]
+    assert len(fake_redis.evals) == 3
+
+
+def test_adhoc_priority_keeps_a_reserve(fake_redis, sleeps):
+    """Test that ad-hoc requests ask the bucket to leave a reserve unused."""
+    limiter = RateLimiter("test-model")
+
+    limiter.acquire(100)
+    with priority(PRIORITY_SCHEDULED):
+        limiter.acquire(100)
+
+    reserves = [args[-1] for args in fake_redis.evals]
+    assert reserves == [PRIORITY_RESERVES[PRIORITY_ADHOC], 0.0]
+    assert PRIORITY_RESERVES[PRIORITY_ADHOC] > 0
+
+
+def test_acquire_times_out(fake_redis, sleeps):
+    """Test that a wait beyond the timeout raises instead of sleeping."""
+    fake_redis.waits = [5000]
+
+    with pytest.raises(RateLimitTimeout):
+        RateLimiter("test-model").acquire(100, timeout=1)
+    assert sleeps == []
+
+
+def test_default_timeout_fits_in_task_timeout(fake_redis, sleeps, settings):
+    """Test that the limiter gives up before the Django Q task is killed."""
+    settings.Q_CLUSTER = {"timeout": 60}
+    settings.OPENAI_REQUEST_TIMEOUT = 30
+    settings.OPENAI_RATE_LIMIT_TIMEOUT = 0
+    fake_redis.waits = [20000, 0, 40000]
+    limiter = RateLimiter("test-model")
+
+    limiter.acquire(100)
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire(100)
+    assert rate_limit.default_acquire_timeout() == 30
+    assert sleeps == [20.0]
+
+
+def test_acquire_leaves_time_for_the_request(fake_redis, sleeps, settings):
+    """Test that a wait the request could not follow within the task raises."""
+    settings.OPENAI_REQUEST_TIMEOUT = 30
+    settings.OPENAI_RATE_LIMIT_TIMEOUT = 600
+    fake_redis.waits = [20000, 0, 40000]
+    limiter = RateLimiter("test-model")
+
+    with task_deadline(60):
+        limiter.acquire(100)
+        with pytest.raises(RateLimitTimeout):
+            limiter.acquire(100)
+    assert sleeps == [20.0]
+
+
+def test_acquire_without_redis_lets_requests_through(monkeypatch, sleeps):
+    """Test that an unavailable Redis does not block OpenAI requests."""
+    client = FakeRedis(fail=True)
+    monkeypatch.setattr(rate_limit, "get_redis_client", lambda: client)
+
+    RateLimiter("test-model").acquire(100)
+
+    assert sleeps == []
+
+
+def test_acquire_async_keeps_priority(fake_redis, monkeypatch):
+    """Test that the async variant waits without blocking and keeps the priority."""
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(rate_limit.random, "uniform", lambda low, high: low)
+    fake_redis.waits = [400]
+
+    async def acquire():
+        with priority(PRIORITY_SCHEDULED):
+            await RateLimiter("test-model").acquire_async(100)
+
+    asyncio.run(acquire())
+
+    assert delays == [0.4]
+    assert [args[-1] for args in fake_redis.evals] == [0.0, 0.0]
+
+
+def test_priority_is_restored():
+    """Test that the priority class only applies inside the context manager."""
+    assert current_priority() == PRIORITY_ADHOC
+    with priority(PRIORITY_SCHEDULED):
+        assert current_priority() == PRIORITY_SCHEDULED
+    assert current_priority() == PRIORITY_ADHOC
+
+    with pytest.raises(ValueError):
+        with priority("urgent"):
+            pass
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({"retry-after": "7"}, 7.0),
+        ({"retry-after-ms": "1500", "retry-after": "2"}, 1.5),
+        ({"retry-after": "Wed, 21 Oct 2026 07:28:00 GMT"}, None),
+        ({}, None),
+    ],
+)
+def test_retry_after_seconds(headers, expected):
+    """Test that Retry-After is read from rate limit errors."""
+    assert retry_after_seconds(rate_limit_error(headers)) == expected
+
+
+def test_retry_after_seconds_of_wrapped_error():
+    """Test that Retry-After is found behind a wrapping exception."""
+    try:
+        try:
+            raise rate_limit_error({"retry-after": "3"})
+        except openai.RateLimitError as e:
+            raise ValueError("Failed to generate summary") from e
+    except ValueError as e:
+        assert retry_after_seconds(e) == 3.0
+
+    assert retry_after_seconds(ValueError("Other error")) is None
+
+
+def test_wait_retry_after_pauses_all_workers(fake_redis):
+    """Test that a 429 pauses the shared limiter for its Retry-After time."""
+    wait = wait_retry_after("test-model", wait_fixed(2))
+    # Without a guarded call, the model the strategy was created for is paused
+    state = retry_state(rate_limit_error({"retry-after": "20"}))
+
+    assert contextvars.Context().run(wait, state) == 20
+    assert fake_redis.values == {"openai_rate_limit:test-model:paused": 20000}
+
+    assert contextvars.Context().run(wait, retry_state(ValueError("Server error"))) == 2
+    assert len(fake_redis.values) == 1
+
+
+def test_retries_stop_before_task_deadline(settings):
+    """Test that no attempt is started that could outlast the task."""
+    settings.OPENAI_REQUEST_TIMEOUT = 30
+    stop = stop_before_task_deadline()
+    state = retry_state(ValueError("Server error"))
+    state.upcoming_sleep = 10
+
+    assert not stop(state)
+    with task_deadline(60):
+        assert not stop(state)
+    with task_deadline(35):
+        assert stop(state)
+
+
+def test_retry_options_retry_transient_errors_only(settings):
+    """Test the shared retry options of the generators."""
+    settings.OPENAI_RETRY_ATTEMPTS = 3
+    settings.OPENAI_RETRY_WAIT_MIN = 0
+    settings.OPENAI_RETRY_WAIT_MAX = 0
+    calls = []
+
+    @retry(**retry_options("test", "test-model"))
+    def call(error):
+        calls.append(error)
+        raise error
+
+    with pytest.raises(RetryError):
+        call(ValueError("Server error"))
+    assert len(calls) == 3
+
+    with pytest.raises(CircuitOpenError):
+        call(CircuitOpenError("Circuit breaker of test-model is open."))
+    assert len(calls) == 4
+
+
+def test_run_with_priority_sets_task_deadline(settings):
+    """Test that chained tasks bound their OpenAI calls by the task timeout."""
+    settings.Q_CLUSTER = {"timeout": 60}
+
+    remaining = tasks.run_with_priority(
+        PRIORITY_SCHEDULED,
+        "apps.insights.services.openai.rate_limit.remaining_task_time",
+    )
+
+    assert 59 < remaining <= 60
+    assert rate_limit.remaining_task_time() is None
+
+
+def test_wait_retry_after_pauses_the_fallback_model(fake_redis, monkeypatch):
+    """Test that a 429 of the fallback model pauses its limiter, not the primary's."""
+    monkeypatch.setattr(
+        breaker_module, "route", lambda model: ("fallback-model", False)
+    )
+    monkeypatch.setattr(rate_limit.time, "sleep", lambda seconds: None)
+
+    @retry(
+        stop=stop_after_attempt(2),
+        wait=wait_retry_after("primary-model", wait_fixed(0)),
+        reraise=True,
+    )
+    @circuit_breaker("primary-model")
+    def call(model: str = "primary-model"):
+        raise rate_limit_error({"retry-after": "20"})
+
+    with pytest.raises(openai.RateLimitError):
+        contextvars.copy_context().run(call)
+    assert fake_redis.values == {"openai_rate_limit:fallback-model:paused": 20000}
+
+
+def test_run_with_priority_sets_priority():
+    """Test that chained tasks run under the priority class they were given."""
+    assert (
+        tasks.run_with_priority(
+            PRIORITY_SCHEDULED,
+            "apps.insights.services.openai.rate_limit.current_priority",
+        )
+        == PRIORITY_SCHEDULED
+    )
+    assert current_priority() == PRIORITY_ADHOC
@@ -0,0 +1,122 @@
+# tests/unit/test_openai_repair.py
+import openai
+import pytest
+from instructor import from_openai
+from prometheus_client import REGISTRY
+from pydantic import ValidationError
+from apps.insights.benchmarks import fake_openai_server
+from apps.insights.benchmarks.fake_openai_server import FakeOpenAIServer
+from apps.insights.services.openai.repair import (
+    MAX_REASKS,
+    match_metric_name,
+)
+from apps.insights.services.openai.schemas import (
+    ComparisonOutput,
+    KeyMetric,
+    KeyMetricDelta,
+)
+
+
+def repairs(kind: str, schema: str = "ComparisonOutput") -> float:
+    """Returns the exported repair counter."""
+    return (
+        REGISTRY.get_sample_value(
+            "insights_llm_repairs_total", {"schema": schema, "kind": kind}
+        )
+        or 0.0
+    )
+
+
+def comparison(*names: str) -> dict:
+    """Builds a raw comparison output with the given metric names."""
+    return {
+        "comparison_summary": "Traffic grew.",
+        "key_metrics_comparison": [
+            {"name": name, "description": f"{name} changed."} for name in names
+        ],
+        "chain_of_thought": "Read the table.",
+    }
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("Average Sessions", "Average Sessions"),
+        ("average  sessions", "Average Sessions"),
+        ("bounce_rate", "Bounce Rate"),
+        ("Avg Session Duration", "Average Session Duration"),
+        ("Average Revenu", "Average Revenue"),
+        ("Pages/Session", "Pages per Session"),
+        ("Weather", None),
+    ],
+)
+def test_match_metric_name(name, expected):
+    """Test that metric names are matched despite case, separators and typos."""
+    assert match_metric_name(name) == expected
+
+
+def test_comparison_metrics_are_repaired_and_reordered():
+    """Test that names are matched, repeats dropped and the order restored."""
+    names, order, duplicates = repairs("name"), repairs("order"), repairs("duplicate")
+
+    output = ComparisonOutput.model_validate(
+        comparison("bounce_rate", "Average Sesions", "Bounce Rate")
+    )
+
+    assert [metric.name for metric in output.key_metrics_comparison] == [
+        "Average Sessions",
+        "Bounce Rate",
+    ]
+    assert output.key_metrics_comparison[1].description == "bounce_rate changed."
+    assert repairs("name") == names + 2
+    assert repairs("order") == order + 1
+    assert repairs("duplicate") == duplicates + 1
+
+
+def test_unrepairable_metric_name_fails_validation():
+    """Test that a name matching no key metric is left for a re-ask."""
+    with pytest.raises(ValidationError, match="Unexpected metric name"):
+        ComparisonOutput.model_validate(comparison("Average Sessions", "Weather"))
+
+
+def test_local_metric_names_are_repaired_leniently():
+    """Test that stored names are matched and unknown ones are kept."""
+    assert KeyMetric(name="average revenue", value=1234.5).name == "Average Revenue"
+    delta = KeyMetricDelta(name="Legacy Metric", value1=10.0, value2=8)
+    assert delta.name == "Legacy Metric"
+
+
+def test_metric_values_written_as_text_are_rejected():
+    """Test that a percentage is not silently read as a fraction-scaled rate."""
+    with pytest.raises(ValidationError):
+        KeyMetric(name="Bounce Rate", value="45%")
+
+
+@pytest.mark.parametrize(
+    "names, requests",
+    [
+        (("sessions", "Bounce Rate", "average_users"), 1),
+        (("Average Sessions", "Weather"), MAX_REASKS + 1),
+    ],
+)
+def test_instructor_reasks_only_when_repair_fails(monkeypatch, names, requests):
+    """Test that repaired outputs need no re-ask, while unrepairable ones do."""
+    monkeypatch.setitem(
+        fake_openai_server.CANNED_OUTPUTS, "ComparisonOutput", comparison(*names)
+    )
+
+    with FakeOpenAIServer(latency=0, jitter=0) as server:
+        client = from_openai(
+            openai.OpenAI(api_key="sk-test", base_url=server.url, max_retries=0)
+        )
+        try:
+            client.chat.completions.create(
+                model="test-model",
+                messages=[{"role": "user", "content": "Compare the weeks."}],
+                response_model=ComparisonOutput,
+                max_retries=MAX_REASKS,
+            )
+        except Exception:
+            assert requests == MAX_REASKS + 1
+
+    assert server.stats == {"ok": requests}
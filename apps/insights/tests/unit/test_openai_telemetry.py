@@ -0,0 +1,135 @@
+# tests/unit/test_openai_telemetry.py
+import logging
+import socket
+import urllib.request
+import openai
+import pytest
+from django_q.signals import post_spawn
+from instructor import from_openai
+from prometheus_client import REGISTRY
+from pydantic import BaseModel, field_validator
+from tenacity import retry, stop_after_attempt, wait_none
+from apps.insights.benchmarks.fake_openai_server import FakeOpenAIServer
+from apps.insights.services.openai import clients
+from apps.insights.services.openai.schemas import SummaryOutput
+from apps.insights.services.openai.telemetry import count_retry, llm_call
+
+LABELS = {"generator": "test_generator", "model": "test-model"}
+
+
+def sample(name: str, **labels) -> float:
+    """Returns an exported sample of the test generator, or 0."""
+    return REGISTRY.get_sample_value(name, {**LABELS, **labels}) or 0.0
+
+
+@pytest.fixture
+def server():
+    """Fixture serving the fake OpenAI API without latency."""
+    with FakeOpenAIServer(latency=0, jitter=0, seed=0) as fake_server:
+        yield fake_server
+
+
+def instructor_client(server: FakeOpenAIServer):
+    """Returns an Instructor client of the fake server with the app's hooks."""
+    client = openai.OpenAI(api_key="sk-test", base_url=server.url, max_retries=0)
+    return clients._register_hooks(from_openai(client))
+
+
+def create(client, response_model=SummaryOutput, max_retries=1):
+    with llm_call("test_generator", "test-model"):
+        return client.chat.completions.create(
+            model="test-model",
+            messages=[{"role": "user", "content": "Summarize the data."}],
+            response_model=response_model,
+            max_retries=max_retries,
+        )
+
+
+def test_hooks_record_latency_and_tokens(server):
+    """Test that a successful request is timed and its token usage recorded."""
+    requests = sample("insights_llm_requests_total", outcome="success")
+    latencies = sample("insights_llm_request_latency_seconds_count")
+    prompt_tokens = sample("insights_llm_tokens_count", kind="prompt")
+    completion_tokens = sample("insights_llm_tokens_sum", kind="completion")
+
+    create(instructor_client(server))
+
+    assert sample("insights_llm_requests_total", outcome="success") == requests + 1
+    assert sample("insights_llm_request_latency_seconds_count") == latencies + 1
+    assert sample("insights_llm_tokens_count", kind="prompt") == prompt_tokens + 1
+    assert sample("insights_llm_tokens_sum", kind="completion") > completion_tokens
+
+
+def test_hooks_record_parse_errors_and_reasks(server):
+    """Test that a response failing validation counts as a parse error and reask."""
+    responses = []
+
+    class SummaryOutput(BaseModel):
+        dataset_summary: str
+
+        @field_validator("dataset_summary")
+        @classmethod
+        def reject_first_response(cls, value):
+            responses.append(value)
+            if len(responses) == 1:
+                raise ValueError("Summary too vague")
+            return value
+
+    parse_errors = sample("insights_llm_parse_errors_total")
+    reasks = sample("insights_llm_retries_total", reason="reask")
+
+    create(instructor_client(server), SummaryOutput, max_retries=2)
+
+    assert sample("insights_llm_parse_errors_total") == parse_errors + 1
+    assert sample("insights_llm_retries_total", reason="reask") == reasks + 1
+
+
+def test_hooks_record_errors_and_retries():
+    """Test that failed requests and the tenacity retries are counted."""
+    errors = sample("insights_llm_requests_total", outcome="error")
+    retries = sample("insights_llm_retries_total", reason="error")
+
+    with FakeOpenAIServer(latency=0, jitter=0, error_rate=1) as server:
+        client = instructor_client(server)
+
+        @retry(
+            stop=stop_after_attempt(2),
+            wait=wait_none(),
+            before_sleep=count_retry("test_generator", "test-model"),
+        )
+        def call():
+            return create(client)
+
+        with pytest.raises(Exception):
+            call()
+
+    assert sample("insights_llm_requests_total", outcome="error") == errors + 2
+    assert sample("insights_llm_retries_total", reason="error") == retries + 1
+
+
+@pytest.mark.parametrize("sample_rate, logged", [(1.0, True), (0.0, False)])
+def test_payloads_are_logged_for_sampled_calls(
+    server, settings, caplog, sample_rate, logged
+):
+    """Test that request and response payloads are only logged when sampled."""
+    settings.OPENAI_LOG_SAMPLE_RATE = sample_rate
+
+    with caplog.at_level(logging.DEBUG, logger="apps.insights"):
+        create(instructor_client(server))
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("## Completion kwargs" in message for message in messages) is logged
+    assert any("## Completion response" in message for message in messages) is logged
+
+
+def test_workers_export_their_metrics(settings):
+    """Test that a spawned Django Q worker serves the LLM metrics it records."""
+    with socket.socket() as sock:
+        sock.bind(("", 0))
+        settings.QCLUSTER_METRICS_PORT = sock.getsockname()[1]
+
+    post_spawn.send(sender="django_q", proc_name="Worker-1")
+
+    url = f"http://localhost:{settings.QCLUSTER_METRICS_PORT}/metrics"
+    with urllib.request.urlopen(url, timeout=5) as response:
+        assert b"insights_llm_requests_total" in response.read()
@@ -0,0 +1,22 @@
+# tests/unit/test_openai_tokens.py
+from prometheus_client import REGISTRY
+from apps.insights.services.openai import tokens
+from apps.insights.services.openai.tokens import count_tokens, record_prompt_tokens
+
+
+def test_count_tokens_estimates_without_tiktoken(monkeypatch):
+    """Test that counts fall back to an estimate from the text length."""
+    monkeypatch.setattr(tokens, "tiktoken", None)
+    assert count_tokens("", "gpt-4o") == 0
+    assert count_tokens("abcde", "gpt-4o") == 2
+
+
+def test_record_prompt_tokens_exports_count():
+    """Test that the prompt size is exported to Prometheus."""
+    labels = {"prompt": "test"}
+    before = REGISTRY.get_sample_value("insights_llm_prompt_tokens_sum", labels) or 0
+
+    count = record_prompt_tokens("test", "hello world", "gpt-4o")
+
+    assert count == count_tokens("hello world", "gpt-4o") > 0
+    assert REGISTRY.get_sample_value("insights_llm_prompt_tokens_sum", labels) == before + count
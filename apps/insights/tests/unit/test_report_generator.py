@@ -0,0 +1,47 @@
+# tests/unit/test_report_generator.py
+import pytest
+from apps.insights.services.openai import report_generator
+from apps.insights.services.openai.report_generator import generate_weekly_report
+from apps.insights.services.openai.schemas import WeeklyReportOutput
+
+REPORT = {
+    "current_week_summary": {"dataset_summary": "This week.", "chain_of_thought": "-"},
+    "previous_week_summary": {"dataset_summary": "Last week.", "chain_of_thought": "-"},
+    "comparison": {
+        "comparison_summary": "Sessions fell.",
+        "key_metrics_comparison": [
+            {"name": "Average Sessions", "description": "Down 8.3%."}
+        ],
+        "chain_of_thought": "-",
+    },
+}
+
+
+def test_weekly_report_is_one_request(monkeypatch):
+    """Test that both overviews and the metric table go into a single prompt."""
+    prompts = []
+
+    def fake_call(prompt):
+        prompts.append(prompt)
+        return WeeklyReportOutput.model_validate(REPORT)
+
+    monkeypatch.setattr(report_generator, "call_openai_api", fake_call)
+    report = generate_weekly_report(
+        "col,n\nses,7", "col,n\nses,6", "metric,change_pct\nAverage Sessions,-8.3"
+    )
+
+    assert len(prompts) == 1
+    assert "ses,7" in prompts[0] and "ses,6" in prompts[0]
+    assert "Average Sessions,-8.3" in prompts[0]
+    assert report.comparison.key_metrics_comparison[0].name == "Average Sessions"
+
+
+def test_weekly_report_errors_are_wrapped(monkeypatch):
+    """Test that API failures surface as ValueError like the other generators."""
+
+    def failing_call(prompt):
+        raise RuntimeError("API down")
+
+    monkeypatch.setattr(report_generator, "call_openai_api", failing_call)
+    with pytest.raises(ValueError, match="weekly report"):
+        generate_weekly_report("a", "b", "c")
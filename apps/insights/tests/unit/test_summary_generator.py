@@ -39,23 +39,6 @@ def test_generate_summary(statistical_overview_str):
         response, SummaryOutput
     ), "Response is not a valid SummaryOutput instance"
     assert response.dataset_summary, "Dataset summary is missing"
-    assert len(response.key_metrics) > 0, "Key metrics are missing"
     assert response.chain_of_thought, "Chain of thought reasoning is missing"
 
-    # Validate key metrics structure
-    metric_names = [metric.name for metric in response.key_metrics]
-    expected_metrics = [
-        "Average Sessions",
-        "Average Users",
-        "Average New Users",
-        "Average Pageviews",
-        "Pages per Session",
-        "Average Session Duration",
-        "Bounce Rate",
-        "Conversion Rate",
-        "Average Transactions",
-        "Average Revenue",
-    ]
-    assert metric_names == expected_metrics, "Key metrics are not in the expected order"
-
     print("Test passed successfully.")
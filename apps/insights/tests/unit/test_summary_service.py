@@ -0,0 +1,56 @@
+# tests/unit/test_summary_service.py
+import functools
+import pytest
+from apps.insights.models.statistical_overview import StatisticalOverview
+from apps.insights.services import summary_service
+from apps.insights.services.csv.csv_processor import CSVProcessor
+
+HEADER = (
+    "date,source,sessions,users,new_users,pageviews,pages_per_session,"
+    "avg_session_duration,bounce_rate,conversion_rate,transactions,revenue\n"
+)
+ROW = "2024-01-0{day},organic,{sessions},8,3,40,4.0,120.5,0.2,0.03,1,50.0\n"
+
+
+@pytest.fixture
+def csv_file(tmp_path, monkeypatch):
+    """Fixture pointing the summary service at a small CSV file."""
+    file_path = tmp_path / "ga4.csv"
+    file_path.write_text(HEADER + ROW.format(day=1, sessions=10))
+    monkeypatch.setattr(
+        summary_service,
+        "CSVProcessor",
+        functools.partial(CSVProcessor, file_path=str(file_path), dataset_path=None),
+    )
+    return file_path
+
+
+def sessions_mean(overview) -> float:
+    return overview.loc["mean", "sessions"]
+
+
+@pytest.mark.django_db
+def test_stored_overview_is_reused_until_data_changes(csv_file, monkeypatch):
+    """Test that a stored overview is reused, and recomputed once the CSV grows."""
+    overview = summary_service.get_statistical_overview("2024-01-01", "organic")
+    assert sessions_mean(overview) == 10
+    assert StatisticalOverview.objects.filter(source="organic").exists()
+
+    def fail_load(self):
+        raise AssertionError("The stored overview should have been used")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(CSVProcessor, "load", fail_load)
+        stored = summary_service.get_statistical_overview("2024-01-01", "organic")
+    assert sessions_mean(stored) == 10
+
+    with open(csv_file, "a") as f:
+        f.write(ROW.format(day=2, sessions=20))
+    overview = summary_service.get_statistical_overview("2024-01-01", "organic")
+    assert sessions_mean(overview) == 15
+    assert (
+        StatisticalOverview.objects.filter(source="organic", column_name="sessions")
+        .get()
+        .mean
+        == 15
+    )
@@ -0,0 +1,55 @@
+# tests/unit/test_tasks.py
+import ast
+import datetime
+import pytest
+from apps.insights import tasks
+from apps.insights.services.openai.rate_limit import PRIORITY_SCHEDULED
+
+
+@pytest.fixture(autouse=True)
+def utc(settings):
+    settings.TIME_ZONE = "UTC"
+
+
+def test_weekly_schedule_args_can_be_evaluated(monkeypatch):
+    """Test that the scheduler can parse the arguments stored with the schedule."""
+    scheduled = []
+    monkeypatch.setattr(
+        tasks, "schedule", lambda func, *args, **kwargs: scheduled.append((args, kwargs))
+    )
+
+    tasks.schedule_weekly_summary_task()
+
+    (args, kwargs), = scheduled
+    # Django Q stores the arguments as their repr and reads them back with
+    # ast.literal_eval; its own options are not passed to the function
+    assert ast.literal_eval(repr(args)) == ()
+    assert kwargs["intended_date_kwarg"] == "run_date"
+    assert ast.literal_eval(repr(kwargs))["priority"] == PRIORITY_SCHEDULED
+
+
+@pytest.mark.parametrize(
+    "run_date, start_date",
+    [
+        ("2024-01-22T00:00:00+00:00", datetime.date(2024, 1, 15)),
+        ("2024-01-24T12:00:00", datetime.date(2024, 1, 15)),
+        ("2024-01-28", datetime.date(2024, 1, 15)),
+    ],
+)
+def test_weekly_start_date_is_last_full_week(run_date, start_date):
+    """Test that a run summarizes the week before the week it runs in."""
+    assert tasks.weekly_start_date(run_date) == start_date
+
+
+def test_summary_chain_uses_run_date(monkeypatch):
+    """Test that a scheduled run works out its start date from the run date."""
+    scheduled = []
+    monkeypatch.setattr(
+        tasks, "schedule", lambda func, *args, **kwargs: scheduled.append(args)
+    )
+
+    tasks.schedule_summary_chain(
+        priority=PRIORITY_SCHEDULED, run_date="2024-01-22T00:00:00+00:00"
+    )
+
+    assert scheduled == [("2024-01-15", False, PRIORITY_SCHEDULED)]
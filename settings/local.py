@@ -55,10 +55,34 @@ SOCIAL_AUTH_GOOGLE_OAUTH2_SECRET = os.environ.get("GOOGLE_OAUTH2_SECRET", "")
 
 # OpenAI settings
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "")
+OPENAI_BASE_URL = os.environ.get("OPENAI_BASE_URL", "")
 OPENAI_RETRY_ATTEMPTS = int(os.environ.get("OPENAI_RETRY_ATTEMPTS", "3"))
 OPENAI_RETRY_WAIT_MULTIPLIER = int(os.environ.get("OPENAI_RETRY_WAIT_MULTIPLIER", "1"))
 OPENAI_RETRY_WAIT_MIN = int(os.environ.get("OPENAI_RETRY_WAIT_MIN", "2"))
 OPENAI_RETRY_WAIT_MAX = int(os.environ.get("OPENAI_RETRY_WAIT_MAX", "10"))
+OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", "4"))
+OPENAI_CACHE_TTL = int(os.environ.get("OPENAI_CACHE_TTL", "3600"))
+OPENAI_BATCH_POLL_INTERVAL = int(os.environ.get("OPENAI_BATCH_POLL_INTERVAL", "60"))
+OPENAI_BATCH_TIMEOUT = int(os.environ.get("OPENAI_BATCH_TIMEOUT", "86400"))
+OPENAI_RATE_LIMIT_RPM = int(os.environ.get("OPENAI_RATE_LIMIT_RPM", "500"))
+OPENAI_RATE_LIMIT_TPM = int(os.environ.get("OPENAI_RATE_LIMIT_TPM", "30000"))
+# 0 keeps the wait for the rate limiter within the Django Q task timeout
+OPENAI_RATE_LIMIT_TIMEOUT = int(os.environ.get("OPENAI_RATE_LIMIT_TIMEOUT", "0"))
+OPENAI_LOG_SAMPLE_RATE = float(os.environ.get("OPENAI_LOG_SAMPLE_RATE", "0.01"))
+OPENAI_REQUEST_TIMEOUT = int(os.environ.get("OPENAI_REQUEST_TIMEOUT", "30"))
+OPENAI_FALLBACK_MODEL = os.environ.get("OPENAI_FALLBACK_MODEL", "")
+OPENAI_BREAKER_FAILURE_THRESHOLD = int(
+    os.environ.get("OPENAI_BREAKER_FAILURE_THRESHOLD", "5")
+)
+OPENAI_BREAKER_FAILURE_WINDOW = int(os.environ.get("OPENAI_BREAKER_FAILURE_WINDOW", "60"))
+OPENAI_BREAKER_RESET_TIMEOUT = int(os.environ.get("OPENAI_BREAKER_RESET_TIMEOUT", "30"))
+OPENAI_BREAKER_SLOW_CALL_THRESHOLD = int(
+    os.environ.get("OPENAI_BREAKER_SLOW_CALL_THRESHOLD", "20")
+)
+
+# First of the ports the Django Q workers export their Prometheus metrics on,
+# one per worker; 0 disables the export
+QCLUSTER_METRICS_PORT = int(os.environ.get("QCLUSTER_METRICS_PORT", "8001"))
 
 # LOGGING configuration
 LOGGING = {
@@ -96,3 +120,4 @@ DEBUG_TOOLBAR_CONFIG = {
 
 # Task settings
 SUMMARY_TASK_TIME_DELAY = int(os.environ.get("SUMMARY_TASK_TIME_DELAY", "1"))
+WEEKLY_REPORT_FUSED = os.environ.get("WEEKLY_REPORT_FUSED", "False") == "True"